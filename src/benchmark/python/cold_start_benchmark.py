@@ -0,0 +1,39 @@
+"""Benchmark of the cold start of OrderManager: time from creating it to
+the first validate_orderid, with the order requests in every kind of store"""
+import argparse
+import tempfile
+import time
+
+from uc3m_logistics import OrderManager, OrderRequest, FixedClock, JsonStore, IndexedJsonStore, SnapshotStore
+
+STORE_CLASSES = (JsonStore, IndexedJsonStore, SnapshotStore)
+
+
+def fill_store(store_path, store_class, size):
+    """Stores size order requests and compacts the store, returns the last order id"""
+    order_manager = OrderManager(store_class, store_path=store_path)
+    records = [OrderRequest("8421691423220", "Regular", f"C/LISBOA,{number}, MADRID, SPAIN", "+34123456789",
+                            "28005", FixedClock(1678320000.5 + number)).to_json() for number in range(size)]
+    order_manager.repository.add_order_requests(records)
+    store = order_manager.repository.order_requests.store
+    store.compact()
+    # the first lookup builds the index files that are kept on disk
+    order_manager.validate_orderid(records[-1]["order_id"])
+    return records[-1]["order_id"]
+
+
+def main():
+    """Prints the cold start of every store"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100000)
+    arguments = parser.parse_args()
+    for store_class in STORE_CLASSES:
+        with tempfile.TemporaryDirectory() as directory:
+            order_id = fill_store(directory, store_class, arguments.size)
+            start = time.perf_counter()
+            OrderManager(store_class, store_path=directory).validate_orderid(order_id)
+            print(f"{store_class.__name__}: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Benchmark of register_order, send_product and deliver_product at several
+store sizes: throughput and p50/p99 latency as json, optionally compared
+against the results of a previous run"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from uc3m_logistics import (OrderManager, OrderRequest, OrderShipping, FixedClock, JsonStore, JournalStore,
+                            IndexedJsonStore, SqliteStore)
+
+STORE_CLASSES = {"json": JsonStore, "journal": JournalStore, "indexed": IndexedJsonStore, "sqlite": SqliteStore}
+SIZES = (1000, 10000, 100000, 1000000)
+PRODUCT_ID = "8421691423220"
+ADDRESS = "C/LISBOA,4, MADRID, SPAIN"
+PHONE_NUMBER = "+34123456789"
+ZIP_CODE = "28005"
+# the orders are registered and sent on this day and delivered on the next one
+ORDER_DAY = "2023-03-09"
+DELIVERY_DAY = "2023-03-10"
+
+
+def fill_stores(order_manager, size):
+    """Stores size order requests and their shippings, returns the order ids
+    and the tracking codes"""
+    start = FixedClock(ORDER_DAY).timestamp()
+    order_requests = [OrderRequest(PRODUCT_ID, "Premium", ADDRESS, PHONE_NUMBER, ZIP_CODE,
+                                   FixedClock(start + number / 1000)) for number in range(size)]
+    order_shippings = [OrderShipping(PRODUCT_ID, order_request.order_id, PHONE_NUMBER, "Premium",
+                                     FixedClock(ORDER_DAY)) for order_request in order_requests]
+    order_manager.repository.add_order_requests([order_request.to_json() for order_request in order_requests])
+    order_manager.repository.add_order_shippings([order_shipping.to_json() for order_shipping in order_shippings])
+    return ([order_request.order_id for order_request in order_requests],
+            [order_shipping.tracking_code for order_shipping in order_shippings])
+
+
+def sample_evenly(values, count):
+    """Returns count values spread over the whole list"""
+    step = max(1, len(values) // count)
+    return values[::step][:count]
+
+
+def measure(operation, arguments):
+    """Calls the operation with every argument, returns the latency of
+    every call in seconds and the calls per second"""
+    latencies = []
+    for argument in arguments:
+        start = time.perf_counter()
+        operation(argument)
+        latencies.append(time.perf_counter() - start)
+    return latencies, len(latencies) / sum(latencies)
+
+
+def percentile(latencies, fraction):
+    """Returns the nearest rank percentile of the latencies"""
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def run(store_class, size, operations):
+    """Returns the results of the three operations for a store of the size"""
+    with tempfile.TemporaryDirectory() as directory:
+        order_manager = OrderManager(store_class, FixedClock(ORDER_DAY), store_path=directory)
+        delivery_manager = OrderManager(store_class, FixedClock(DELIVERY_DAY), store_path=directory)
+        order_ids, tracking_codes = fill_stores(order_manager, size)
+        # the first lookups load or index the stores, they are not measured
+        order_manager.validate_orderid(order_ids[0])
+        order_manager.repository.find_order_shipping(tracking_codes[0])
+        delivery_manager.repository.find_order_shipping(tracking_codes[0])
+
+        input_file_paths = []
+        for number, order_id in enumerate(sample_evenly(order_ids, operations)):
+            input_file_path = os.path.join(directory, f"input_{number}.json")
+            with open(input_file_path, "w", encoding="utf-8") as file:
+                json.dump({"OrderID": order_id, "ContactEmail": "benchmark@uc3m.es"}, file)
+            input_file_paths.append(input_file_path)
+
+        addresses = [f"C/LISBOA,{number}, MADRID, SPAIN" for number in range(operations)]
+        timings = {
+            "register_order": measure(lambda address: order_manager.register_order(
+                PRODUCT_ID, "Regular", address, PHONE_NUMBER, ZIP_CODE), addresses),
+            "send_product": measure(order_manager.send_product, input_file_paths),
+            "deliver_product": measure(delivery_manager.deliver_product,
+                                       sample_evenly(tracking_codes, operations)),
+        }
+    return [{"size": size, "operation": operation, "throughput": throughput,
+             "p50_ms": percentile(latencies, 0.5) * 1000, "p99_ms": percentile(latencies, 0.99) * 1000}
+            for operation, (latencies, throughput) in timings.items()]
+
+
+def regressions(results, baseline, threshold):
+    """Returns a message for every result worse than the baseline by more
+    than the threshold (0.2 is 20%)"""
+    baseline_results = {(result["size"], result["operation"]): result for result in baseline["results"]}
+    messages = []
+    for result in results["results"]:
+        previous = baseline_results.get((result["size"], result["operation"]))
+        if previous is None:
+            continue
+        name = f"{result['operation']} at {result['size']}"
+        for metric in ("p50_ms", "p99_ms"):
+            if result[metric] > previous[metric] * (1 + threshold):
+                messages.append(f"{name}: {metric} {previous[metric]:.3f} -> {result[metric]:.3f}")
+        if result["throughput"] * (1 + threshold) < previous["throughput"]:
+            messages.append(f"{name}: throughput {previous['throughput']:.0f} -> {result['throughput']:.0f}")
+    return messages
+
+
+def main():
+    """Runs the benchmark, writes the json results and compares them with
+    the baseline, exiting with 1 if there is any regression"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--store", choices=sorted(STORE_CLASSES), default="indexed")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--operations", type=int, default=200, help="calls measured per operation and size")
+    parser.add_argument("--output", help="json file for the results, the standard output if not given")
+    parser.add_argument("--baseline", help="json results of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, 0.2 is 20%%")
+    arguments = parser.parse_args()
+
+    results = {
+        "store": arguments.store,
+        "operations": arguments.operations,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [],
+    }
+    for size in arguments.sizes:
+        results["results"].extend(run(STORE_CLASSES[arguments.store], size, arguments.operations))
+        print(f"size {size} done", file=sys.stderr)
+
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=4)
+    else:
+        print(json.dumps(results, indent=4))
+
+    if arguments.baseline:
+        with open(arguments.baseline, "r", encoding="utf-8") as file:
+            messages = regressions(results, json.load(file), arguments.threshold)
+        for message in messages:
+            print("regression: " + message, file=sys.stderr)
+        if messages:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
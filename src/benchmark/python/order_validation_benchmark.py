@@ -0,0 +1,58 @@
+"""Benchmark of the validation of the arguments of register_order: chain of
+validators of OrderManager against the compiled OrderValidator"""
+import argparse
+import time
+
+from uc3m_logistics import OrderManager, OrderManagementException
+from uc3m_logistics.order_validator import ORDER_VALIDATOR
+
+RECORDS = [
+    ("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN", "+34123456789", "28005"),
+    ("8421691423220", "Premium", "C/LISBOA,4, MADRID, SPAIN", "+34123456789", "52006"),
+    ("8421691423222", "Regular", "C/LISBOA,4, MADRID, SPAIN", "+34123456789", "28005"),
+    ("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN", "+34123456789", "52007"),
+]
+
+
+def chain(record):
+    """validation done by register_order before the compiled validator"""
+    product_id, order_type, address, phone_number, zip_code = record
+    OrderManager.validate_ean13(product_id)
+    OrderManager.validate_order_type(order_type)
+    OrderManager.validate_address(address)
+    OrderManager.validate_phone_number(phone_number)
+    OrderManager.validate_zip_code(zip_code)
+
+
+def time_per_record(validate, records):
+    """Returns the microseconds spent validating every record"""
+    start = time.perf_counter()
+    for record in records:
+        try:
+            validate(record)
+        except OrderManagementException:
+            pass
+    return (time.perf_counter() - start) / len(records) * 1e6
+
+
+def main():
+    """Prints the cost per record of every way of validating"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=100000)
+    arguments = parser.parse_args()
+    records = RECORDS * (arguments.records // len(RECORDS))
+
+    print(f"chain of validators: {time_per_record(chain, records):.2f} us/record")
+    print(f"compiled, fail fast: {time_per_record(lambda record: ORDER_VALIDATOR.validate(*record), records):.2f}"
+          " us/record")
+    start = time.perf_counter()
+    ORDER_VALIDATOR.validate_many(records)
+    print(f"compiled, batch: {(time.perf_counter() - start) / len(records) * 1e6:.2f} us/record")
+    start = time.perf_counter()
+    ORDER_VALIDATOR.validate_many(records, collect_all=True)
+    print(f"compiled, batch collecting all errors: {(time.perf_counter() - start) / len(records) * 1e6:.2f}"
+          " us/record")
+
+
+if __name__ == "__main__":
+    main()
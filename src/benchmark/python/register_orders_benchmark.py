@@ -0,0 +1,40 @@
+"""Benchmark comparing register_order one by one against register_orders"""
+import argparse
+import tempfile
+import time
+
+from uc3m_logistics import OrderManager, JsonStore, JournalStore
+
+ORDER = ("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN", "+34123456789", "28005")
+
+
+def run(store_class, orders):
+    """Returns the orders per second registered one by one and as a batch"""
+    with tempfile.TemporaryDirectory() as directory:
+        order_manager = OrderManager(store_class, store_path=directory)
+        start = time.perf_counter()
+        for _ in range(orders):
+            order_manager.register_order(*ORDER)
+        one_by_one = orders / (time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as directory:
+        order_manager = OrderManager(store_class, store_path=directory)
+        start = time.perf_counter()
+        order_manager.register_orders([ORDER] * orders)
+        batch = orders / (time.perf_counter() - start)
+    return one_by_one, batch
+
+
+def main():
+    """Prints the throughput of both ways of registering orders"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=2000)
+    arguments = parser.parse_args()
+    for store_class in (JsonStore, JournalStore):
+        one_by_one, batch = run(store_class, arguments.orders)
+        print(f"{store_class.__name__}: register_order {one_by_one:.0f} orders/s, "
+              f"register_orders {batch:.0f} orders/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,3 +4,18 @@ from .order_request import OrderRequest
 from .order_manager import OrderManager
 from .order_management_exception import OrderManagementException
 from .order_shipping import OrderShipping
+from .json_store import JsonStore
+from .indexed_json_store import IndexedJsonStore
+from .journal_store import JournalStore
+from .order_repository import OrderRepository
+from .clock import Clock, SystemClock, FixedClock
+from .order_manager_service import OrderManagerService
+from .async_order_manager import AsyncOrderManager
+from .sqlite_store import SqliteStore
+from .order_validator import OrderValidator
+from .input_file_reader import InputFileReader
+from .sharded_store import ShardedStore
+from .wal_store import WalStore
+from .snapshot_store import SnapshotStore
+from .shipping_view import ShippingView, ShippingRow
+from .delivery_analytics import DeliveryAnalytics
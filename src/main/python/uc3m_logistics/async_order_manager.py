@@ -0,0 +1,83 @@
+"""Contains the class AsyncOrderManager"""
+import asyncio
+
+from .order_manager import OrderManager
+from .group_commit import ORDER_REQUEST, ORDER_SHIPPING, DELIVERY, commit
+
+
+class AsyncOrderManager:
+    """Asyncio version of the methods of OrderManager.
+
+    The file input/output runs in an executor so the event loop is never
+    blocked. The records of the calls that are waiting at the same time
+    are stored together with one write per store. The exceptions are the
+    same ones OrderManager raises."""
+
+    def __init__(self, order_manager=None, executor=None):
+        self.__order_manager = order_manager if order_manager is not None else OrderManager()
+        self.__executor = executor
+        self.__writes = []
+        self.__flush_task = None
+
+    @property
+    def order_manager(self):
+        """Returns the order manager used for validating and storing"""
+        return self.__order_manager
+
+    # pylint: disable=too-many-arguments
+    async def register_order(self, product_id: str, order_type: str, address: str, phone_number: str,
+                             zip_code: str) -> str:
+        """Same as OrderManager.register_order"""
+        # only validation and hashing, there is no input/output to wait for
+        order_request = self.__order_manager.build_order_request(product_id, order_type, address,
+                                                                 phone_number, zip_code)
+        return await self.__write(ORDER_REQUEST, order_request.to_json(), order_request.order_id)
+
+    async def send_product(self, input_file_path: str) -> str:
+        """Same as OrderManager.send_product"""
+        order_id = await self.__run(self.__order_manager.read_order_id, input_file_path)
+        order_shipping = await self.__run(self.__order_manager.build_order_shipping, order_id)
+        return await self.__write(ORDER_SHIPPING, order_shipping.to_json(), order_shipping.tracking_code)
+
+    async def deliver_product(self, tracking_code: str) -> bool:
+        """Same as OrderManager.deliver_product"""
+        delivery = await self.__run(self.__order_manager.build_delivery, tracking_code)
+        return await self.__write(DELIVERY, delivery, True)
+
+    async def flush(self):
+        """Waits until every pending record has been stored"""
+        if self.__flush_task is not None:
+            await asyncio.shield(self.__flush_task)
+
+    async def __run(self, function, *args):
+        """Runs the blocking function in the executor"""
+        return await asyncio.get_running_loop().run_in_executor(self.__executor, function, *args)
+
+    async def __write(self, kind, record, result):
+        """Queues the record and waits until it is stored"""
+        future = asyncio.get_running_loop().create_future()
+        self.__writes.append((kind, record, result, future))
+        if self.__flush_task is None:
+            self.__flush_task = asyncio.ensure_future(self.__flush())
+        return await future
+
+    async def __flush(self):
+        """Stores the queued records until there are none left"""
+        try:
+            # lets the other callers that are ready queue their records too
+            await asyncio.sleep(0)
+            while self.__writes:
+                writes, self.__writes = self.__writes, []
+                try:
+                    errors = await self.__run(commit, self.__order_manager.repository, writes)
+                except Exception as exception:  # pylint: disable=broad-except
+                    errors = {kind: exception for kind, _, _, _ in writes}
+                for kind, _, result, future in writes:
+                    if future.done():
+                        continue
+                    if kind in errors:
+                        future.set_exception(errors[kind])
+                    else:
+                        future.set_result(result)
+        finally:
+            self.__flush_task = None
@@ -0,0 +1,54 @@
+"""Contains the clocks used for time stamping the orders"""
+import time
+from datetime import date, datetime
+
+
+class Clock:
+    """Base class for the clocks, returns the current time as a timestamp"""
+
+    def timestamp(self):
+        """Returns the current time in seconds since the epoch"""
+        raise NotImplementedError
+
+
+class SystemClock(Clock):
+    """Clock that returns the time of the system"""
+
+    def timestamp(self):
+        """Returns the current time of the system"""
+        return time.time()
+
+
+class FixedClock(Clock):
+    """Clock that is frozen at a given moment, used for testing.
+
+    The moment can be given as a timestamp, as a datetime or as an iso
+    formatted string ("2023-03-09")."""
+
+    def __init__(self, moment):
+        self.__timestamp = self.__to_timestamp(moment)
+
+    @staticmethod
+    def __to_timestamp(moment):
+        if isinstance(moment, str):
+            moment = datetime.fromisoformat(moment)
+        if isinstance(moment, datetime):
+            return datetime.timestamp(moment)
+        return float(moment)
+
+    def timestamp(self):
+        """Returns the moment the clock is frozen at"""
+        return self.__timestamp
+
+    def move_to(self, moment):
+        """Freezes the clock at a new moment"""
+        self.__timestamp = self.__to_timestamp(moment)
+
+
+def days_between(timestamp, other_timestamp):
+    """Returns the number of calendar days (local time) from the day of
+    the timestamp to the day of the other one"""
+    return (date.fromtimestamp(other_timestamp) - date.fromtimestamp(timestamp)).days
+
+
+SYSTEM_CLOCK = SystemClock()
@@ -0,0 +1,199 @@
+"""Export of the stores to columnar files: one .npy file per column, which
+needs no numpy for writing, and optionally one parquet file per table"""
+import argparse
+import json
+import math
+import os
+import struct
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+from .input_file_reader import InputFileReader
+from .order_store import store_directory
+from .order_management_exception import OrderManagementException
+from .sharded_store import ShardedStore
+from .sqlite_store import SqliteStore
+from .wal_store import WalStore
+
+CHUNK_SIZE = 65536
+# every table is read from a store and has its columns with the numpy type they are written as
+TABLES = {
+    "order_requests": ("order_request.json", (
+        ("order_id", "|S32"), ("product_id", "|S13"), ("delivery_address", "<U100"), ("order_type", "<U16"),
+        ("phone_number", "|S12"), ("zip_code", "|S5"), ("time_stamp", "<f8"))),
+    "order_shippings": ("order_shipping.json", (
+        ("order_id", "|S32"), ("tracking_code", "|S64"), ("alg", "<U16"), ("type", "<U16"),
+        ("issued_at", "<f8"), ("delivery_day", "<f8"))),
+    "deliveries": ("order_manager.json", (
+        ("tracking_code", "|S64"), ("time_stamp", "<f8"))),
+}
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+NPY_HEADER_SIZE = 128
+
+
+def npy_header(descr, rows):
+    """Returns the header of a version 1.0 .npy file of one dimension,
+    always NPY_HEADER_SIZE bytes long so it can be written again at the end"""
+    text = "{'descr': '%s', 'fortran_order': False, 'shape': (%d,), }" % (descr, rows)
+    text = text.ljust(NPY_HEADER_SIZE - len(NPY_MAGIC) - 3) + "\n"
+    return NPY_MAGIC + struct.pack("<H", len(text)) + text.encode("latin1")
+
+
+def pack_column(descr, values):
+    """Returns the bytes of the values as numpy stores them. Missing values
+    are written as empty strings or nan"""
+    width = int(descr[2:]) if descr[1] in "SU" else 0
+    if descr == "<f8":
+        return struct.pack(f"<{len(values)}d", *(value if isinstance(value, (int, float)) and
+                                                 not isinstance(value, bool) else math.nan
+                                                 for value in values))
+    parts = []
+    for value in values:
+        if value is None:
+            value = ""
+        if not isinstance(value, str) or len(value) > width or (descr[1] == "S" and not value.isascii()):
+            raise OrderManagementException(f"Value does not fit a column of type {descr}: {value!r}")
+        if descr[1] == "S":
+            parts.append(value.encode("ascii").ljust(width, b"\0"))
+        else:
+            parts.append(value.encode("utf-32-le").ljust(4 * width, b"\0"))
+    return b"".join(parts)
+
+
+class NpyWriter:
+    """Writes one column to a .npy file chunk by chunk; the number of rows
+    of the header is written when the file is closed"""
+
+    def __init__(self, npy_path, descr):
+        self.__descr = descr
+        self.__rows = 0
+        self.__file = open(npy_path, "wb")  # pylint: disable=consider-using-with
+        self.__file.write(npy_header(descr, 0))
+
+    def write(self, values):
+        """Appends the values to the column"""
+        self.__file.write(pack_column(self.__descr, values))
+        self.__rows += len(values)
+
+    def close(self):
+        """Writes the final header and closes the file"""
+        self.__file.seek(0)
+        self.__file.write(npy_header(self.__descr, self.__rows))
+        self.__file.close()
+
+
+def store_records(json_path, chunk_size=CHUNK_SIZE):
+    """Yields the records of a store, whichever class wrote it. A json
+    store and its journal, if it has one, are read in chunks; a sqlite
+    database, the shards of a ShardedStore and the log of a WalStore are
+    read through their store class"""
+    sqlite_store = SqliteStore(json_path)
+    if os.path.exists(sqlite_store.database_path):
+        yield from sqlite_store.load()
+        return
+    sharded_store = ShardedStore(json_path)
+    if os.path.isdir(sharded_store.shards_path):
+        for shard_name in sharded_store.shard_names():
+            yield from store_records(sharded_store.shard(shard_name).store_path, chunk_size)
+        return
+    if not os.path.exists(json_path):
+        raise OrderManagementException(os.path.basename(json_path) + " not found")
+    wal_store = WalStore(json_path)
+    if os.path.exists(wal_store.wal_path):
+        yield from wal_store.load()
+        return
+    for path in (json_path, json_path + "l"):
+        if path != json_path and not os.path.exists(path):
+            continue
+        for line, record in InputFileReader(path, chunk_size=chunk_size, key=None):
+            if isinstance(record, Exception) or not isinstance(record, dict):
+                raise OrderManagementException(f"{os.path.basename(path)}: record at line {line} is not valid")
+            yield record
+
+
+def export_columns(output_path, store_path=None, chunk_size=CHUNK_SIZE, parquet=False):
+    """Writes every table to output_path/<table>/<column>.npy, and to
+    output_path/<table>.parquet when parquet is set, holding at most
+    chunk_size records in memory. Returns the rows of every table"""
+    if parquet and pyarrow is None:
+        raise OrderManagementException("pyarrow is not installed")
+    store_path = store_directory(store_path)
+    rows = {}
+    for table, (store_name, columns) in TABLES.items():
+        os.makedirs(os.path.join(output_path, table), exist_ok=True)
+        writers = [NpyWriter(os.path.join(output_path, table, name + ".npy"), descr) for name, descr in columns]
+        parquet_writer = None
+        if parquet:
+            parquet_writer = pyarrow.parquet.ParquetWriter(os.path.join(output_path, table + ".parquet"),
+                                                           parquet_schema(columns))
+        rows[table] = 0
+        try:
+            chunk = []
+            for record in store_records(os.path.join(store_path, store_name), chunk_size):
+                chunk.append(record)
+                if len(chunk) == chunk_size:
+                    write_chunk(chunk, columns, writers, parquet_writer)
+                    rows[table] += len(chunk)
+                    chunk = []
+            if chunk:
+                write_chunk(chunk, columns, writers, parquet_writer)
+                rows[table] += len(chunk)
+        finally:
+            for writer in writers:
+                writer.close()
+            if parquet_writer is not None:
+                parquet_writer.close()
+    return rows
+
+
+def write_chunk(chunk, columns, writers, parquet_writer):
+    """Writes the columns of a chunk of records"""
+    values = [[record.get(name) for record in chunk] for name, _ in columns]
+    for writer, column in zip(writers, values):
+        writer.write(column)
+    if parquet_writer is not None:
+        parquet_writer.write_table(pyarrow.table(
+            [pyarrow.array([value if descr == "<f8" or value is None else str(value) for value in column],
+                           type=pyarrow.float64() if descr == "<f8" else pyarrow.string())
+             for column, (_, descr) in zip(values, columns)],
+            schema=parquet_writer.schema))
+
+
+def parquet_schema(columns):
+    """Returns the arrow schema of the columns of a table"""
+    return pyarrow.schema([(name, pyarrow.float64() if descr == "<f8" else pyarrow.string())
+                           for name, descr in columns])
+
+
+def load_columns(output_path, table):
+    """Returns the columns of an exported table as numpy arrays mapped from
+    their .npy files"""
+    if numpy is None:
+        raise OrderManagementException("numpy is not installed")
+    _, columns = TABLES[table]
+    return {name: numpy.load(os.path.join(output_path, table, name + ".npy"), mmap_mode="r")
+            for name, _ in columns}
+
+
+def main():
+    """Command line of the export: python -m uc3m_logistics.columnar_export output [--store-path path] [--parquet]"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("output_path")
+    parser.add_argument("--store-path", help="directory of the stores, the one of OrderManager by default")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--parquet", action="store_true", help="also write one parquet file per table")
+    arguments = parser.parse_args()
+    rows = export_columns(arguments.output_path, arguments.store_path, arguments.chunk_size, arguments.parquet)
+    print(json.dumps(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""Contains the class DeliveryAnalytics"""
+import json
+import os
+import re
+import time
+from datetime import date
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .order_store import OrderStore, store_directory
+
+EARLY, ON_TIME, LATE = 0, 1, 2
+# the local time offset is the same inside every quarter of an hour
+OFFSET_PERIOD = 900
+DECODER = json.JSONDecoder()
+# what goes between the records of a json list, and before the first one
+SEPARATOR = re.compile(r"[ \t\n\r,\[]*")
+
+
+def local_days(timestamps):
+    """Returns the numpy array of the calendar days (local time) of the timestamps"""
+    timestamps = numpy.asarray(timestamps, dtype=numpy.float64)
+    periods, inverse = numpy.unique(numpy.floor(timestamps / OFFSET_PERIOD), return_inverse=True)
+    offsets = numpy.array([time.localtime(period * OFFSET_PERIOD).tm_gmtoff for period in periods],
+                          dtype=numpy.float64)
+    return numpy.floor((timestamps + offsets[inverse.reshape(-1)]) / 86400).astype(numpy.int64)
+
+
+class _StoreReader:
+    """Reads the records written to a json store and its .jsonl journal
+    since the last read, parsing only the bytes added to them.
+
+    The byte offset where the last record read ends is kept for both
+    files. A base file written in place (IndexedJsonStore) or a journal
+    that grows is read from there. A base file that was replaced, by a
+    JsonStore write or a compaction of the journal, is read again from
+    the start, skipping the records already read."""
+
+    def __init__(self, store_path):
+        self.__store_path = store_path
+        self.__journal_path = store_path + "l"
+        self.__inode = None
+        self.__offset = 0
+        self.__journal_offset = 0
+        self.__records = 0
+
+    def new_records(self):
+        """Returns the records written since the last read"""
+        signature = OrderStore._file_signature(self.__store_path)  # pylint: disable=protected-access
+        if signature is None:
+            return []
+        journal_signature = OrderStore._file_signature(self.__journal_path)  # pylint: disable=protected-access
+        if signature[0] != self.__inode or signature[1] < self.__offset or \
+                (journal_signature or (0, 0))[1] < self.__journal_offset:
+            seen = self.__records
+            self.__inode, self.__offset, self.__journal_offset, self.__records = signature[0], 0, 0, 0
+            return self.__read()[seen:]
+        return self.__read()
+
+    def __read(self):
+        """Returns the records after the offsets of the base file and the journal"""
+        records, self.__offset = self.__read_list(self.__store_path, self.__offset)
+        if os.path.exists(self.__journal_path):
+            journal, self.__journal_offset = self.__read_lines(self.__journal_path, self.__journal_offset)
+            records.extend(journal)
+        records = [record for record in records if isinstance(record, dict)]
+        self.__records += len(records)
+        return records
+
+    @staticmethod
+    def __read_list(path, offset):
+        """Returns the complete records of a json list (or single object)
+        after the offset and the offset where the last one ends"""
+        with open(path, "rb") as file:
+            file.seek(offset)
+            text = file.read().decode("utf-8")
+        records = []
+        index = end = 0
+        while True:
+            index = SEPARATOR.match(text, index).end()
+            if index == len(text) or text[index] == "]":
+                break
+            try:
+                record, index = DECODER.raw_decode(text, index)
+            except json.JSONDecodeError:
+                # a record still being written
+                break
+            records.append(record)
+            end = index
+        return records, offset + len(text[:end].encode("utf-8"))
+
+    @staticmethod
+    def __read_lines(path, offset):
+        """Returns the records of the complete lines of a journal after the
+        offset and the offset where the last one ends"""
+        records = []
+        with open(path, "rb") as file:
+            file.seek(offset)
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # torn line left by an interrupted write
+                    continue
+        return records, offset
+
+
+class DeliveryAnalytics:
+    """Delivery SLA aggregates of the stores of a directory.
+
+    The deliveries of order_manager.json are joined by tracking_code with
+    the shippings of order_shipping.json, kept in a hash table, and these
+    by order_id with the order type and zip code of order_request.json. A
+    delivery is early or late when its calendar day is before or after the
+    delivery day of its shipping by more than delivery_day_tolerance days,
+    as in OrderManager, and on time otherwise. Only the first delivery of a
+    tracking code is counted. A delivery whose shipping is not known yet is
+    kept pending and joined again on the next refresh.
+
+    refresh() parses only the bytes written to the stores since the last
+    refresh (see _StoreReader) and joins only their records, so the
+    aggregates are updated instead of being computed again. The stores are
+    read as json files with their .jsonl journal, as JsonStore,
+    IndexedJsonStore and JournalStore write them."""
+
+    REQUESTS = "order_request.json"
+    SHIPPINGS = "order_shipping.json"
+    DELIVERIES = "order_manager.json"
+
+    def __init__(self, store_path=None, delivery_day_tolerance=0):
+        self.__store_path = store_directory(store_path)
+        self.__delivery_day_tolerance = delivery_day_tolerance
+        self.__readers = {store_name: _StoreReader(os.path.join(self.__store_path, store_name))
+                          for store_name in (self.REQUESTS, self.SHIPPINGS, self.DELIVERIES)}
+        self.__orders = {}
+        # tracking code -> delivery day, issued at and group of the shipping
+        self.__shippings = {}
+        self.__delivered = set()
+        # (order type, zip code) -> number of the group, and per group the
+        # early, on time and late deliveries and the days from issue to delivery
+        self.__groups = {}
+        self.__group_keys = []
+        self.__totals = []
+        # deliveries whose shipping was not known yet
+        self.__pending = []
+        self.refresh()
+
+    @property
+    def unmatched(self):
+        """Returns the number of deliveries pending because their shipping is not known"""
+        return len(self.__pending)
+
+    def __group(self, order_id):
+        key = self.__orders.get(order_id, (None, None))
+        if key not in self.__groups:
+            self.__groups[key] = len(self.__group_keys)
+            self.__group_keys.append(key)
+            self.__totals.append([0, 0, 0, 0.0])
+        return self.__groups[key]
+
+    def refresh(self):
+        """Joins the records written to the stores since the last refresh.
+        Returns the number of deliveries added to the aggregates"""
+        for record in self.__readers[self.REQUESTS].new_records():
+            self.__orders.setdefault(record.get("order_id"), (record.get("order_type"), record.get("zip_code")))
+        for record in self.__readers[self.SHIPPINGS].new_records():
+            if record.get("tracking_code") not in self.__shippings:
+                self.__shippings[record.get("tracking_code")] = \
+                    (record.get("delivery_day"), record.get("issued_at"), self.__group(record.get("order_id")))
+        pending, self.__pending = self.__pending, []
+        return self.add_deliveries(pending + self.__readers[self.DELIVERIES].new_records())
+
+    def add_deliveries(self, deliveries):
+        """Adds the delivery records to the aggregates, in one pass over them.
+        Deliveries without a known shipping are kept for the next refresh and
+        deliveries without a timestamp are left out.
+        Returns the number of deliveries added"""
+        delivery_days, issued_at, groups, time_stamps = [], [], [], []
+        for delivery in deliveries:
+            tracking_code = delivery.get("tracking_code")
+            shipping = self.__shippings.get(tracking_code)
+            if not isinstance(delivery.get("time_stamp"), (int, float)):
+                continue
+            if shipping is None:
+                self.__pending.append(delivery)
+            elif tracking_code not in self.__delivered:
+                self.__delivered.add(tracking_code)
+                delivery_days.append(shipping[0])
+                issued_at.append(shipping[1])
+                groups.append(shipping[2])
+                time_stamps.append(delivery["time_stamp"])
+        if not groups:
+            return 0
+        if numpy is None:
+            self.__aggregate_records(delivery_days, issued_at, groups, time_stamps)
+        else:
+            self.__aggregate_arrays(delivery_days, issued_at, groups, time_stamps)
+        return len(groups)
+
+    def __aggregate_arrays(self, delivery_days, issued_at, groups, time_stamps):
+        """Adds the deliveries to the totals of their groups with numpy"""
+        days_late = local_days(time_stamps) - local_days(delivery_days)
+        statuses = numpy.where(days_late < -self.__delivery_day_tolerance, EARLY,
+                               numpy.where(days_late > self.__delivery_day_tolerance, LATE, ON_TIME))
+        groups = numpy.asarray(groups, dtype=numpy.int64)
+        counts = numpy.bincount(groups * 3 + statuses, minlength=3 * len(self.__totals)).reshape(-1, 3)
+        lead_days = numpy.bincount(groups, weights=(numpy.asarray(time_stamps, dtype=numpy.float64) -
+                                                    numpy.asarray(issued_at, dtype=numpy.float64)) / 86400,
+                                   minlength=len(self.__totals))
+        for group in numpy.unique(groups):
+            totals = self.__totals[group]
+            for status in (EARLY, ON_TIME, LATE):
+                totals[status] += int(counts[group, status])
+            totals[3] += float(lead_days[group])
+
+    def __aggregate_records(self, delivery_days, issued_at, groups, time_stamps):
+        """Adds the deliveries to the totals of their groups one by one"""
+        for delivery_day, issued, group, time_stamp in zip(delivery_days, issued_at, groups, time_stamps):
+            days_late = date.fromtimestamp(time_stamp).toordinal() - date.fromtimestamp(delivery_day).toordinal()
+            if days_late < -self.__delivery_day_tolerance:
+                status = EARLY
+            elif days_late > self.__delivery_day_tolerance:
+                status = LATE
+            else:
+                status = ON_TIME
+            self.__totals[group][status] += 1
+            self.__totals[group][3] += (time_stamp - issued) / 86400
+
+    def __report(self, key):
+        """Returns the aggregates of the groups summed by key"""
+        summed = {}
+        for group_key, totals in zip(self.__group_keys, self.__totals):
+            sums = summed.setdefault(key(group_key), [0, 0, 0, 0.0])
+            for index, value in enumerate(totals):
+                sums[index] += value
+        report = {}
+        for name, (early, on_time, late, lead_days) in summed.items():
+            deliveries = early + on_time + late
+            if deliveries:
+                report[name] = {"deliveries": deliveries, "early": early, "on_time": on_time, "late": late,
+                                "on_time_rate": on_time / deliveries, "mean_lead_days": lead_days / deliveries}
+        return report
+
+    def by_order_type(self):
+        """Returns the aggregates of the deliveries of every order type"""
+        return self.__report(lambda group_key: group_key[0])
+
+    def by_zip_code(self):
+        """Returns the aggregates of the deliveries of every zip code"""
+        return self.__report(lambda group_key: group_key[1])
+
+    def by_order_type_and_zip_code(self):
+        """Returns the aggregates of the deliveries of every order type and zip code"""
+        return self.__report(lambda group_key: group_key)
+
+    def total(self):
+        """Returns the aggregates of all the deliveries or None if there are none"""
+        return self.__report(lambda group_key: None).get(None)
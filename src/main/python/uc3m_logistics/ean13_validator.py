@@ -0,0 +1,74 @@
+"""Validation of batches of ean13 codes"""
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+NOT_13_DIGITS = "Invalid ean13 code: not a 13 digit string"
+WRONG_CHECK_DIGIT = "Invalid ean13 code: check digit is incorrect"
+# the digits in even positions weigh 1 and the ones in odd positions weigh 3
+ASCII_ZERO_SUM = ord("0") * (6 * 1 + 6 * 3)
+
+
+def validate_ean13_many(codes, use_numpy=None):
+    """Validates all the codes in one pass.
+
+    Returns a mask with True for every valid code and a list with the
+    error message OrderManager.validate_ean13 gives for every invalid code
+    (None for the valid ones). The mask is a numpy array of booleans when
+    NumPy is used and a list otherwise; NumPy is used when it is installed
+    unless use_numpy says otherwise."""
+    codes = list(codes)
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    if use_numpy:
+        return _validate_with_numpy(codes)
+    reasons = [_reason(code) for code in codes]
+    return [reason is None for reason in reasons], reasons
+
+
+def has_valid_check_digit(code):
+    """Returns whether the last digit of a 13 digit string is its check digit"""
+    return _reason(code) is None
+
+
+def _reason(code):
+    """Returns the error message for one code or None if it is valid"""
+    if not isinstance(code, str) or len(code) != 13 or not code.isdigit():
+        return NOT_13_DIGITS
+    if code.isascii():
+        digits = code.encode("ascii")
+        barcode_sum = sum(digits[0:12:2]) + 3 * sum(digits[1:12:2]) - ASCII_ZERO_SUM
+        check_digit = digits[12] - 48
+    else:
+        # other unicode digits, as int() takes them
+        try:
+            barcode_sum = sum(int(digit) * (3 if i % 2 else 1) for i, digit in enumerate(code[:12]))
+            check_digit = int(code[12])
+        except ValueError:
+            return NOT_13_DIGITS
+    if (10 - barcode_sum % 10) % 10 != check_digit:
+        return WRONG_CHECK_DIGIT
+    return None
+
+
+def _validate_with_numpy(codes):
+    """Computes the check digits of all the ascii codes at once"""
+    reasons = [None] * len(codes)
+    ascii_positions = []
+    for position, code in enumerate(codes):
+        if isinstance(code, str) and len(code) == 13 and code.isascii() and code.isdigit():
+            ascii_positions.append(position)
+        else:
+            reasons[position] = _reason(code)
+
+    if ascii_positions:
+        text = "".join(codes[position] for position in ascii_positions).encode("ascii")
+        digits = (numpy.frombuffer(text, dtype=numpy.uint8).reshape(-1, 13) - 48).astype(numpy.int64)
+        weights = numpy.array([1, 3] * 6, dtype=numpy.int64)
+        expected = (10 - (digits[:, :12] @ weights) % 10) % 10
+        for position in numpy.asarray(ascii_positions)[expected != digits[:, 12]]:
+            reasons[position] = WRONG_CHECK_DIGIT
+
+    mask = numpy.fromiter((reason is None for reason in reasons), dtype=bool, count=len(reasons))
+    return mask, reasons
@@ -0,0 +1,147 @@
+"""Contains the lock and the atomic replace used for writing the stores"""
+import os
+import stat
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """Lock shared by all the threads and processes that use the same file.
+
+    The lock is held on a .lock file next to the locked one, so the locked
+    file can be replaced while the lock is held. It can be acquired again
+    by the thread that holds it."""
+
+    def __init__(self, file_path):
+        self.__lock_path = file_path + ".lock"
+        self.__thread_lock = threading.RLock()
+        self.__depth = 0
+        self.__file = None
+
+    @property
+    def lock_path(self):
+        """Returns the path of the lock file"""
+        return self.__lock_path
+
+    def acquire(self):
+        """Waits until the lock is free and takes it"""
+        self.__thread_lock.acquire()
+        if self.__depth == 0:
+            try:
+                self.__file = open(self.__lock_path, "a+b")  # pylint: disable=consider-using-with
+                self.__lock_file(self.__file)
+            except Exception:
+                if self.__file is not None:
+                    self.__file.close()
+                    self.__file = None
+                self.__thread_lock.release()
+                raise
+        self.__depth += 1
+
+    def release(self):
+        """Frees the lock"""
+        self.__depth -= 1
+        if self.__depth == 0:
+            self.__unlock_file(self.__file)
+            self.__file.close()
+            self.__file = None
+        self.__thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    @staticmethod
+    def __lock_file(file):
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+            return
+        file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                # LK_LOCK gives up after 10 seconds, keep waiting
+                continue
+
+    @staticmethod
+    def __unlock_file(file):
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+            return
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def replace_file(file_path, text):
+    """Replaces the content of the file with the text (or bytes) in one step.
+
+    The text is written and synced to a temporary file of the same
+    directory which is then renamed over the file, so readers see either
+    the old or the new content and never a partially written one. The
+    file keeps its mode, a new one gets the mode open() would give it."""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    descriptor, temp_path = tempfile.mkstemp(prefix=os.path.basename(file_path) + ".",
+                                             suffix=".tmp", dir=directory)
+    try:
+        if isinstance(text, bytes):
+            file = os.fdopen(descriptor, "wb")
+        else:
+            file = os.fdopen(descriptor, "w", encoding="utf-8")
+        with file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        # mkstemp creates the temporary file readable only by its owner
+        os.chmod(temp_path, file_mode(file_path))
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    sync_directory(directory)
+
+
+def file_mode(file_path):
+    """Returns the permission bits of the file, or those of a new file
+    created with the umask of the process if it does not exist"""
+    try:
+        return stat.S_IMODE(os.stat(file_path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~current_umask()
+
+
+def current_umask():
+    """Returns the umask of the process"""
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except OSError:
+        pass
+    # without /proc the umask can only be read by setting it
+    umask = os.umask(0o077)
+    os.umask(umask)
+    return umask
+
+
+def sync_directory(directory):
+    """Makes the renames done in the directory reach the disk"""
+    if fcntl is None:  # pragma: no cover - windows can not open directories
+        return
+    descriptor = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
@@ -0,0 +1,37 @@
+"""Group commit of the records written by the order manager services"""
+from .order_management_exception import OrderManagementException
+
+# kinds of record and the message used when their store can not be written
+ORDER_REQUEST = "order_request"
+ORDER_SHIPPING = "order_shipping"
+DELIVERY = "delivery"
+WRITE_ERRORS = {
+    ORDER_REQUEST: "Could not write to file order_request json",
+    ORDER_SHIPPING: "Error writing Order Shipping information to file",
+    DELIVERY: "Deliver Product: could not write tracking to file",
+}
+
+
+def commit(repository, writes):
+    """Stores the records of the writes with one write per store.
+
+    Every write is a tuple that starts with the kind and the record.
+    Returns a dict with the exception for every kind that could not be
+    stored"""
+    add_records = {
+        ORDER_REQUEST: repository.add_order_requests,
+        ORDER_SHIPPING: repository.add_order_shippings,
+        DELIVERY: repository.add_deliveries,
+    }
+    errors = {}
+    for kind, add in add_records.items():
+        records = [write[1] for write in writes if write[0] == kind]
+        if not records:
+            continue
+        try:
+            add(records)
+        except Exception as exception:  # pylint: disable=broad-except
+            error = OrderManagementException(WRITE_ERRORS[kind])
+            error.__cause__ = exception
+            errors[kind] = error
+    return errors
@@ -0,0 +1,136 @@
+"""Contains the class HashIndex, the sidecar index file of the json stores"""
+import hashlib
+import mmap
+import struct
+
+from .file_lock import replace_file
+
+MAGIC = b"UC3MIDX1"
+# magic, inode, size and modification time of the indexed file, slots, entries
+HEADER = struct.Struct("<8sQQQQQ")
+# hash of the key (0 for an empty slot), offset and length of the record
+SLOT = struct.Struct("<QQQ")
+MIN_SLOTS = 64
+
+
+def key_hash(key_value):
+    """Returns the hash of a key value, the same in every process and never 0"""
+    digest = hashlib.blake2b(key_value.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") | 1
+
+
+class HashIndex:
+    """Open addressing hash table kept in a file next to the indexed one.
+
+    Every entry maps the hash of a key value to the byte offset and length
+    of a record of the indexed file, so a record is found by reading one
+    slot or a few of them and the record itself, however many records the
+    file has. The header keeps the signature of the indexed file the
+    entries were computed for, an index whose signature does not match the
+    file is stale and has to be built again. The table is read through
+    mmap and entries are added in place while it is less than half full."""
+
+    def __init__(self, index_path):
+        self.__index_path = index_path
+        self.__map = None
+        self.__signature = None
+        self.__slots = 0
+        self.__entries = 0
+
+    @property
+    def index_path(self):
+        """Returns the path of the index file"""
+        return self.__index_path
+
+    @property
+    def signature(self):
+        """Returns the signature of the indexed file or None if not opened"""
+        return self.__signature
+
+    def open(self):
+        """Maps the index file, returns False if it is missing or not valid"""
+        self.close()
+        try:
+            with open(self.__index_path, "rb") as file:
+                self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return False
+        if len(self.__map) < HEADER.size:
+            self.close()
+            return False
+        magic, inode, size, mtime, slots, entries = HEADER.unpack_from(self.__map)
+        if magic != MAGIC or slots == 0 or len(self.__map) != HEADER.size + slots * SLOT.size:
+            self.close()
+            return False
+        self.__signature = (inode, size, mtime)
+        self.__slots = slots
+        self.__entries = entries
+        return True
+
+    def close(self):
+        """Unmaps the index file"""
+        if self.__map is not None:
+            self.__map.close()
+        self.__map = None
+        self.__signature = None
+
+    def candidates(self, key_value):
+        """Yields the offset and length of the records whose key may have
+        the value, in the order they were added"""
+        if self.__map is None:
+            return
+        wanted = key_hash(key_value)
+        slot = wanted % self.__slots
+        while True:
+            hash_value, offset, length = SLOT.unpack_from(self.__map, HEADER.size + slot * SLOT.size)
+            if hash_value == 0:
+                return
+            if hash_value == wanted:
+                yield offset, length
+            slot = (slot + 1) % self.__slots
+
+    def build(self, signature, entries):
+        """Writes a new index file with the entries (key value, offset, length)"""
+        entries = [(key_hash(key_value), offset, length) for key_value, offset, length in entries]
+        self.__write(signature, entries)
+
+    def add(self, signature, entries):
+        """Adds the entries of the records appended to the indexed file"""
+        entries = [(key_hash(key_value), offset, length) for key_value, offset, length in entries]
+        if (self.__entries + len(entries)) * 2 > self.__slots:
+            self.__write(signature, self.__hashed_entries() + entries)
+            return
+        with open(self.__index_path, "r+b") as file, mmap.mmap(file.fileno(), 0) as table:
+            for hash_value, offset, length in entries:
+                slot = self.__free_slot(table, hash_value, HEADER.size)
+                SLOT.pack_into(table, HEADER.size + slot * SLOT.size, hash_value, offset, length)
+            # the header goes last, an interrupted add leaves a stale index
+            HEADER.pack_into(table, 0, MAGIC, *signature, self.__slots, self.__entries + len(entries))
+            table.flush()
+        self.open()
+
+    def __free_slot(self, table, hash_value, start=0):
+        """Returns the first free slot of the probe sequence of the hash"""
+        slot = hash_value % self.__slots
+        while SLOT.unpack_from(table, start + slot * SLOT.size)[0] != 0:
+            slot = (slot + 1) % self.__slots
+        return slot
+
+    def __hashed_entries(self):
+        """Returns the entries of the index in the order of the indexed file"""
+        entries = [SLOT.unpack_from(self.__map, HEADER.size + slot * SLOT.size) for slot in range(self.__slots)]
+        return sorted((entry for entry in entries if entry[0] != 0), key=lambda entry: entry[1])
+
+    def __write(self, signature, entries):
+        """Writes the index file with a table for the hashed entries"""
+        self.close()
+        self.__slots = MIN_SLOTS
+        while len(entries) * 2 > self.__slots:
+            self.__slots *= 2
+        table = bytearray(self.__slots * SLOT.size)
+        for hash_value, offset, length in entries:
+            slot = self.__free_slot(table, hash_value)
+            SLOT.pack_into(table, slot * SLOT.size, hash_value, offset, length)
+        header = HEADER.pack(MAGIC, *signature, self.__slots, len(entries))
+        replace_file(self.__index_path, header + bytes(table))
+        self.open()
@@ -0,0 +1,209 @@
+"""Contains the class IndexedJsonStore"""
+import json
+import os
+import re
+
+from .json_store import JsonStore
+from .hash_index import HashIndex
+from .order_management_exception import OrderManagementException
+
+DECODER = json.JSONDecoder()
+WHITESPACE = b" \t\n\r"
+# bytes read from the end of the file to find where the list closes
+TAIL_SIZE = 4096
+SEPARATOR = re.compile(r"[ \t\n\r,]*")
+
+
+def render_record(record):
+    """Returns the record as json.dumps(records, indent=4) writes the items"""
+    return "    " + json.dumps(record, indent=4).replace("\n", "\n    ")
+
+
+def record_ranges(text, partial=False):
+    """Returns every record of the json text of a store with the byte offset
+    and length of its text. With partial, a record that is not complete
+    ends the list instead of raising JSONDecodeError"""
+    ranges = []
+    index = SEPARATOR.match(text).end()
+    is_list = text.startswith("[", index)
+    if is_list:
+        index += 1
+    byte_offset = len(text[:index].encode("utf-8"))
+    while True:
+        start = SEPARATOR.match(text, index).end()
+        if start == len(text) or (is_list and text[start] == "]"):
+            return ranges
+        byte_offset += len(text[index:start].encode("utf-8"))
+        try:
+            record, index = DECODER.raw_decode(text, start)
+        except json.JSONDecodeError:
+            if partial:
+                return ranges
+            raise
+        length = len(text[start:index].encode("utf-8"))
+        ranges.append((record, byte_offset, length))
+        byte_offset += length
+        if not is_list:
+            return ranges
+
+
+class IndexedJsonStore(JsonStore):
+    """Json store with a persistent index for every key the records are
+    found by.
+
+    The json list is written exactly as JsonStore does, and for every key a
+    HashIndex file next to it (order_request.json ->
+    order_request.json.order_id.idx) maps the key values to the byte ranges
+    of the records. Finding a record reads a few slots of the index and the
+    record, so it does not depend on the number of records. New records are
+    written in place over the closing bracket of the list, which is written
+    again after them, and the file is synced; the records already written
+    keep their offsets, so they are added to the indexes without reading
+    the store again and a write does not depend on the size of the store.
+    A crash in the middle of a write can leave the list without its
+    closing bracket: the list is then cut back to its last complete record
+    and closed again by the next write, lookup or load. An index that was not updated with the store,
+    because another program wrote the json file, is built again the next
+    time it is used."""
+
+    indexed = True
+    KEYS = ("order_id", "tracking_code")
+
+    def __init__(self, store_path):
+        super().__init__(store_path)
+        self.__indexes = {key: HashIndex(f"{store_path}.{key}.idx") for key in self.KEYS}
+
+    def index_path(self, key):
+        """Returns the path of the index file of the key"""
+        return self.__indexes[key].index_path
+
+    def find(self, key, key_value):
+        """Returns the first record whose key has the given value or None"""
+        if key not in self.KEYS:
+            raise OrderManagementException("Store is not indexed by " + str(key))
+        if not isinstance(key_value, str):
+            return None
+        with self._lock:
+            record = self.__find(key, key_value, rebuild=False)
+            if record is False:
+                # the index did not match the records, it is built again
+                record = self.__find(key, key_value, rebuild=True)
+            return record or None
+
+    def __find(self, key, key_value, rebuild):
+        """Returns the record, None if there is none or False if the index
+        points to something that is not a record with the key value"""
+        index = self.__fresh_index(key, rebuild)
+        with open(self._store_path, "rb") as file:
+            for offset, length in list(index.candidates(key_value)):
+                file.seek(offset)
+                try:
+                    record = json.loads(file.read(length))
+                except ValueError:
+                    return False
+                # a different key with the same 64 bit hash means a stale index
+                if not isinstance(record, dict) or record.get(key) != key_value:
+                    return False
+                return record
+        return None
+
+    def __fresh_index(self, key, rebuild):
+        """Returns the index of the key built for the current json file"""
+        index = self.__indexes[key]
+        signature = self._file_signature(self._store_path)
+        if not rebuild and index.signature == signature:
+            return index
+        # another process may have updated or built the index file
+        if not rebuild and index.open() and index.signature == signature:
+            return index
+        self.__repair_tail()
+        signature = self._file_signature(self._store_path)
+        with open(self._store_path, "r", encoding="utf-8") as file:
+            ranges = record_ranges(file.read())
+        index.build(signature, self.__entries(key, ranges))
+        return index
+
+    @staticmethod
+    def __entries(key, ranges):
+        """Returns the entries of the index of the key for the record ranges"""
+        return [(record[key], offset, length) for record, offset, length in ranges
+                if isinstance(record, dict) and isinstance(record.get(key), str)]
+
+    def load(self):
+        """Returns the list with all the records of the store"""
+        # a write in place is not atomic, readers wait for it
+        with self._lock:
+            self.__repair_tail()
+            return super().load()
+
+    def __repair_tail(self):
+        """Cuts a list left without its closing bracket by an interrupted
+        write back to its last complete record and closes it again"""
+        with open(self._store_path, "r+b") as file:
+            head = file.read(TAIL_SIZE).lstrip(WHITESPACE)
+            end = file.seek(0, os.SEEK_END)
+            file.seek(max(0, end - TAIL_SIZE))
+            if not head.startswith(b"[") or file.read().rstrip(WHITESPACE).endswith(b"]"):
+                return
+            file.seek(0)
+            text = file.read().decode("utf-8", errors="ignore")
+            ranges = record_ranges(text, partial=True)
+            if ranges:
+                _, offset, length = ranges[-1]
+                file.seek(offset + length)
+                file.write(b"\n]")
+            else:
+                file.seek(len(text[:text.index("[") + 1].encode("utf-8")))
+                file.write(b"]")
+            file.truncate()
+            file.flush()
+            os.fsync(file.fileno())
+
+    def extend(self, records):
+        """Writes the records in place at the end of the json list and adds
+        them to the indexes"""
+        with self._lock:
+            self.__repair_tail()
+            signature = self._file_signature(self._store_path)
+            with open(self._store_path, "r+b") as file:
+                end = file.seek(0, os.SEEK_END)
+                tail_start = file.seek(max(0, end - TAIL_SIZE))
+                tail = file.read()
+                head = tail.rstrip(WHITESPACE)
+                if not head.endswith(b"]") or not head[:-1].rstrip(WHITESPACE):
+                    head = None
+                else:
+                    head = head[:-1].rstrip(WHITESPACE)
+                if head is not None:
+                    ranges = self.__append(file, tail_start + len(head), head.endswith(b"["), records)
+            if head is None:
+                # a store with a single object is written again as a list
+                super().extend(records)
+                return
+            new_signature = self._file_signature(self._store_path)
+            for key, index in self.__indexes.items():
+                if index.signature != signature and not (index.open() and index.signature == signature):
+                    continue
+                index.add(new_signature, self.__entries(key, ranges))
+
+    @staticmethod
+    def __append(file, offset, is_empty, records):
+        """Writes the records and the closing bracket at the offset of the
+        file, syncs it and returns the ranges of the records"""
+        start = offset
+        ranges = []
+        parts = []
+        for record in records:
+            separator = b"\n" if is_empty and not ranges else b",\n"
+            record_text = render_record(record).encode("utf-8")
+            offset += len(separator) + 4
+            ranges.append((record, offset, len(record_text) - 4))
+            offset += len(record_text) - 4
+            parts.append(separator + record_text)
+        parts.append(b"\n]" if ranges or not is_empty else b"]")
+        file.seek(start)
+        file.write(b"".join(parts))
+        file.truncate()
+        file.flush()
+        os.fsync(file.fileno())
+        return ranges
@@ -0,0 +1,210 @@
+"""Streaming reader of the input files of send_product with many records"""
+import json
+
+from .order_id_not_found_exception import OrderidNotFoundException
+
+CHUNK_SIZE = 64 * 1024
+MAX_RECORD_SIZE = 1024 * 1024
+WHITESPACE = " \t\n\r"
+DECODER = json.JSONDecoder()
+
+
+def decode_error(message, line, column, offset):
+    """Returns a JSONDecodeError for a position of the whole file"""
+    error = json.JSONDecodeError(message, "", 0)
+    error.pos, error.lineno, error.colno = offset, line, column
+    error.args = (f"{message}: line {line} column {column} (char {offset})",)
+    return error
+
+
+class InputFileReader:
+    """Reads the records of an input file of send_product one by one.
+
+    The file can hold a json array of {"OrderID": ...} objects, json lines
+    or a single object. It is read in chunks so the memory used does not
+    depend on the size of the file. Every record is returned with the line
+    where it starts and either its OrderID or the exception that makes it
+    invalid (JSONDecodeError or OrderidNotFoundException). After an invalid
+    record the reader goes on with the next one. With key None the whole
+    records are returned instead of their OrderID, for reading the stores."""
+
+    def __init__(self, input_file_path, chunk_size=CHUNK_SIZE, max_record_size=MAX_RECORD_SIZE, key="OrderID"):
+        self.__input_file_path = input_file_path
+        self.__key = key
+        self.__chunk_size = chunk_size
+        self.__max_record_size = max_record_size
+        self.__file = None
+        self.__buffer = ""
+        self.__start = 0
+        self.__eof = False
+        self.__line = 1
+        self.__line_start = 0
+        self.__counted = 0
+
+    def __iter__(self):
+        with open(self.__input_file_path, "r", encoding="utf-8") as file:
+            self.__file = file
+            index = self.__skip_whitespace(0)
+            if self.__char(index) == "[":
+                yield from self.__read_array(index + 1)
+            else:
+                yield from self.__read_values(index)
+
+    def __fill(self):
+        """Reads one more chunk, returns False at the end of the file"""
+        if self.__eof:
+            return False
+        chunk = self.__file.read(self.__chunk_size)
+        if not chunk:
+            self.__eof = True
+            return False
+        self.__buffer += chunk
+        return True
+
+    def __char(self, index):
+        """Returns the character at the index or "" at the end of the file"""
+        while index >= len(self.__buffer):
+            if not self.__fill():
+                return ""
+        return self.__buffer[index]
+
+    def __skip_whitespace(self, index):
+        """Returns the index of the next character that is not whitespace"""
+        while self.__char(index) in WHITESPACE and self.__char(index) != "":
+            index += 1
+        return index
+
+    def __discard(self, index):
+        """Forgets the part of the buffer before the index"""
+        if index < self.__chunk_size:
+            return index
+        self.__location(index)
+        self.__buffer = self.__buffer[index:]
+        self.__start += index
+        return 0
+
+    def __location(self, index):
+        """Returns the line, column and offset in the file of the index"""
+        offset = self.__start + index
+        begin = self.__counted - self.__start
+        if index < begin:
+            # an error found past the record the reader goes on with, the lines
+            # counted so far are kept
+            newlines = self.__buffer.count("\n", index, begin)
+            line_start = self.__line_start
+            if newlines:
+                line_start = self.__start + self.__buffer.rfind("\n", 0, index) + 1
+            return self.__line - newlines, offset - line_start + 1, offset
+        newlines = self.__buffer.count("\n", begin, index)
+        if newlines:
+            self.__line += newlines
+            self.__line_start = self.__start + self.__buffer.rindex("\n", begin, index) + 1
+        self.__counted = offset
+        return self.__line, offset - self.__line_start + 1, offset
+
+    def __error(self, message, index):
+        """Returns the JSONDecodeError for the index of the buffer"""
+        return decode_error(message, *self.__location(index))
+
+    def __decode(self, index):
+        """Returns the value at the index and the index where it ends"""
+        while True:
+            try:
+                value, end = DECODER.raw_decode(self.__buffer, index)
+            except json.JSONDecodeError as exception:
+                if len(self.__buffer) - index < self.__max_record_size and self.__fill():
+                    continue
+                raise self.__error(exception.msg, exception.pos) from exception
+            # a number at the end of the buffer may go on in the next chunk
+            if end == len(self.__buffer) and self.__fill():
+                continue
+            return value, end
+
+    def __record(self, index):
+        """Returns the line and the OrderID (or the record) or exception of the record at the index"""
+        line = self.__location(index)[0]
+        try:
+            value, end = self.__decode(index)
+        except json.JSONDecodeError as exception:
+            return line, exception, None
+        if self.__key is None:
+            return line, value, end
+        if not isinstance(value, dict) or self.__key not in value:
+            return line, OrderidNotFoundException(
+                f"Send product: record at line {line} does not have order id"), end
+        return line, value[self.__key], end
+
+    def __read_array(self, index):
+        """Yields the records of a json array"""
+        index = self.__skip_whitespace(index)
+        if self.__char(index) == "]":
+            return
+        while True:
+            index = self.__discard(index)
+            line, result, end = self.__record(index)
+            yield line, result
+            if end is None:
+                end = self.__skip_value(index)
+            index = self.__skip_whitespace(end)
+            char = self.__char(index)
+            if char == "]":
+                return
+            if char != ",":
+                # an element that could not be decoded has already been reported
+                if not isinstance(result, json.JSONDecodeError):
+                    yield self.__location(index)[0], self.__error("Expecting ',' delimiter", index)
+                return
+            index = self.__skip_whitespace(index + 1)
+
+    def __skip_value(self, index):
+        """Returns the index of the comma or bracket that ends the array
+        element at the index, for going on after an invalid element. The
+        part of the buffer skipped is forgotten on the way"""
+        depth = 0
+        in_string = False
+        while True:
+            char = self.__char(index)
+            if char == "":
+                return index
+            index = self.__discard(index)
+            if in_string:
+                if char == "\\":
+                    index += 1
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in "[{":
+                depth += 1
+            elif char in "]}":
+                if depth == 0:
+                    return index
+                depth -= 1
+            elif char == "," and depth == 0:
+                return index
+            index += 1
+
+    def __read_values(self, index):
+        """Yields the records of json lines or of a single object"""
+        while self.__char(index) != "":
+            index = self.__discard(index)
+            line, result, end = self.__record(index)
+            yield line, result
+            if end is None:
+                end = self.__skip_to_next_object(index)
+            index = self.__skip_whitespace(end)
+
+    def __skip_to_next_object(self, index):
+        """Returns the index of the next line that starts an object. The
+        part of the buffer skipped is forgotten on the way"""
+        while True:
+            while self.__char(index) not in ("\n", ""):
+                index = self.__discard(index + 1)
+            if self.__char(index) == "":
+                return index
+            start = index + 1
+            index = start
+            while self.__char(index) in (" ", "\t", "\r") and self.__char(index) != "":
+                index += 1
+            if self.__char(index) == "{":
+                return start
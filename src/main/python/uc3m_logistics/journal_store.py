@@ -0,0 +1,139 @@
+"""Contains the class JournalStore"""
+import json
+import os
+
+from .json_store import JsonStore
+from .file_lock import replace_file
+
+
+class JournalStore(JsonStore):
+    """Store that appends the new records to a json lines journal.
+
+    The json list file is kept as the base of the store and every new
+    record is written as one line of the journal next to it
+    (order_request.json -> order_request.jsonl), so adding a record does
+    not depend on how many records the store already has. Every
+    compact_every records the journal is folded into the base file. The
+    size of the journal folded and the number of records of the new base
+    file are written first to a .fold file (order_request.jsonl.fold), so
+    if the journal could not be emptied after the base file was replaced,
+    the records already folded are dropped from it instead of being read
+    twice."""
+
+    def __init__(self, store_path, fsync_every=0, compact_every=0):
+        super().__init__(store_path)
+        self.__journal_path = store_path + "l"
+        self.__fold_path = self.__journal_path + ".fold"
+        self.__fsync_every = fsync_every
+        self.__compact_every = compact_every
+        self.__unsynced_records = 0
+        self.__uncompacted_records = 0
+
+    @property
+    def journal_path(self):
+        """Returns the path of the json lines journal"""
+        return self.__journal_path
+
+    def create(self):
+        """Creates the base file and the journal if they do not exist"""
+        super().create()
+        with self._lock:
+            if not os.path.exists(self.__journal_path):
+                with open(self.__journal_path, "w", encoding="utf-8"):
+                    pass
+
+    def signature(self):
+        """Returns a value that changes whenever the base or the journal change"""
+        return super().signature() + (self._file_signature(self.__journal_path),)
+
+    def load(self):
+        """Returns the records of the base file followed by the journal ones"""
+        # a compaction between both reads would lose the journal records
+        with self._lock:
+            return super().load() + self.load_journal()
+
+    def load_journal(self):
+        """Returns the records written to the journal"""
+        self._finish_compaction()
+        records = []
+        with open(self.__journal_path, "r", encoding="utf-8") as file:
+            for line in file:
+                # a line without end of line was not completely written
+                if not line.endswith("\n"):
+                    break
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # torn line left by an interrupted write
+                    continue
+        return records
+
+    def extend(self, records):
+        """Appends one line per record at the end of the journal"""
+        lines = "".join(json.dumps(record) + "\n" for record in records).encode("utf-8")
+        with self._lock:
+            self._finish_compaction()
+            self.__append(lines, len(records))
+
+    def __append(self, lines, count):
+        """Appends the lines to the journal, syncing and compacting it when due"""
+        with open(self.__journal_path, "ab+") as file:
+            if file.seek(0, os.SEEK_END) > 0:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    # the last write was interrupted, its line is left apart
+                    lines = b"\n" + lines
+            file.write(lines)
+            file.flush()
+            self.__unsynced_records += count
+            if self.__fsync_every and self.__unsynced_records >= self.__fsync_every:
+                os.fsync(file.fileno())
+                self.__unsynced_records = 0
+        self.__uncompacted_records += count
+        if self.__compact_every and self.__uncompacted_records >= self.__compact_every:
+            self.compact()
+
+    def sync(self):
+        """Forces the records appended to the journal to reach the disk"""
+        with open(self.__journal_path, "a", encoding="utf-8") as file:
+            os.fsync(file.fileno())
+        self.__unsynced_records = 0
+
+    def compact(self):
+        """Folds the journal into the base json file and empties it"""
+        with self._lock:
+            records = self.load()
+            journal = self._file_signature(self.__journal_path)
+            replace_file(self.__fold_path, json.dumps({"journal": journal and list(journal[:2]),
+                                                       "base_count": len(records)}))
+            self._replace_base(records)
+            with open(self.__journal_path, "w", encoding="utf-8"):
+                pass
+            os.remove(self.__fold_path)
+            self.__unsynced_records = 0
+            self.__uncompacted_records = 0
+
+    def _replace_base(self, records):
+        """Writes the records as the new base file"""
+        replace_file(self._store_path, json.dumps(records, indent=4))
+
+    def _finish_compaction(self):
+        """Empties the part of the journal already folded into the base file
+        by a compaction that was interrupted before doing it"""
+        if not os.path.exists(self.__fold_path):
+            return
+        with self._lock:
+            try:
+                with open(self.__fold_path, "r", encoding="utf-8") as file:
+                    fold = json.load(file)
+            except FileNotFoundError:
+                return
+            journal = self._file_signature(self.__journal_path)
+            # the base file has the records of the journal only if it was replaced
+            if fold["journal"] and journal and journal[0] == fold["journal"][0] and \
+                    journal[1] >= fold["journal"][1] and len(JsonStore.load(self)) == fold["base_count"]:
+                with open(self.__journal_path, "rb") as file:
+                    file.seek(fold["journal"][1])
+                    rest = file.read()
+                replace_file(self.__journal_path, rest)
+            os.remove(self.__fold_path)
@@ -0,0 +1,24 @@
+"""Contains the class JsonStore"""
+import json
+
+from .order_store import OrderStore
+from .file_lock import replace_file
+
+
+class JsonStore(OrderStore):
+    """Store that keeps all its records as one json list with indent 4"""
+
+    def load(self):
+        """Returns the list with all the records of the store"""
+        with open(self._store_path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        if isinstance(data, dict):
+            data = [data]
+        return data
+
+    def extend(self, records):
+        """Adds the records replacing the whole json list"""
+        with self._lock:
+            data = self.load()
+            data.extend(records)
+            replace_file(self._store_path, json.dumps(data, indent=4))
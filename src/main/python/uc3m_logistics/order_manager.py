@@ -1,5 +1,4 @@
 """Order Manager File"""
-import datetime
 import json
 import os
 import string
@@ -9,117 +8,87 @@ from .order_shipping import OrderShipping
 from .order_management_exception import OrderManagementException
 from .order_id_not_found_exception import OrderidNotFoundException
 from .order_request import OrderRequest
-
-from freezegun import freeze_time
-from datetime import datetime
+from .indexed_json_store import IndexedJsonStore
+from .order_store import store_directory
+from .order_repository import OrderRepository
+from .clock import SYSTEM_CLOCK, days_between
+from .ean13_validator import validate_ean13_many
+from .order_validator import ORDER_VALIDATOR
+from .input_file_reader import InputFileReader
 
 
 class OrderManager:
     """Class for providing the methods for managing the orders"""
 
-    def __init__(self):
-        store_path = "../stores/"
-        current_path = os.path.dirname(__file__)
-        self.__order_request_json_store = os.path.join(current_path, store_path, "order_request.json")
-        self.__order_manager_json_store = os.path.join(current_path, store_path, "order_manager.json")
-        self.__order_shipping_json_store = os.path.join(current_path, store_path, "order_shipping.json")
-
-        try:
-            if not os.path.exists(self.__order_request_json_store):
-                with open(self.__order_request_json_store, "w", encoding="utf-8") as file:
-                    file.write("[]")
-        except FileNotFoundError as exception:
-            raise OrderManagementException("Could create/find order_request.json") from exception
-
-        try:
-            if not os.path.exists(self.__order_manager_json_store):
-                with open(self.__order_manager_json_store, "w", encoding="utf-8") as file:
-                    file.write("[]")
-        except FileNotFoundError as exception:
-            raise OrderManagementException("Could create/find order_manager.json") from exception
-
+    def __init__(self, store_class=IndexedJsonStore, clock=SYSTEM_CLOCK, delivery_day_tolerance=0,
+                 store_path=None):
+        self.__clock = clock
+        # calendar days a product can be delivered before or after its delivery day
+        self.__delivery_day_tolerance = delivery_day_tolerance
+        self.__store_path = store_directory(store_path)
         try:
-            if not os.path.exists(self.__order_shipping_json_store):
-                with open(self.__order_shipping_json_store, "w", encoding="utf-8") as file:
-                    file.write("[]")
-        except FileNotFoundError as exception:
-            raise OrderManagementException("Could create/find order_shipping.json") from exception
+            os.makedirs(self.__store_path, exist_ok=True)
+        except OSError as exception:
+            raise OrderManagementException("Could not create store directory " + self.__store_path) \
+                from exception
+        self.__order_request_json_store = os.path.join(self.__store_path, "order_request.json")
+        self.__order_manager_json_store = os.path.join(self.__store_path, "order_manager.json")
+        self.__order_shipping_json_store = os.path.join(self.__store_path, "order_shipping.json")
+
+        self.__order_request_store = store_class(self.__order_request_json_store)
+        self.__order_manager_store = store_class(self.__order_manager_json_store)
+        self.__order_shipping_store = store_class(self.__order_shipping_json_store)
+        self.__order_request_store.create()
+        self.__order_manager_store.create()
+        self.__order_shipping_store.create()
+        self.__repository = OrderRepository(self.__order_request_store, self.__order_shipping_store,
+                                            self.__order_manager_store)
+
+    @property
+    def repository(self):
+        """Returns the repository with the records of the stores"""
+        return self.__repository
+
+    @property
+    def store_path(self):
+        """Returns the directory of the stores"""
+        return self.__store_path
+
+    @property
+    def clock(self):
+        """Returns the clock used for time stamping the orders"""
+        return self.__clock
 
     @staticmethod
     def validate_ean13(ean13_code):
         """Returns ean13_code if valid, otherwise throws exception"""
-        if len(ean13_code) != 13:
-            raise OrderManagementException("Invalid ean13 code: not a 13 digit string")
-        if not ean13_code.isdigit():
-            raise OrderManagementException("Invalid ean13 code: not a 13 digit string")
-        barcode_sum = 0
-        for i in range(0, len(ean13_code), 1):
-            if i == len(ean13_code) - 1:
-                continue
-            if i % 2 == 0:  # if the position is even, the weight is 3
-                barcode_sum += (1 * int(ean13_code[i]))
-            else:
-                barcode_sum += (3 * int(ean13_code[i]))
-        # validate checkdigit
-        if barcode_sum % 10 == 0:
-            expected_checkdigit = (int(barcode_sum / 10) * 10) - barcode_sum
-        else:
-            expected_checkdigit = \
-                ((int(barcode_sum / 10) + 1) * 10) - barcode_sum
-        if not expected_checkdigit == int(ean13_code[-1]):
-            raise OrderManagementException("Invalid ean13 code: check digit is incorrect")
-        return ean13_code
+        return ORDER_VALIDATOR.validate_field("product_id", ean13_code)
+
+    @staticmethod
+    def validate_ean13_many(ean13_codes):
+        """Validates a batch of ean13 codes, returns the mask of the valid
+        ones and the error message of every invalid one"""
+        return validate_ean13_many(ean13_codes)
 
     @classmethod
     def validate_order_type(cls, order_type):
         """Returns order_type if valid, otherwise throws exception"""
-        if not isinstance(order_type, str):
-            raise OrderManagementException("Invalid order type: not a string")
-        order_type = order_type.lower()
-        if order_type in ["regular", "premium"]:
-            return order_type
-        raise OrderManagementException("Invalid order type: string is invalid")
+        return ORDER_VALIDATOR.validate_field("order_type", order_type).lower()
 
     @classmethod
     def validate_address(cls, address):
         """Returns address if valid, otherwise throws exception"""
-        if not isinstance(address, str):
-            raise OrderManagementException("Invalid address: address is not a string")
-        if len(address) > 100:
-            raise OrderManagementException("Invalid address: address is too long")
-        if len(address) < 20:
-            raise OrderManagementException("Invalid address: address is too short")
-        if " " not in address:
-            raise OrderManagementException("Invalid address: address should contain a space")
-        return address
+        return ORDER_VALIDATOR.validate_field("address", address)
 
     @classmethod
     def validate_phone_number(cls, phone_number):
         """Returns phone_number if valid, otherwise throws exception"""
-        if not isinstance(phone_number, str):
-            raise OrderManagementException("Invalid phone number: phone number is not a string")
-        if len(phone_number) > 12:
-            raise OrderManagementException("Invalid phone number: phone number is too long")
-        if len(phone_number) < 12:
-            raise OrderManagementException("Invalid phone number: phone number is too short")
-        if phone_number[0:3] != "+34":
-            raise OrderManagementException("Invalid phone number: wrong area code")
-        return phone_number
+        return ORDER_VALIDATOR.validate_field("phone_number", phone_number)
 
     @classmethod
     def validate_zip_code(cls, zip_code: str):
         """Returns zipcode if valid, otherwise throws exception"""
-        if not isinstance(zip_code, str):
-            raise OrderManagementException("Invalid zip code: zip code not a string")
-        if not len(zip_code) == 5:
-            raise OrderManagementException("Invalid zip code: zip code not 5 characters")
-        if not zip_code.isdigit():
-            raise OrderManagementException("Invalid zip code: characters are not digits")
-        if int(zip_code) < 1001:
-            raise OrderManagementException("Invalid zip code: zip code is below range")
-        if int(zip_code) > 52006:
-            raise OrderManagementException("Invalid zip code: zip code is above range")
-        return zip_code
+        return ORDER_VALIDATOR.validate_field("zip_code", zip_code)
 
     @classmethod
     def is_hexadecimal(self, check_string : str):
@@ -137,49 +106,13 @@ class OrderManager:
         except Exception as exception:
             raise OrderManagementException("Invalid OrderID: OrderID is not a hexadecimal") from exception
 
-        expected_order_id = ""
-        # opening order request json
-        with open(self.__order_request_json_store, "r+", encoding="utf-8") as file:
-            data = json.load(file)
-        if "OrderRequest.__order_id" in data and data["OrderRequest.__order_id"] == order_id:
-            does_order_id_exist = True
-            product_id = data["OrderRequest.__product_id"]
-            order_type = data["OrderRequest.__order_type"]
-            delivery_address = data["OrderRequest.__delivery_address"]
-            delivery_phone_number = data["OrderRequest.__phone_number"]
-            zip_code = data["OrderRequest.__zip_code"]
-            expected_order_id = data["OrderRequest.__order_id"]
-        if not data:
-            raise OrderManagementException("Invalid OrderID: Order does not exist in order request json")
-        assert order_id == expected_order_id, "order id is not valid"
-
-        if data["order_id"] == order_id:
-            product_id = data["product_id"]
-            order_type = data["order_type"]
-            delivery_address = data["delivery_address"]
-            delivery_phone_number = data["phone_number"]
-            zip_code = data["zip_code"]
-            expected_order_id = data["order_id"]
-        else:
-            raise OrderManagementException("Invalid OrderID: Order id is not in order request json")
-        assert order_id == expected_order_id, "Invalid OrderID: order ids are not equal"
-        return OrderRequest(product_id, order_type, delivery_address, delivery_phone_number, zip_code)
-
-
-        # opening order request json
-        with open(self.__order_request_json_store, "r+", encoding="utf-8") as file:
-            data = json.load(file)
-        if data["order_id"] == order_id:
-            product_id = data["product_id"]
-            order_type = data["order_type"]
-            delivery_address = data["delivery_address"]
-            delivery_phone_number = data["phone_number"]
-            zip_code = data["zip_code"]
-            expected_order_id = data["order_id"]
-        else:
+        try:
+            data = self.__repository.find_order_request(order_id)
+        except Exception as exception:
+            raise OrderManagementException("Could not open order_request json") from exception
+        if data is None:
             raise OrderManagementException("Invalid OrderID: Order id is not in order request json")
-        assert order_id == expected_order_id, "Invalid OrderID: order ids are not equal"
-        return OrderRequest(product_id, order_type, delivery_address, delivery_phone_number, zip_code)
+        return OrderRequest.from_json(data)
 
     @classmethod
     def validate_tracking_code(cls, tracking_code):
@@ -191,31 +124,60 @@ class OrderManager:
 
 
     # pylint: disable=too-many-arguments
-    @freeze_time('2023-03-09')
+    def build_order_request(self, product_id: str, order_type: str, address: str, phone_number: str,
+                            zip_code: str) -> OrderRequest:
+        """Returns the order request for the arguments if they are valid,
+        otherwise throws exception"""
+        # check validity of the arguments
+        ORDER_VALIDATOR.validate(product_id, order_type, address, phone_number, zip_code)
+
+        return OrderRequest(product_id, order_type, address, phone_number, zip_code, self.__clock)
+
+    # pylint: disable=too-many-arguments
     def register_order(self, product_id: str, order_type: str, address: str, phone_number: str,
                        zip_code: str) -> str:
 
-        # check validity of the arguments
-        self.validate_ean13(product_id)
-        self.validate_order_type(order_type)
-        self.validate_address(address)
-        self.validate_phone_number(phone_number)
-        self.validate_zip_code(zip_code)
-
-        order_request = OrderRequest(product_id, order_type, address, phone_number, zip_code)
+        order_request = self.build_order_request(product_id, order_type, address, phone_number, zip_code)
 
         try:
-            with open(self.__order_request_json_store, "r+", encoding="utf-8") as file:
-                data = json.load(file)
-                data.append(order_request.to_json())
-                file.seek(0)
-                json.dump(data, file, indent=4)
+            self.__repository.add_order_requests([order_request.to_json()])
         except Exception as exception:
             raise OrderManagementException("Could not write to file order_request json") from exception
         return order_request.order_id
 
-    @freeze_time('2023-03-09')
-    def send_product(self, input_file_path: str):
+    def register_orders(self, orders) -> list:
+        """Registers a batch of orders writing the order request store once.
+
+        Every order is a tuple with the arguments of register_order or a dict
+        with their names. Returns a list with, for every order, its order_id
+        or the OrderManagementException that makes it invalid"""
+        results = []
+        records = []
+        for order in orders:
+            try:
+                if isinstance(order, dict):
+                    order_request = self.build_order_request(**order)
+                else:
+                    order_request = self.build_order_request(*order)
+            except TypeError as exception:
+                results.append(OrderManagementException("Invalid order: " + str(exception)))
+                continue
+            except OrderManagementException as exception:
+                results.append(exception)
+                continue
+            records.append(order_request.to_json())
+            results.append(order_request.order_id)
+
+        if records:
+            try:
+                self.__repository.add_order_requests(records)
+            except Exception as exception:
+                raise OrderManagementException("Could not write to file order_request json") from exception
+        return results
+
+    @staticmethod
+    def read_order_id(input_file_path: str) -> str:
+        """Returns the OrderID of the input file of send_product"""
         try:
             with open(input_file_path, "r+", encoding="utf-8") as file:
                 data = json.load(file)
@@ -236,20 +198,22 @@ class OrderManager:
         except Exception as exception:
             raise OrderManagementException(str(exception)) from exception
             raise OrderManagementException("Send product: Error with the input file") from exception
+        return order_id
 
+    def build_order_shipping(self, order_id: str) -> OrderShipping:
+        """Returns the order shipping for the stored order with the order_id"""
         order_request = self.validate_orderid(order_id)
 
         # creating order shipping object
-        order_shipping = OrderShipping(order_request.product_id, order_request.order_id, order_request.phone_number,
-                                       order_request.order_type)
+        return OrderShipping(order_request.product_id, order_request.order_id, order_request.phone_number,
+                             order_request.order_type, self.__clock)
+
+    def send_product(self, input_file_path: str):
+        order_shipping = self.build_order_shipping(self.read_order_id(input_file_path))
 
         # opening order shipping json
         try:
-            with open(self.__order_shipping_json_store, "r+", encoding="utf-8") as file:
-                data = json.load(file)
-                data.append(order_shipping.to_json())
-                file.seek(0)
-                json.dump(data, file, indent=4)
+            self.__repository.add_order_shippings([order_shipping.to_json()])
         except Exception as exception:
             raise OrderManagementException("Error writing Order Shipping information to file") \
                 from exception
@@ -258,39 +222,122 @@ class OrderManager:
         # tracking code of the shipping request is returned
         return order_shipping.tracking_code
 
-    @freeze_time('2023-03-10')
-    def deliver_product(self, tracking_code: str):
+    def send_products(self, input_file_paths) -> list:
+        """Sends the products of a batch of input files writing the order
+        shipping store once.
+
+        Returns a list with, for every input file, the tracking code of its
+        shipping or the exception send_product would have raised for it"""
+        results = []
+        records = []
+        for input_file_path in input_file_paths:
+            try:
+                order_shipping = self.build_order_shipping(self.read_order_id(input_file_path))
+            except (OSError, ValueError, OrderidNotFoundException, OrderManagementException) as exception:
+                results.append(exception)
+                continue
+            records.append(order_shipping.to_json())
+            results.append(order_shipping.tracking_code)
+
+        if records:
+            self.__add_order_shippings(records)
+        return results
+
+    def send_products_from_file(self, input_file_path: str, batch_size: int = 1000):
+        """Sends the products of an input file with many records (a json
+        array or json lines of {"OrderID": ...} objects), reading it in
+        chunks.
+
+        Yields, for every record, the line where it starts and the tracking
+        code of its shipping or the exception that makes it invalid. The
+        shippings are stored with one write every batch_size records, before
+        their results are yielded"""
+        results = []
+        records = []
+        for line, order_id in InputFileReader(input_file_path):
+            if isinstance(order_id, Exception):
+                results.append((line, order_id))
+                continue
+            try:
+                order_shipping = self.build_order_shipping(order_id)
+            except OrderManagementException as exception:
+                results.append((line, exception))
+                continue
+            records.append(order_shipping.to_json())
+            results.append((line, order_shipping.tracking_code))
+            if len(records) >= batch_size:
+                self.__add_order_shippings(records)
+                yield from results
+                results, records = [], []
+        if records:
+            self.__add_order_shippings(records)
+        yield from results
+
+    def __add_order_shippings(self, records):
+        """Stores the order shipping records"""
+        try:
+            self.__repository.add_order_shippings(records)
+        except Exception as exception:
+            raise OrderManagementException("Error writing Order Shipping information to file") \
+                from exception
+
+    def send_products_from_dir(self, input_directory: str) -> dict:
+        """Sends the products of all the json input files of the directory.
+
+        Returns a dict with the result of send_products for every file path"""
+        input_file_paths = [os.path.join(input_directory, filename)
+                            for filename in sorted(os.listdir(input_directory))
+                            if filename.endswith(".json") and not filename.startswith(".")]
+        return dict(zip(input_file_paths, self.send_products(input_file_paths)))
+
+    def build_delivery(self, tracking_code: str) -> dict:
+        """Returns the delivery record for the shipping with the tracking code
+        if it can be delivered now, otherwise throws exception"""
         self.validate_tracking_code(tracking_code)
-        delivery_time = datetime.utcnow()
-        delivery_day = datetime.timestamp(delivery_time)
+        delivery_day = self.__clock.timestamp()
         try:
-            with open(self.__order_shipping_json_store, "r", encoding="utf-8") as file:
-                data = json.load(file)
+            item = self.__repository.find_order_shipping(tracking_code)
         except Exception as exception:
             raise OrderManagementException("Could not open order_shipping_json_store") from exception
+        if item is None:
+            raise OrderManagementException("Deliver Product: Invalid tracking code")
+        if abs(days_between(item["delivery_day"], delivery_day)) > self.__delivery_day_tolerance:
+            raise OrderManagementException("Deliver Product: Invalid delivery day")
+
+        # creates json object for delivery
+        return {
+            "tracking_code": tracking_code,
+            "time_stamp": delivery_day
+        }
+
+    def deliver_product(self, tracking_code: str):
+        delivery = self.build_delivery(tracking_code)
+        # opens order manager json which holds the delivery information
+        try:
+            self.__repository.add_deliveries([delivery])
+        except Exception as exception:
+            raise OrderManagementException("Deliver Product: could not write tracking to file") from exception
+        return True
+
+    def deliver_products(self, tracking_codes) -> list:
+        """Delivers the products of a batch of tracking codes writing the
+        order manager store once.
+
+        Returns a list with, for every tracking code, True or the
+        OrderManagementException that prevents its delivery"""
+        results = []
+        deliveries = []
+        for tracking_code in tracking_codes:
+            try:
+                deliveries.append(self.build_delivery(tracking_code))
+            except OrderManagementException as exception:
+                results.append(exception)
+                continue
+            results.append(True)
 
-        if isinstance(data, dict):
-            data = [data]
-
-        # loops through order_shipping json
-        for item in data:
-            if item["tracking_code"] == tracking_code:
-                if item["delivery_day"] != delivery_day:
-                    raise OrderManagementException("Deliver Product: Invalid delivery day")
-
-            # creates json object for delivery
-            delivery = {
-                "tracking_code": tracking_code,
-                "time_stamp": delivery_day
-            }
-            # opens order manager json which holds the delivery information
+        if deliveries:
             try:
-                with open(self.__order_manager_json_store, "r+", encoding="utf-8") as file:
-                    data = json.load(file)
-                    data.append(delivery)
-                    file.seek(0)
-                    json.dump(data, file, indent=4)
+                self.__repository.add_deliveries(deliveries)
             except Exception as exception:
                 raise OrderManagementException("Deliver Product: could not write tracking to file") from exception
-            return True
-        raise OrderManagementException("Deliver Product: Invalid tracking code")
\ No newline at end of file
+        return results
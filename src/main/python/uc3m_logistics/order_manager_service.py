@@ -0,0 +1,119 @@
+"""Contains the class OrderManagerService"""
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .order_manager import OrderManager
+from .order_management_exception import OrderManagementException
+from .group_commit import ORDER_REQUEST, ORDER_SHIPPING, DELIVERY, commit
+
+
+class OrderManagerService:
+    """Thread safe service for using one OrderManager from many threads.
+
+    The validation of the arguments and the hashing of the orders run in
+    the thread that calls the service (or in its thread pool with the
+    submit methods), while all the writes to the stores are done by a
+    single writer thread. The writer takes every write that is waiting
+    and stores them with one write per store (group commit)."""
+
+    def __init__(self, order_manager=None, max_workers=None, max_batch=1000):
+        self.__order_manager = order_manager if order_manager is not None else OrderManager()
+        self.__max_batch = max_batch
+        self.__executor = ThreadPoolExecutor(max_workers, thread_name_prefix="order-manager")
+        self.__writes = queue.Queue()
+        self.__closed = False
+        self.__closing_lock = threading.Lock()
+        self.__writer = threading.Thread(target=self.__write_loop, name="order-manager-writer", daemon=True)
+        self.__writer.start()
+
+    @property
+    def order_manager(self):
+        """Returns the order manager used by the service"""
+        return self.__order_manager
+
+    # pylint: disable=too-many-arguments
+    def register_order(self, product_id: str, order_type: str, address: str, phone_number: str,
+                       zip_code: str) -> str:
+        """Same as OrderManager.register_order"""
+        order_request = self.__order_manager.build_order_request(product_id, order_type, address,
+                                                                 phone_number, zip_code)
+        return self.__write(ORDER_REQUEST, order_request.to_json(), order_request.order_id).result()
+
+    def send_product(self, input_file_path: str) -> str:
+        """Same as OrderManager.send_product"""
+        order_shipping = self.__order_manager.build_order_shipping(
+            self.__order_manager.read_order_id(input_file_path))
+        return self.__write(ORDER_SHIPPING, order_shipping.to_json(), order_shipping.tracking_code).result()
+
+    def deliver_product(self, tracking_code: str) -> bool:
+        """Same as OrderManager.deliver_product"""
+        delivery = self.__order_manager.build_delivery(tracking_code)
+        return self.__write(DELIVERY, delivery, True).result()
+
+    def submit_register_order(self, *args, **kwargs) -> Future:
+        """Runs register_order in the thread pool of the service"""
+        return self.__executor.submit(self.register_order, *args, **kwargs)
+
+    def submit_send_product(self, input_file_path: str) -> Future:
+        """Runs send_product in the thread pool of the service"""
+        return self.__executor.submit(self.send_product, input_file_path)
+
+    def submit_deliver_product(self, tracking_code: str) -> Future:
+        """Runs deliver_product in the thread pool of the service"""
+        return self.__executor.submit(self.deliver_product, tracking_code)
+
+    def close(self):
+        """Waits for the pending writes and stops the threads of the service"""
+        self.__executor.shutdown(wait=True)
+        with self.__closing_lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__writes.put(None)
+        self.__writer.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __write(self, kind, record, result):
+        """Queues the record for the writer and returns the future of its result"""
+        future = Future()
+        with self.__closing_lock:
+            if self.__closed:
+                raise OrderManagementException("Order manager service is closed")
+            self.__writes.put((kind, record, result, future))
+        return future
+
+    def __write_loop(self):
+        """Body of the writer thread"""
+        while True:
+            write = self.__writes.get()
+            if write is None:
+                return
+            writes = [write]
+            stop = False
+            while len(writes) < self.__max_batch:
+                try:
+                    write = self.__writes.get_nowait()
+                except queue.Empty:
+                    break
+                if write is None:
+                    stop = True
+                    break
+                writes.append(write)
+            self.__commit(writes)
+            if stop:
+                return
+
+    def __commit(self, writes):
+        """Stores the records of the writes and gives their futures the result"""
+        errors = commit(self.__order_manager.repository, writes)
+        for kind, _, result, future in writes:
+            if kind in errors:
+                future.set_exception(errors[kind])
+            else:
+                future.set_result(result)
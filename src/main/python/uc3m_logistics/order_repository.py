@@ -0,0 +1,51 @@
+"""Contains the class OrderRepository"""
+from .store_index import StoreIndex
+
+
+class OrderRepository:
+    """Class that gives indexed access to the records of the three stores:
+    order requests by order_id, shippings and deliveries by tracking_code"""
+
+    def __init__(self, order_request_store, order_shipping_store, order_manager_store):
+        self.__order_requests = StoreIndex(order_request_store, "order_id")
+        self.__order_shippings = StoreIndex(order_shipping_store, "tracking_code")
+        self.__deliveries = StoreIndex(order_manager_store, "tracking_code")
+
+    @property
+    def order_requests(self):
+        """Returns the index of the order requests"""
+        return self.__order_requests
+
+    @property
+    def order_shippings(self):
+        """Returns the index of the order shippings"""
+        return self.__order_shippings
+
+    @property
+    def deliveries(self):
+        """Returns the index of the deliveries"""
+        return self.__deliveries
+
+    def find_order_request(self, order_id):
+        """Returns the order request record with the order_id or None"""
+        return self.__order_requests.find(order_id)
+
+    def find_order_shipping(self, tracking_code):
+        """Returns the order shipping record with the tracking_code or None"""
+        return self.__order_shippings.find(tracking_code)
+
+    def find_delivery(self, tracking_code):
+        """Returns the delivery record with the tracking_code or None"""
+        return self.__deliveries.find(tracking_code)
+
+    def add_order_requests(self, records):
+        """Stores the order request records"""
+        self.__order_requests.extend(records)
+
+    def add_order_shippings(self, records):
+        """Stores the order shipping records"""
+        self.__order_shippings.extend(records)
+
+    def add_deliveries(self, records):
+        """Stores the delivery records"""
+        self.__deliveries.extend(records)
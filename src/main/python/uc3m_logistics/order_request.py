@@ -1,20 +1,51 @@
 """MODULE: access_request. Contains the access request class"""
 import hashlib
 import json
-from datetime import datetime
-from freezegun import freeze_time
+from json.encoder import encode_basestring_ascii
+from .clock import SYSTEM_CLOCK
+
+# same text json.dumps gave for the attributes of the request, which is what the order_id signs
+CANONICAL_FORMAT = '{"_OrderRequest__product_id": %s, "_OrderRequest__delivery_address": %s, ' \
+                   '"_OrderRequest__order_type": %s, "_OrderRequest__phone_number": %s, ' \
+                   '"_OrderRequest__zip_code": %s, "_OrderRequest__time_stamp": %s}'
+ENCODER = json.JSONEncoder()
+
+
+def encode(value):
+    """Returns the json of one value, strings take the fast path"""
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+    return ENCODER.encode(value)
+
 
 class OrderRequest:
     """Class representing one order for a product"""
-    @freeze_time("2023-03-09")
-    def __init__( self, product_id, order_type, delivery_address, phone_number, zip_code ):
+    __slots__ = ("__product_id", "__delivery_address", "__order_type", "__phone_number", "__zip_code",
+                 "__time_stamp", "__order_id")
+
+    # pylint: disable=too-many-arguments
+    def __init__( self, product_id, order_type, delivery_address, phone_number, zip_code, clock=SYSTEM_CLOCK ):
         self.__product_id = product_id
         self.__delivery_address = delivery_address
         self.__order_type = order_type
         self.__phone_number = phone_number
         self.__zip_code = zip_code
-        justnow = datetime.utcnow()
-        self.__time_stamp = datetime.timestamp(justnow)
+        self.__time_stamp = clock.timestamp()
+        self.__order_id = None
+
+    @classmethod
+    def from_json(cls, data):
+        """Rebuilds the order request from its stored json, the stored
+        order_id is kept instead of hashing the request again"""
+        order_request = cls.__new__(cls)
+        order_request.__product_id = data["product_id"]
+        order_request.__delivery_address = data["delivery_address"]
+        order_request.__order_type = data["order_type"]
+        order_request.__phone_number = data["phone_number"]
+        order_request.__zip_code = data["zip_code"]
+        order_request.__time_stamp = data["time_stamp"]
+        order_request.__order_id = data.get("order_id")
+        return order_request
 
     def to_json (self):
         return {
@@ -28,7 +59,9 @@ class OrderRequest:
         }
 
     def __str__(self):
-        return json.dumps(self.__dict__)
+        return CANONICAL_FORMAT % (encode(self.__product_id), encode(self.__delivery_address),
+                                   encode(self.__order_type), encode(self.__phone_number),
+                                   encode(self.__zip_code), encode(self.__time_stamp))
 
     @property
     def delivery_address( self ):
@@ -39,6 +72,7 @@ class OrderRequest:
     @delivery_address.setter
     def delivery_address( self, value ):
         self.__delivery_address = value
+        self.__order_id = None
 
     @property
     def order_type( self ):
@@ -47,6 +81,7 @@ class OrderRequest:
     @order_type.setter
     def order_type( self, value ):
         self.__order_type = value
+        self.__order_id = None
 
     @property
     def phone_number( self ):
@@ -55,6 +90,7 @@ class OrderRequest:
     @phone_number.setter
     def phone_number( self, value ):
         self.__phone_number = value
+        self.__order_id = None
 
     @property
     def product_id( self ):
@@ -63,6 +99,7 @@ class OrderRequest:
     @product_id.setter
     def product_id( self, value ):
         self.__product_id = value
+        self.__order_id = None
 
     @property
     def time_stamp(self):
@@ -71,8 +108,10 @@ class OrderRequest:
 
     @property
     def order_id( self ):
-        """Returns the md5 signature"""
-        return hashlib.md5(self.__str__().encode("utf-8")).hexdigest()
+        """Returns the md5 signature, computed only once"""
+        if self.__order_id is None:
+            self.__order_id = hashlib.md5(self.__str__().encode("utf-8")).hexdigest()
+        return self.__order_id
 
     @property
     def zip_code( self ):
@@ -1,20 +1,20 @@
 """Contains the class OrderShipping"""
-from datetime import datetime
-from freezegun import freeze_time
 import hashlib
+from .clock import SYSTEM_CLOCK
 
 class OrderShipping():
     """Class representing the information required for shipping of an order"""
+    __slots__ = ("__alg", "__type", "__product_id", "__order_id", "__delivery_phone_number", "__issued_at",
+                 "__delivery_day", "__tracking_code")
 
-    @freeze_time("2023-03-09")
-    def __init__( self, product_id, order_id, delivery_phone_number, order_type ):
+    # pylint: disable=too-many-arguments
+    def __init__( self, product_id, order_id, delivery_phone_number, order_type, clock=SYSTEM_CLOCK ):
         self.__alg = "SHA-256"
         self.__type = "DS"
         self.__product_id = product_id
         self.__order_id = order_id
         self.__delivery_phone_number = delivery_phone_number
-        justnow = datetime.utcnow()
-        self.__issued_at = datetime.timestamp(justnow)
+        self.__issued_at = clock.timestamp()
         if order_type == "Regular":
             delivery_days = 7
         else:
@@ -23,6 +23,22 @@ class OrderShipping():
         #timestamp is represented in seconds.microseconds
         #__delivery_day must be expressed in senconds to be added to the timestap
         self.__delivery_day = self.__issued_at + (delivery_days * 24 * 60 * 60)
+        self.__tracking_code = self.__sign()
+
+    @classmethod
+    def from_json(cls, data):
+        """Rebuilds the order shipping from its stored json, the stored
+        tracking code is kept instead of hashing the shipping again"""
+        order_shipping = cls.__new__(cls)
+        order_shipping.__alg = data["alg"]
+        order_shipping.__type = data["type"]
+        order_shipping.__product_id = None
+        order_shipping.__order_id = data["order_id"]
+        order_shipping.__delivery_phone_number = None
+        order_shipping.__issued_at = data["issued_at"]
+        order_shipping.__delivery_day = data["delivery_day"]
+        order_shipping.__tracking_code = data.get("tracking_code")
+        return order_shipping
 
     def to_json(self):
         return {
@@ -37,8 +53,12 @@ class OrderShipping():
     def __signature_string(self):
         """Composes the string to be used for generating the key for the date"""
         return "{alg:" + self.__alg +",typ:" + self.__type +",order_id:" + \
-           self.__order_id + ",issuedate:" + self.__issued_at + \
-           ",deliveryday:" + self.__delivery_day + "}"
+           self.__order_id + ",issuedate:" + str(self.__issued_at) + \
+           ",deliveryday:" + str(self.__delivery_day) + "}"
+
+    def __sign(self):
+        """Returns the sha256 signature of the signature string"""
+        return hashlib.sha256(self.__signature_string().encode()).hexdigest()
 
     @property
     def alg( self ):
@@ -46,6 +66,7 @@ class OrderShipping():
     @alg.setter
     def alg( self, value ):
         self.__alg= value
+        self.__tracking_code = None
 
     @property
     def product_id( self ):
@@ -63,6 +84,7 @@ class OrderShipping():
     @tracking_id.setter
     def tracking_id( self, value ):
         self.__order_id = value
+        self.__tracking_code = None
 
     @property
     def phone_number( self ):
@@ -75,8 +97,10 @@ class OrderShipping():
 
     @property
     def tracking_code( self ):
-        """Returns the sha256 signature of the date"""
-        return hashlib.sha256(self.__signature_string().encode()).hexdigest()
+        """Returns the sha256 signature of the date, computed only once"""
+        if self.__tracking_code is None:
+            self.__tracking_code = self.__sign()
+        return self.__tracking_code
 
     @property
     def issued_at(self):
@@ -86,6 +110,7 @@ class OrderShipping():
     @issued_at.setter
     def issued_at( self, value ):
         self.__issued_at = value
+        self.__tracking_code = None
 
     @property
     def delivery_day( self ):
@@ -95,8 +120,4 @@ class OrderShipping():
     @delivery_day.setter
     def delivery_day(self, value):
         self.__delivery_day = value
-
-    @property
-    def tracking_code(self):
-        """Returns the md5 signature"""
-        return hashlib.md5(self.__str__().encode("utf-8")).hexdigest()
\ No newline at end of file
+        self.__tracking_code = None
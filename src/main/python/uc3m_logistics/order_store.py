@@ -0,0 +1,91 @@
+"""Contains the base class for the order stores"""
+import os
+
+from .order_management_exception import OrderManagementException
+from .file_lock import FileLock
+
+# environment variable with the directory of the stores
+STORE_PATH_VARIABLE = "UC3M_LOGISTICS_STORE_PATH"
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(__file__), "../stores/")
+
+
+def store_directory(store_path=None):
+    """Returns the directory of the stores: the given one, the one of the
+    UC3M_LOGISTICS_STORE_PATH environment variable or the stores directory
+    of the package, in this order"""
+    if store_path is None:
+        store_path = os.environ.get(STORE_PATH_VARIABLE) or DEFAULT_STORE_PATH
+    return os.fspath(store_path)
+
+
+class OrderStore:
+    """Base class for the stores that keep the records of the orders.
+
+    A store is created for one of the files in the stores directory and
+    knows how to read all its records and how to add new ones. Stores that
+    are indexed can also find a record by one of its keys without loading
+    the rest."""
+
+    indexed = False
+
+    def __init__(self, store_path):
+        self._store_path = store_path
+        self._lock = FileLock(store_path)
+
+    @property
+    def store_path(self):
+        """Returns the path of the file behind the store"""
+        return self._store_path
+
+    @property
+    def lock(self):
+        """Returns the lock that every writer of the store must hold"""
+        return self._lock
+
+    @property
+    def store_name(self):
+        """Returns the name of the file behind the store"""
+        return os.path.basename(self._store_path)
+
+    def create(self):
+        """Creates the files of the store if they do not exist"""
+        try:
+            with self._lock:
+                if not os.path.exists(self._store_path):
+                    with open(self._store_path, "w", encoding="utf-8") as file:
+                        file.write("[]")
+        except FileNotFoundError as exception:
+            raise OrderManagementException("Could create/find " + self.store_name) from exception
+
+    def signature(self):
+        """Returns a value that changes whenever the files of the store change"""
+        return (self._file_signature(self._store_path),)
+
+    @staticmethod
+    def _file_signature(file_path):
+        """Returns the inode, size and modification time of the file"""
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def load(self):
+        """Returns the list with all the records of the store"""
+        raise NotImplementedError
+
+    def find(self, key, key_value):
+        """Returns the first record whose key has the given value or None,
+        only for indexed stores"""
+        raise NotImplementedError
+
+    def append(self, record):
+        """Adds one record at the end of the store"""
+        self.extend([record])
+
+    def extend(self, records):
+        """Adds all the given records at the end of the store"""
+        raise NotImplementedError
+
+    def compact(self):
+        """Rewrites the store in its most compact form"""
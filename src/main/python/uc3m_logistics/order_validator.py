@@ -0,0 +1,139 @@
+"""Contains the schema of the arguments of register_order and the class OrderValidator"""
+from .order_management_exception import OrderManagementException
+from .ean13_validator import has_valid_check_digit
+
+# every field has its rules in the order they are checked: (rule, argument, message)
+ORDER_SCHEMA = (
+    ("product_id", (
+        ("type", str, "Invalid ean13 code: not a 13 digit string"),
+        ("length", 13, "Invalid ean13 code: not a 13 digit string"),
+        ("digits", None, "Invalid ean13 code: not a 13 digit string"),
+        ("ean13", None, "Invalid ean13 code: check digit is incorrect"),
+    )),
+    ("order_type", (
+        ("type", str, "Invalid order type: not a string"),
+        ("one_of_lower", ("regular", "premium"), "Invalid order type: string is invalid"),
+    )),
+    ("address", (
+        ("type", str, "Invalid address: address is not a string"),
+        ("max_length", 100, "Invalid address: address is too long"),
+        ("min_length", 20, "Invalid address: address is too short"),
+        ("contains", " ", "Invalid address: address should contain a space"),
+    )),
+    ("phone_number", (
+        ("type", str, "Invalid phone number: phone number is not a string"),
+        ("max_length", 12, "Invalid phone number: phone number is too long"),
+        ("min_length", 12, "Invalid phone number: phone number is too short"),
+        ("prefix", "+34", "Invalid phone number: wrong area code"),
+    )),
+    ("zip_code", (
+        ("type", str, "Invalid zip code: zip code not a string"),
+        ("length", 5, "Invalid zip code: zip code not 5 characters"),
+        ("digits", None, "Invalid zip code: characters are not digits"),
+        ("min_value", 1001, "Invalid zip code: zip code is below range"),
+        ("max_value", 52006, "Invalid zip code: zip code is above range"),
+    )),
+)
+
+# condition that makes each rule fail, {value} is the field and {argument} the argument of the rule
+RULE_CONDITIONS = {
+    "type": "not isinstance({value}, {argument})",
+    "length": "len({value}) != {argument}",
+    "max_length": "len({value}) > {argument}",
+    "min_length": "len({value}) < {argument}",
+    # the digits int() takes, "²" is a digit for str.isdigit
+    "digits": "not {value}.isdecimal()",
+    "contains": "{argument} not in {value}",
+    "prefix": "not {value}.startswith({argument})",
+    "one_of_lower": "{value}.lower() not in {argument}",
+    "min_value": "int({value}) < {argument}",
+    "max_value": "int({value}) > {argument}",
+    "ean13": "not has_valid_check_digit({value})",
+}
+
+
+class OrderValidator:
+    """Validator compiled once from a schema.
+
+    The rules of the schema are turned into the source of python
+    functions which are compiled once: one that stops at the first error
+    (fail fast), one that collects the first error of every field and one
+    per field that checks a single value. A
+    record is given as a tuple with the values of the fields in the order
+    of the schema or as a dict with their names."""
+
+    def __init__(self, schema=ORDER_SCHEMA):
+        self.__fields = tuple(field for field, _ in schema)
+        self.__first_error, self.__all_errors, self.__field_errors = self.__compile(schema)
+
+    @property
+    def fields(self):
+        """Returns the names of the fields of the schema"""
+        return self.__fields
+
+    def __compile(self, schema):
+        """Returns the fail fast and the collect all functions of the schema
+        and the dict with the function of every field"""
+        namespace = {"has_valid_check_digit": has_valid_check_digit}
+        first_error = ["def first_error(" + ", ".join(self.__fields) + "):"]
+        all_errors = ["def all_errors(" + ", ".join(self.__fields) + "):", "    errors = []"]
+        field_errors = []
+        for field, rules in schema:
+            field_errors.append(f"def {field}_error({field}):")
+            for number, (rule, argument, message) in enumerate(rules):
+                argument_name = f"{field}_argument_{number}"
+                message_name = f"{field}_message_{number}"
+                namespace[argument_name] = argument
+                namespace[message_name] = message
+                condition = RULE_CONDITIONS[rule].format(value=field, argument=argument_name)
+                first_error.append(f"    if {condition}:")
+                first_error.append(f"        return {message_name}")
+                all_errors.append(f"    {'if' if number == 0 else 'elif'} {condition}:")
+                all_errors.append(f"        errors.append({message_name})")
+                field_errors.append(f"    if {condition}:")
+                field_errors.append(f"        return {message_name}")
+            field_errors.append("    return None")
+        first_error.append("    return None")
+        all_errors.append("    return errors")
+        # pylint: disable=exec-used
+        exec(compile("\n".join(first_error + all_errors + field_errors), "<order schema>", "exec"), namespace)
+        return namespace["first_error"], namespace["all_errors"], \
+            {field: namespace[field + "_error"] for field in self.__fields}
+
+    def __values(self, record):
+        """Returns the values of the record in the order of the schema"""
+        if isinstance(record, dict):
+            return tuple(record[field] for field in self.__fields)
+        return tuple(record)
+
+    def first_error(self, *values):
+        """Returns the message of the first error of the values or None"""
+        return self.__first_error(*values)
+
+    def all_errors(self, *values):
+        """Returns the messages of the first error of every field"""
+        return self.__all_errors(*values)
+
+    def validate(self, *values):
+        """Throws an exception with the first error of the values"""
+        message = self.__first_error(*values)
+        if message is not None:
+            raise OrderManagementException(message)
+
+    def validate_field(self, field, value):
+        """Returns the value if it follows the rules of the field, otherwise
+        throws an exception with its first error"""
+        message = self.__field_errors[field](value)
+        if message is not None:
+            raise OrderManagementException(message)
+        return value
+
+    def validate_many(self, records, collect_all=False):
+        """Validates a batch of records, returns for every record the
+        message of its first error (or None if it is valid) or, when
+        collect_all is set, the list with the errors of all its fields"""
+        check = self.__all_errors if collect_all else self.__first_error
+        return [check(*self.__values(record)) for record in records]
+
+
+ORDER_VALIDATOR = OrderValidator()
@@ -0,0 +1,211 @@
+"""Contains the class ShardedStore and the partitions of its records"""
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+
+from .order_store import OrderStore
+from .indexed_json_store import IndexedJsonStore
+from .hash_index import HashIndex
+from .file_lock import replace_file
+from .order_management_exception import OrderManagementException
+
+# fields with the moment of every kind of record
+TIME_FIELDS = ("time_stamp", "issued_at")
+
+
+def by_day(record):
+    """Returns the shard of the record for the UTC day it was issued"""
+    for field in TIME_FIELDS:
+        if isinstance(record.get(field), (int, float)):
+            return datetime.fromtimestamp(record[field], timezone.utc).strftime("%Y-%m-%d")
+    return "undated"
+
+
+def by_zip_code(prefix_length=2):
+    """Returns a partition by the first digits of the zip code (the province
+    for prefix_length 2), records without zip code are partitioned by day"""
+    def partition(record):
+        zip_code = record.get("zip_code")
+        if isinstance(zip_code, str) and len(zip_code) >= prefix_length:
+            return "zip_" + zip_code[:prefix_length]
+        return by_day(record)
+    return partition
+
+
+class ShardedStore(OrderStore):
+    """Store that splits its records into shards.
+
+    The partition function gives the name of the shard of every record,
+    the day it was issued by default. Every shard is a store of shard_class
+    in a directory next to the store path (order_request.json ->
+    order_request.shards/2023-03-09.json), so shards stay small, can be
+    archived and are written in parallel: the records are written under
+    the lock of their shard, and the lock of the store is only held to
+    update the manifest and the routing indexes. A routing index per key
+    (a HashIndex from the key to the number of the shard) sends every
+    lookup to the shard that may have the record, which finds it with its
+    own index. The records are routed before they are written, so a
+    record being written, or lost by a crash, only costs a lookup in its
+    shard. The manifest keeps the list of shards and a generation that the
+    routing indexes must match, a routing index left behind by an
+    interrupted update is built again from the shards.
+
+    Use functools.partial(ShardedStore, partition=by_zip_code()) as the
+    store_class of OrderManager for other partitions."""
+
+    indexed = True
+    KEYS = ("order_id", "tracking_code")
+
+    def __init__(self, store_path, partition=by_day, shard_class=IndexedJsonStore):
+        super().__init__(store_path)
+        self.__partition = partition
+        self.__shard_class = shard_class
+        self.__shards_path = os.path.splitext(store_path)[0] + ".shards"
+        self.__manifest_path = os.path.join(self.__shards_path, "manifest.json")
+        self.__routing = {key: HashIndex(os.path.join(self.__shards_path, key + ".routing"))
+                          for key in self.KEYS}
+        self.__shards = {}
+
+    @property
+    def shards_path(self):
+        """Returns the directory of the shards"""
+        return self.__shards_path
+
+    def shard_names(self):
+        """Returns the names of the shards in the order they were created"""
+        return [shard_name for shard_name in self.__read_manifest()["shards"] if shard_name is not None]
+
+    def shard(self, shard_name):
+        """Returns the store of the shard"""
+        if shard_name not in self.__shards:
+            self.__shards[shard_name] = self.__shard_class(os.path.join(self.__shards_path, shard_name + ".json"))
+        return self.__shards[shard_name]
+
+    def create(self):
+        """Creates the directory of the shards and the manifest"""
+        try:
+            with self._lock:
+                os.makedirs(self.__shards_path, exist_ok=True)
+                if not os.path.exists(self.__manifest_path):
+                    self.__write_manifest({"generation": 0, "shards": []})
+        except OSError as exception:
+            raise OrderManagementException("Could create/find " + self.store_name) from exception
+
+    def __read_manifest(self):
+        with open(self.__manifest_path, "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    def __write_manifest(self, manifest):
+        replace_file(self.__manifest_path, json.dumps(manifest, indent=4))
+
+    def signature(self):
+        """Returns a value that changes whenever the store changes, every
+        write changes the generation of the manifest"""
+        return (self._file_signature(self.__manifest_path),)
+
+    def load(self):
+        """Returns the records of all the shards, shard after shard"""
+        records = []
+        for shard_name in self.shard_names():
+            records.extend(self.shard(shard_name).load())
+        return records
+
+    def find(self, key, key_value):
+        """Returns the first record whose key has the given value or None"""
+        if key not in self.KEYS:
+            raise OrderManagementException("Store is not indexed by " + str(key))
+        if not isinstance(key_value, str):
+            return None
+        with self._lock:
+            manifest = self.__read_manifest()
+            shard_names = [manifest["shards"][shard_number]
+                           for shard_number, _ in self.__fresh_routing(key, manifest).candidates(key_value)]
+        for shard_name in shard_names:
+            if shard_name is None:
+                continue
+            try:
+                record = self.shard(shard_name).find(key, key_value)
+            except FileNotFoundError:
+                # archived since it was routed
+                continue
+            if record is not None:
+                return record
+        return None
+
+    def __fresh_routing(self, key, manifest):
+        """Returns the routing index of the key built for the generation of
+        the manifest"""
+        routing = self.__routing[key]
+        signature = (manifest["generation"], 0, 0)
+        if routing.signature == signature or (routing.open() and routing.signature == signature):
+            return routing
+        entries = []
+        for shard_number, shard_name in enumerate(manifest["shards"]):
+            if shard_name is not None:
+                entries.extend(self.__entries(key, shard_number, self.shard(shard_name).load()))
+        routing.build(signature, entries)
+        return routing
+
+    @staticmethod
+    def __entries(key, shard_number, records):
+        """Returns the routing entries of the records of a shard"""
+        return [(record[key], shard_number, 0) for record in records if isinstance(record.get(key), str)]
+
+    def extend(self, records):
+        """Adds every record to the routing indexes and then to its shard"""
+        batches = {}
+        for record in records:
+            batches.setdefault(self.__partition(record), []).append(record)
+        self.__update_manifest(batches)
+        for shard_name, batch in batches.items():
+            shard = self.shard(shard_name)
+            shard.create()
+            shard.extend(batch)
+        # a new generation once the records are written, for the signature
+        self.__update_manifest({})
+
+    def __update_manifest(self, batches):
+        """Adds the shards of the batches to the manifest and their records
+        to the routing indexes with a new generation"""
+        with self._lock:
+            manifest = self.__read_manifest()
+            routings = [(key, self.__fresh_routing(key, manifest)) for key in self.KEYS]
+            for shard_name in batches:
+                if shard_name not in manifest["shards"]:
+                    manifest["shards"].append(shard_name)
+            # the new generation goes first, the routing indexes only match it
+            # once they have the entries of every record
+            manifest["generation"] += 1
+            self.__write_manifest(manifest)
+            signature = (manifest["generation"], 0, 0)
+            for key, routing in routings:
+                entries = []
+                for shard_name, batch in batches.items():
+                    entries.extend(self.__entries(key, manifest["shards"].index(shard_name), batch))
+                routing.add(signature, entries)
+
+    def archive(self, shard_name, archive_path):
+        """Moves the files of the shard to the archive directory, its
+        records are no longer part of the store"""
+        with self._lock:
+            manifest = self.__read_manifest()
+            if shard_name not in manifest["shards"]:
+                raise OrderManagementException("Shard not found: " + shard_name)
+            routings = [self.__fresh_routing(key, manifest) for key in self.KEYS]
+            os.makedirs(archive_path, exist_ok=True)
+            # the shard keeps its number, so the routing indexes stay valid
+            manifest["shards"][manifest["shards"].index(shard_name)] = None
+            manifest["generation"] += 1
+            self.__write_manifest(manifest)
+            for routing in routings:
+                routing.add((manifest["generation"], 0, 0), [])
+            # a write of the shard that is still going on is let finish first
+            with self.shard(shard_name).lock:
+                self.__shards.pop(shard_name, None)
+                prefix = shard_name + ".json"
+                for file_name in os.listdir(self.__shards_path):
+                    if file_name == prefix or (file_name.startswith(prefix + ".") and
+                                               not file_name.endswith(".lock")):
+                        shutil.move(os.path.join(self.__shards_path, file_name),
+                                    os.path.join(archive_path, file_name))
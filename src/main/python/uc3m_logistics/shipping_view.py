@@ -0,0 +1,165 @@
+"""Contains the read only classes ShippingView and ShippingRow"""
+import os
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .snapshot import Snapshot, STORE_FIELDS, codec_format, snapshot_bytes
+from .json_store import JsonStore
+from .order_store import OrderStore, store_directory
+from .order_management_exception import OrderManagementException
+
+
+class ShippingRow:
+    """One shipping of a ShippingView. Its fields are read from the mapped
+    snapshot when they are asked for"""
+
+    __slots__ = ("__view", "__position")
+
+    def __init__(self, view, position):
+        self.__view = view
+        self.__position = position
+
+    def __getitem__(self, field):
+        return self.__view.shipping_value(self.__position, field)
+
+    @property
+    def tracking_code(self):
+        """Returns the tracking code of the shipping"""
+        return self["tracking_code"]
+
+    @property
+    def order_id(self):
+        """Returns the order id of the shipping"""
+        return self["order_id"]
+
+    @property
+    def issued_at(self):
+        """Returns the timestamp the shipping was issued at"""
+        return self["issued_at"]
+
+    @property
+    def delivery_day(self):
+        """Returns the timestamp of the day the product has to be delivered"""
+        return self["delivery_day"]
+
+    @property
+    def delivered_at(self):
+        """Returns the timestamp of the delivery of the shipping or None"""
+        return self.__view.delivered_at(self.tracking_code)
+
+    def to_json(self):
+        """Returns the stored record of the shipping"""
+        return self.__view.shipping_record(self.__position)
+
+
+class ShippingView:
+    """Read only view of the shippings and deliveries of a store directory.
+
+    The records are read through mmap from the snapshots of
+    order_shipping.json and order_manager.json, with fixed width records
+    (see snapshot.py), so iterating does not build a dict per record and
+    every reader process shares the same pages of the page cache. The
+    shippings are found by tracking_code and order_id and the deliveries
+    by tracking_code with a binary search over the mapped file.
+
+    The view only reads the stores: the snapshots are the ones a
+    SnapshotStore keeps up to date under its lock. When a snapshot is
+    missing or older than its json file, the json file is read and the
+    snapshot is built in memory instead, which costs a parse of the whole
+    file. The view shows the json files as they were when it was opened,
+    refresh() opens it again; records still in the journal of a
+    SnapshotStore are seen once the store is compacted."""
+
+    SHIPPINGS = "order_shipping.json"
+    DELIVERIES = "order_manager.json"
+
+    def __init__(self, store_path=None):
+        self.__store_path = store_directory(store_path)
+        self.__shippings = None
+        self.__deliveries = None
+        self.refresh()
+
+    def refresh(self):
+        """Opens the snapshots of the current json files"""
+        self.__shippings = self.__open(self.SHIPPINGS)
+        self.__deliveries = self.__open(self.DELIVERIES)
+
+    def __open(self, store_name):
+        """Returns the mapped snapshot of the store, or one built in memory if it is stale"""
+        json_path = os.path.join(self.__store_path, store_name)
+        # pylint: disable=protected-access
+        signature = OrderStore._file_signature(json_path)
+        if signature is None:
+            raise OrderManagementException("Could not find " + store_name)
+        snapshot = Snapshot(json_path + ".snap")
+        if not snapshot.open() or snapshot.signature != signature:
+            snapshot.open(snapshot_bytes(JsonStore(json_path).load(), STORE_FIELDS[store_name], signature))
+        return snapshot
+
+    def __len__(self):
+        return len(self.__shippings)
+
+    def __iter__(self):
+        for position in range(len(self.__shippings)):
+            yield ShippingRow(self, position)
+
+    def shipping_value(self, position, field):
+        """Returns one field of the shipping at the position"""
+        return self.__shippings.value(position, field)
+
+    def shipping_record(self, position):
+        """Returns the record of the shipping at the position"""
+        return self.__shippings.record(position)
+
+    def find_by_tracking_code(self, tracking_code):
+        """Returns the first shipping with the tracking code or None"""
+        return self.__row(self.__shippings.position("tracking_code", tracking_code))
+
+    def find_by_order_id(self, order_id):
+        """Returns the first shipping of the order or None"""
+        return self.__row(self.__shippings.position("order_id", order_id))
+
+    def __row(self, position):
+        return None if position is None else ShippingRow(self, position)
+
+    def delivered_at(self, tracking_code):
+        """Returns the timestamp of the first delivery of the tracking code or None"""
+        position = self.__deliveries.position("tracking_code", tracking_code)
+        return None if position is None else self.__deliveries.value(position, "time_stamp")
+
+    def deliveries(self):
+        """Yields the tracking code and timestamp of every delivery"""
+        for position in range(len(self.__deliveries)):
+            yield self.__deliveries.value(position, "tracking_code"), self.__deliveries.value(position, "time_stamp")
+
+    def shipping_array(self):
+        """Returns the shippings as a numpy structured array over the mapped
+        file, without copying them. Records that did not fit the fixed
+        fields have kind 1 and zeros in their fields"""
+        return self.__array(self.__shippings)
+
+    def delivery_array(self):
+        """Returns the deliveries as a numpy structured array over the mapped file"""
+        return self.__array(self.__deliveries)
+
+    @staticmethod
+    def __array(snapshot):
+        if numpy is None:
+            raise OrderManagementException("numpy is not installed")
+        dtype = [("kind", "u1")]
+        for name, codec in snapshot.fields:
+            if codec.startswith("heap"):
+                reference = "<u8" if codec == "heap64" else "<u4"
+                dtype.extend(((name + "_offset", reference), (name + "_length", reference)))
+            elif codec == "intern":
+                dtype.append((name, "<u2"))
+            elif codec == "f64":
+                dtype.append((name, "<f8"))
+            else:
+                dtype.append((name, "V" + codec_format(codec)[:-1]))
+        reference = "<u8" if snapshot.wide else "<u4"
+        dtype.extend((("json_offset", reference), ("json_length", reference)))
+        return numpy.frombuffer(snapshot.buffer(), dtype=numpy.dtype(dtype), count=len(snapshot))
@@ -0,0 +1,352 @@
+"""Contains the binary snapshot format of the stores and the class Snapshot"""
+import bisect
+import json
+import mmap
+import re
+import struct
+
+from .file_lock import replace_file
+
+MAGIC = b"UC3MSNP1"
+# magic, signature of the source file, records, record size, offset and length of the metadata
+HEADER = struct.Struct("<8sQQQQIQQ")
+HEX = re.compile(r"[0-9a-f]*")
+
+# every field of a record is written with a codec of fixed width
+ORDER_REQUEST_FIELDS = (("order_id", "hex16"), ("product_id", "ascii13"), ("delivery_address", "heap"),
+                        ("order_type", "intern"), ("phone_number", "ascii12"), ("zip_code", "ascii5"),
+                        ("time_stamp", "f64"))
+ORDER_SHIPPING_FIELDS = (("alg", "intern"), ("type", "intern"), ("order_id", "hex16"), ("issued_at", "f64"),
+                         ("delivery_day", "f64"), ("tracking_code", "hex32"))
+DELIVERY_FIELDS = (("tracking_code", "hex32"), ("time_stamp", "f64"))
+STORE_FIELDS = {"order_request.json": ORDER_REQUEST_FIELDS, "order_shipping.json": ORDER_SHIPPING_FIELDS,
+                "order_manager.json": DELIVERY_FIELDS}
+# a record that does not fit its fields is kept as json in the heap
+FIXED, JSON = 0, 1
+# strings an interned field can number and largest heap offset of the
+# narrow snapshots, larger ones are kept in the heap or widened
+INTERN_LIMIT = 0x10000
+HEAP_LIMIT = 0xFFFFFFFF
+
+
+def codec_format(codec):
+    """Returns the struct format of a codec"""
+    if codec == "f64":
+        return "d"
+    if codec == "intern":
+        return "H"
+    if codec == "heap":
+        return "II"
+    if codec == "heap64":
+        return "QQ"
+    return codec[5:] + "s" if codec.startswith("ascii") else codec[3:] + "s"
+
+
+def codec_size(codec):
+    """Returns the number of bytes of a codec"""
+    return struct.calcsize("<" + codec_format(codec))
+
+
+def empty_values(fields):
+    """Returns the values of the fields of a record kept as json"""
+    values = []
+    for _, codec in fields:
+        if codec.startswith("heap"):
+            values.extend((0, 0))
+        else:
+            values.append(b"" if codec_format(codec).endswith("s") else 0)
+    return values
+
+
+def record_struct(fields, wide=False):
+    """Returns the struct of the records: the kind, then every field, then
+    the heap reference of the records kept as json"""
+    return struct.Struct("<B" + "".join(codec_format(codec) for _, codec in fields) + ("QQ" if wide else "II"))
+
+
+def fits(codec, value):
+    """Returns whether the value can be written with the codec"""
+    if codec == "f64":
+        return type(value) is float  # pylint: disable=unidiomatic-typecheck
+    if not isinstance(value, str):
+        return False
+    if codec.startswith("hex"):
+        return len(value) == 2 * int(codec[3:]) and HEX.fullmatch(value) is not None
+    if codec.startswith("ascii"):
+        return len(value) == int(codec[5:]) and value.isascii()
+    return True
+
+
+def write_snapshot(snapshot_path, records, fields, signature):
+    """Writes the snapshot of the records, taken from the source file with the signature"""
+    replace_file(snapshot_path, snapshot_bytes(records, fields, signature))
+
+
+def snapshot_bytes(records, fields, signature):
+    """Returns the content of the snapshot of the records. An interned
+    field with more than INTERN_LIMIT strings is kept in the heap instead,
+    and a snapshot whose heap is larger than HEAP_LIMIT is written again
+    with 64 bit heap references and position tables"""
+    fields = tuple((name, "heap" if codec == "intern" and _strings(records, name) > INTERN_LIMIT else codec)
+                   for name, codec in fields)
+    try:
+        return _snapshot_bytes(records, fields, signature, wide=False)
+    except OverflowError:
+        fields = tuple((name, "heap64" if codec == "heap" else codec) for name, codec in fields)
+        return _snapshot_bytes(records, fields, signature, wide=True)
+
+
+def _strings(records, name):
+    """Returns the number of different values of the field in the records"""
+    return len({item.get(name) for item in records if isinstance(item, dict)})
+
+
+def _snapshot_bytes(records, fields, signature, wide):
+    """Returns the content of the snapshot of the records with narrow or
+    wide heap references, raises OverflowError if they do not fit"""
+    if not wide and len(records) > HEAP_LIMIT:
+        raise OverflowError("too many records for a narrow snapshot")
+    record = record_struct(fields, wide)
+    data = bytearray(HEADER.size + record.size * len(records))
+    heap = bytearray()
+    strings = []
+    string_numbers = {}
+    json_keys = {}
+    names = tuple(name for name, _ in fields)
+    # the hexadecimal fields are the keys the records are found by
+    key_values = {name: [] for name, codec in fields if codec.startswith("hex")}
+
+    def heap_reference(text):
+        offset = len(heap)
+        heap.extend(text.encode("utf-8"))
+        if not wide and len(heap) > HEAP_LIMIT:
+            raise OverflowError("heap too large for a narrow snapshot")
+        return offset, len(heap) - offset
+
+    for position, item in enumerate(records):
+        if isinstance(item, dict) and tuple(item) == names and \
+                all(fits(codec, item[name]) for name, codec in fields):
+            values = []
+            for name, codec in fields:
+                value = item[name]
+                if codec.startswith("hex"):
+                    values.append(bytes.fromhex(value))
+                elif codec.startswith("ascii"):
+                    values.append(value.encode("ascii"))
+                elif codec == "intern":
+                    if value not in string_numbers:
+                        string_numbers[value] = len(strings)
+                        strings.append(value)
+                    values.append(string_numbers[value])
+                elif codec.startswith("heap"):
+                    values.extend(heap_reference(value))
+                else:
+                    values.append(value)
+            for name in key_values:
+                key_values[name].append((bytes.fromhex(item[name]), position))
+            record.pack_into(data, HEADER.size + position * record.size, FIXED, *values, 0, 0)
+        else:
+            record.pack_into(data, HEADER.size + position * record.size, JSON, *empty_values(fields),
+                             *heap_reference(json.dumps(item)))
+            if isinstance(item, dict):
+                for name in key_values:
+                    if isinstance(item.get(name), str):
+                        json_keys.setdefault(name, {}).setdefault(item[name], position)
+
+    heap_offset = len(data)
+    data.extend(heap)
+    tables = {}
+    for name in key_values:
+        tables[name] = len(data)
+        positions = [position for _, position in sorted(key_values[name])]
+        data.extend(struct.pack(f"<{len(positions)}{'Q' if wide else 'I'}", *positions))
+    metadata = json.dumps({"fields": fields, "wide": wide, "strings": strings, "heap": heap_offset,
+                           "tables": tables, "table_sizes": {name: len(values) for name, values in key_values.items()},
+                           "json_keys": json_keys}).encode("utf-8")
+    metadata_offset = len(data)
+    data.extend(metadata)
+    HEADER.pack_into(data, 0, MAGIC, *signature, len(records), record.size, metadata_offset, len(metadata))
+    return bytes(data)
+
+
+class Snapshot:
+    """Read only view of a snapshot file through mmap.
+
+    The records have fixed width, so the record at a position is read
+    without reading the others, and the order_id and tracking_code of the
+    records have a table of positions sorted by key, so a record is found
+    by binary search over the mapped file. Nothing but the small metadata
+    is read when the snapshot is opened."""
+
+    def __init__(self, snapshot_path):
+        self.__snapshot_path = snapshot_path
+        self.__map = None
+        self.__signature = None
+        self.__count = 0
+        self.__record = None
+        self.__metadata = None
+
+    @property
+    def signature(self):
+        """Returns the signature of the source file of the snapshot or None"""
+        return self.__signature
+
+    def __len__(self):
+        return self.__count
+
+    @property
+    def fields(self):
+        """Returns the fields and codecs of the records"""
+        return self.__metadata["fields"]
+
+    @property
+    def wide(self):
+        """Returns whether the heap references and position tables have 64 bits"""
+        return self.__metadata.get("wide", False)
+
+    @property
+    def strings(self):
+        """Returns the interned strings"""
+        return self.__metadata["strings"]
+
+    def buffer(self):
+        """Returns a memoryview of the records, without copying them. The
+        snapshot can not be closed while the memoryview is alive"""
+        return memoryview(self.__map)[HEADER.size:HEADER.size + self.__count * self.__record.size]
+
+    def open(self, data=None):
+        """Maps the snapshot file, or reads the snapshot from the data given
+        instead, returns False if it is missing or not valid"""
+        self.close()
+        if data is not None:
+            self.__map = data
+        else:
+            try:
+                with open(self.__snapshot_path, "rb") as file:
+                    self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (FileNotFoundError, ValueError):
+                return False
+        if len(self.__map) < HEADER.size or self.__map[:8] != MAGIC:
+            self.close()
+            return False
+        _, inode, size, mtime, count, record_size, metadata_offset, metadata_length = \
+            HEADER.unpack_from(self.__map)
+        self.__metadata = json.loads(self.__map[metadata_offset:metadata_offset + metadata_length])
+        self.__metadata["fields"] = tuple(tuple(field) for field in self.__metadata["fields"])
+        self.__record = record_struct(self.__metadata["fields"], self.wide)
+        if self.__record.size != record_size:
+            self.close()
+            return False
+        self.__signature = (inode, size, mtime)
+        self.__count = count
+        return True
+
+    def close(self):
+        """Unmaps the snapshot file"""
+        if isinstance(self.__map, mmap.mmap):
+            self.__map.close()
+        self.__map = None
+        self.__signature = None
+        self.__count = 0
+
+    def record(self, position):
+        """Returns the record at the position"""
+        values = self.__record.unpack_from(self.__map, HEADER.size + position * self.__record.size)
+        heap = self.__metadata["heap"]
+        if values[0] == JSON:
+            offset, length = values[-2:]
+            return json.loads(self.__map[heap + offset:heap + offset + length])
+        record = {}
+        index = 1
+        for name, codec in self.__metadata["fields"]:
+            value = values[index]
+            index += 1
+            if codec.startswith("hex"):
+                value = value.hex()
+            elif codec.startswith("ascii"):
+                value = value.decode("ascii")
+            elif codec == "intern":
+                value = self.__metadata["strings"][value]
+            elif codec.startswith("heap"):
+                value = self.__map[heap + value:heap + value + values[index]].decode("utf-8")
+                index += 1
+            record[name] = value
+        return record
+
+    def value(self, position, name):
+        """Returns one field of the record at the position, reading only that field"""
+        start = HEADER.size + position * self.__record.size
+        if self.__map[start] == JSON:
+            return self.record(position).get(name)
+        codec = dict(self.__metadata["fields"])[name]
+        value = struct.unpack_from("<" + codec_format(codec), self.__map, start + self.field_offset(name))
+        if codec.startswith("hex"):
+            return value[0].hex()
+        if codec.startswith("ascii"):
+            return value[0].decode("ascii")
+        if codec == "intern":
+            return self.__metadata["strings"][value[0]]
+        if codec.startswith("heap"):
+            heap = self.__metadata["heap"]
+            return self.__map[heap + value[0]:heap + value[0] + value[1]].decode("utf-8")
+        return value[0]
+
+    def records(self):
+        """Returns the list with all the records"""
+        return [self.record(position) for position in range(self.__count)]
+
+    def position(self, key, key_value):
+        """Returns the position of the first record whose key has the value or None"""
+        if self.__map is None or key not in self.__metadata["tables"] or not isinstance(key_value, str):
+            return None
+        found = self.__metadata["json_keys"].get(key, {}).get(key_value)
+        codec = dict(self.__metadata["fields"])[key]
+        if fits(codec, key_value):
+            table = _KeyTable(self.__map, self.__metadata["tables"][key], self.__metadata["table_sizes"][key],
+                              self.field_offset(key), codec_size(codec), self.__record.size, self.wide)
+            wanted = bytes.fromhex(key_value)
+            index = bisect.bisect_left(table, wanted)
+            if index < len(table) and table[index] == wanted:
+                position = table.position(index)
+                found = position if found is None else min(found, position)
+        return found
+
+    def find(self, key, key_value):
+        """Returns the first record whose key has the value or None"""
+        position = self.position(key, key_value)
+        return None if position is None else self.record(position)
+
+    def field_offset(self, field):
+        """Returns the offset of the field inside a record"""
+        offset = 1
+        for name, codec in self.__metadata["fields"]:
+            if name == field:
+                return offset
+            offset += codec_size(codec)
+        raise KeyError(field)
+
+
+class _KeyTable:
+    """Sequence of the keys of the records in the order of a sorted table
+    of positions, for bisect"""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, data, offset, size, key_offset, key_size, record_size, wide):
+        self.__data = data
+        self.__position = struct.Struct("<Q" if wide else "<I")
+        self.__offset = HEADER.size + key_offset
+        self.__table = offset
+        self.__size = size
+        self.__key_size = key_size
+        self.__record_size = record_size
+
+    def position(self, index):
+        """Returns the record position at the index of the table"""
+        return self.__position.unpack_from(self.__data, self.__table + self.__position.size * index)[0]
+
+    def __len__(self):
+        return self.__size
+
+    def __getitem__(self, index):
+        start = self.__offset + self.position(index) * self.__record_size
+        return self.__data[start:start + self.__key_size]
@@ -0,0 +1,84 @@
+"""Contains the class SnapshotStore"""
+from .json_store import JsonStore
+from .journal_store import JournalStore
+from .snapshot import Snapshot, STORE_FIELDS, write_snapshot
+from .order_management_exception import OrderManagementException
+
+COMPACT_EVERY = 1000
+
+
+class SnapshotStore(JournalStore):
+    """Journal store that keeps a binary snapshot of its base file.
+
+    The snapshot (order_request.json -> order_request.json.snap) has the
+    records of the base json file with fixed width fields and is written
+    at every compaction, with the signature of the base file it was taken
+    from. Records are found in the snapshot through mmap, without parsing
+    the base file, and in the records of the journal written since the
+    last compaction, which are the only ones read when the store is first
+    used. A snapshot that does not match the base file is taken again."""
+
+    indexed = True
+    KEYS = ("order_id", "tracking_code")
+
+    def __init__(self, store_path, fsync_every=0, compact_every=COMPACT_EVERY):
+        super().__init__(store_path, fsync_every, compact_every)
+        self.__snapshot_path = store_path + ".snap"
+        self.__fields = STORE_FIELDS.get(self.store_name, ())
+        self.__snapshot = Snapshot(self.__snapshot_path)
+        self.__journal = []
+        self.__journal_index = {}
+        self.__journal_signature = None
+
+    @property
+    def snapshot_path(self):
+        """Returns the path of the snapshot file"""
+        return self.__snapshot_path
+
+    def __fresh_snapshot(self):
+        """Returns the snapshot of the current base file"""
+        signature = self._file_signature(self._store_path)
+        if self.__snapshot.signature == signature or \
+                (self.__snapshot.open() and self.__snapshot.signature == signature):
+            return self.__snapshot
+        self.__write_snapshot(JsonStore.load(self), signature)
+        return self.__snapshot
+
+    def __write_snapshot(self, records, signature):
+        write_snapshot(self.__snapshot_path, records, self.__fields, signature)
+        self.__snapshot.open()
+
+    def __fresh_journal(self):
+        """Returns the records of the journal, indexed by every key"""
+        self._finish_compaction()
+        signature = self._file_signature(self.journal_path)
+        if signature != self.__journal_signature:
+            self.__journal = self.load_journal()
+            self.__journal_index = {}
+            for record in self.__journal:
+                for key in self.KEYS:
+                    if isinstance(record, dict) and isinstance(record.get(key), str):
+                        self.__journal_index.setdefault((key, record[key]), record)
+            self.__journal_signature = signature
+        return self.__journal
+
+    def load(self):
+        """Returns the records of the snapshot followed by the journal ones"""
+        with self._lock:
+            return self.__fresh_snapshot().records() + list(self.__fresh_journal())
+
+    def find(self, key, key_value):
+        """Returns the first record whose key has the given value or None"""
+        if key not in self.KEYS:
+            raise OrderManagementException("Store is not indexed by " + str(key))
+        with self._lock:
+            record = self.__fresh_snapshot().find(key, key_value)
+            if record is not None:
+                return record
+            self.__fresh_journal()
+            return self.__journal_index.get((key, key_value))
+
+    def _replace_base(self, records):
+        """Writes the records as the new base file and takes its snapshot"""
+        super()._replace_base(records)
+        self.__write_snapshot(records, self._file_signature(self._store_path))
@@ -0,0 +1,125 @@
+"""Contains the class SqliteStore and the migration of the json stores to it"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+from .order_store import OrderStore, store_directory as default_store_directory
+from .json_store import JsonStore
+from .order_management_exception import OrderManagementException
+
+STORE_NAMES = ("order_request.json", "order_shipping.json", "order_manager.json")
+
+
+class SqliteStore(OrderStore):
+    """Store that keeps its records in a sqlite database.
+
+    The database is created next to the json file of the store
+    (order_request.json -> order_request.sqlite3) in WAL mode, with the
+    order_id and the tracking_code of the records indexed, so records can
+    be found without loading the store."""
+
+    indexed = True
+    KEYS = ("order_id", "tracking_code")
+
+    def __init__(self, store_path):
+        super().__init__(store_path)
+        self.__database_path = os.path.splitext(store_path)[0] + ".sqlite3"
+        self.__connections = threading.local()
+
+    @property
+    def database_path(self):
+        """Returns the path of the sqlite database"""
+        return self.__database_path
+
+    def __connection(self):
+        """Returns the connection of the current thread to the database"""
+        connection = getattr(self.__connections, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.__database_path)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.__connections.connection = connection
+        return connection
+
+    def create(self):
+        """Creates the database and its table if they do not exist"""
+        try:
+            with self.__connection() as connection:
+                connection.execute("CREATE TABLE IF NOT EXISTS records ("
+                                   "position INTEGER PRIMARY KEY AUTOINCREMENT, "
+                                   "order_id TEXT, tracking_code TEXT, record TEXT NOT NULL)")
+                for key in self.KEYS:
+                    connection.execute(f"CREATE INDEX IF NOT EXISTS records_{key} ON records ({key})")
+        except sqlite3.Error as exception:
+            raise OrderManagementException("Could create/find " + os.path.basename(self.__database_path)) \
+                from exception
+
+    def signature(self):
+        """Returns a value that changes whenever the database changes"""
+        return (self._file_signature(self.__database_path),
+                self._file_signature(self.__database_path + "-wal"))
+
+    def load(self):
+        """Returns the list with all the records of the store"""
+        cursor = self.__connection().execute("SELECT record FROM records ORDER BY position")
+        return [json.loads(record) for record, in cursor]
+
+    def find(self, key, key_value):
+        """Returns the first record whose key has the given value or None"""
+        if key not in self.KEYS:
+            raise OrderManagementException("Store is not indexed by " + str(key))
+        row = self.__connection().execute(
+            f"SELECT record FROM records WHERE {key} = ? ORDER BY position LIMIT 1", (key_value,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def count(self):
+        """Returns the number of records of the store"""
+        return self.__connection().execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def extend(self, records):
+        """Adds all the records in one transaction"""
+        with self.__connection() as connection:
+            connection.executemany(
+                "INSERT INTO records (order_id, tracking_code, record) VALUES (?, ?, ?)",
+                [(record.get("order_id"), record.get("tracking_code"), json.dumps(record)) for record in records])
+
+    def compact(self):
+        """Moves the WAL into the database and frees the unused pages"""
+        connection = self.__connection()
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        connection.execute("VACUUM")
+
+
+def migrate_json_stores(store_directory):
+    """Imports the json stores of the directory into sqlite stores.
+
+    Returns a dict with the number of records imported for every store.
+    Nothing is imported if any of the databases already has records."""
+    store_paths = [os.path.join(store_directory, store_name) for store_name in STORE_NAMES
+                   if os.path.exists(os.path.join(store_directory, store_name))]
+    sqlite_stores = [SqliteStore(store_path) for store_path in store_paths]
+    for sqlite_store in sqlite_stores:
+        sqlite_store.create()
+        if sqlite_store.count():
+            raise OrderManagementException(os.path.basename(sqlite_store.database_path) + " is not empty")
+
+    imported = {}
+    for store_path, sqlite_store in zip(store_paths, sqlite_stores):
+        records = JsonStore(store_path).load()
+        sqlite_store.extend(records)
+        imported[os.path.basename(store_path)] = len(records)
+    return imported
+
+
+def main():
+    """Command line of the migration: python -m uc3m_logistics.sqlite_store [store directory],
+    by default the directory of the stores of OrderManager"""
+    directory = default_store_directory(sys.argv[1] if len(sys.argv) > 1 else None)
+    for store_name, records in migrate_json_stores(directory).items():
+        print(f"{store_name}: {records} records imported")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Contains the class StoreIndex"""
+import threading
+
+
+class StoreIndex:
+    """Keeps the records of one store in memory indexed by one of their keys.
+
+    The records are loaded the first time they are needed and loaded again
+    only when the files of the store have been changed by someone else, so
+    looking up a record does not parse the store every time. The stores
+    change the inode or the size of their files on every write, which
+    changes their signature. Records written through the index are added
+    to it without loading the store again. Stores with their own index are
+    asked directly. The index can be shared by several threads."""
+
+    def __init__(self, store, key):
+        self.__store = store
+        self.__key = key
+        self.__records = []
+        self.__index = {}
+        self.__signature = None
+        self.__thread_lock = threading.RLock()
+
+    @property
+    def store(self):
+        """Returns the store behind the index"""
+        return self.__store
+
+    def records(self):
+        """Returns the list with all the records of the store"""
+        with self.__thread_lock:
+            self.refresh()
+            return self.__records
+
+    def find(self, key_value):
+        """Returns the first record with the given key or None"""
+        if self.__store.indexed:
+            return self.__store.find(self.__key, key_value)
+        with self.__thread_lock:
+            self.refresh()
+            return self.__index.get(key_value)
+
+    def refresh(self):
+        """Loads the store again if it changed since it was indexed"""
+        with self.__thread_lock:
+            signature = self.__store.signature()
+            if signature == self.__signature:
+                return
+            records = self.__store.load()
+            self.__records = records
+            self.__index = {}
+            self.__add_to_index(records)
+            self.__signature = signature
+
+    def extend(self, records):
+        """Adds the records to the store keeping the index up to date"""
+        if self.__store.indexed:
+            # indexed stores lock what they write themselves, ShardedStore
+            # only the shards of the records
+            self.__store.extend(records)
+            return
+        # the lock keeps other writers out between the refresh and the write
+        with self.__thread_lock, self.__store.lock:
+            self.refresh()
+            self.__store.extend(records)
+            self.__records.extend(records)
+            self.__add_to_index(records)
+            self.__signature = self.__store.signature()
+
+    def __add_to_index(self, records):
+        for record in records:
+            key_value = record.get(self.__key)
+            if key_value not in self.__index:
+                self.__index[key_value] = record
@@ -0,0 +1,162 @@
+"""Contains the class WalStore"""
+import json
+import os
+import struct
+import zlib
+
+from .json_store import JsonStore
+from .file_lock import replace_file
+from .order_management_exception import OrderManagementException
+
+MAGIC = b"UC3MWAL1"
+# magic and number of records the base file had when the log was started
+HEADER = struct.Struct("<8sQ")
+# length and crc32 of the json list of records that follows
+ENTRY = struct.Struct("<II")
+CHECKPOINT_EVERY = 1000
+
+
+class WalStore(JsonStore):
+    """Json store with a write-ahead log.
+
+    Every write appends one entry to the log next to the base json file
+    (order_request.json -> order_request.json.wal) with the records of the
+    write and their crc32, and syncs it before returning. Every
+    checkpoint_every records the log is folded into the base file, which
+    is replaced in one step, and a new log is started, so a recovery only
+    has to read the records since the last checkpoint.
+
+    The log header keeps the number of records of the base file it follows
+    and the entries give the position of every record after it, so a log
+    replayed on a base that already has some of its records (a crash
+    between the two steps of a checkpoint) skips them instead of adding
+    them twice. The store is recovered when it is created, which
+    OrderManager does when it starts: an entry torn by a crash is cut off
+    the log."""
+
+    def __init__(self, store_path, checkpoint_every=CHECKPOINT_EVERY, fsync=True):
+        super().__init__(store_path)
+        self.__wal_path = store_path + ".wal"
+        self.__checkpoint_every = checkpoint_every
+        self.__fsync = fsync
+        # signature of the log after the last entry this store checked or wrote, and its size
+        self.__checked_signature = None
+        self.__logged_records = 0
+
+    @property
+    def wal_path(self):
+        """Returns the path of the write-ahead log"""
+        return self.__wal_path
+
+    def create(self):
+        """Creates the base file and the log if they do not exist and
+        recovers the store from the last crash"""
+        super().create()
+        with self._lock:
+            try:
+                base_records = super().load()
+            except json.JSONDecodeError as exception:
+                raise OrderManagementException("Could not recover " + self.store_name + ": base file is corrupt") \
+                    from exception
+            if self.__read_header() is None:
+                self.__start_log(len(base_records))
+            self.recover()
+
+    def signature(self):
+        """Returns a value that changes whenever the base file or the log change"""
+        return super().signature() + (self._file_signature(self.__wal_path),)
+
+    def __read_header(self):
+        """Returns the number of base records of the log or None if it has no valid header"""
+        try:
+            with open(self.__wal_path, "rb") as file:
+                header = file.read(HEADER.size)
+        except FileNotFoundError:
+            return None
+        if len(header) < HEADER.size or header[:8] != MAGIC:
+            return None
+        return HEADER.unpack(header)[1]
+
+    def __start_log(self, base_count):
+        """Replaces the log with an empty one that follows base_count records"""
+        replace_file(self.__wal_path, HEADER.pack(MAGIC, base_count))
+        self.__checked_signature = self._file_signature(self.__wal_path)
+        self.__logged_records = 0
+
+    def __read_log(self):
+        """Returns the number of base records of the log, the batches of
+        its valid entries and the offset where they end"""
+        with open(self.__wal_path, "rb") as file:
+            data = file.read()
+        if len(data) < HEADER.size or data[:8] != MAGIC:
+            raise OrderManagementException("Could not recover " + self.store_name + ": log header is corrupt")
+        base_count = HEADER.unpack_from(data)[1]
+        batches = []
+        offset = HEADER.size
+        while offset + ENTRY.size <= len(data):
+            length, checksum = ENTRY.unpack_from(data, offset)
+            payload = data[offset + ENTRY.size:offset + ENTRY.size + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                break
+            batches.append(json.loads(payload))
+            offset += ENTRY.size + length
+        return base_count, batches, offset
+
+    def recover(self):
+        """Cuts off the log the entry torn by a crash, if any, and folds the
+        log into the base file if it is due a checkpoint.
+        Returns the number of records replayed from the log"""
+        with self._lock:
+            _, batches, end = self.__read_log()
+            if end < os.path.getsize(self.__wal_path):
+                with open(self.__wal_path, "r+b") as file:
+                    file.truncate(end)
+                    os.fsync(file.fileno())
+            self.__checked_signature = self._file_signature(self.__wal_path)
+            self.__logged_records = sum(len(batch) for batch in batches)
+            if self.__checkpoint_every and self.__logged_records >= self.__checkpoint_every:
+                self.checkpoint()
+            return self.__logged_records
+
+    def load(self):
+        """Returns the records of the base file followed by the ones of the
+        log that are not in it yet"""
+        with self._lock:
+            records = super().load()
+            base_count, batches, _ = self.__read_log()
+            position = base_count
+            for batch in batches:
+                for record in batch:
+                    if position >= len(records):
+                        records.append(record)
+                    position += 1
+            return records
+
+    def extend(self, records):
+        """Appends one entry with the records to the log and syncs it"""
+        payload = json.dumps(records).encode("utf-8")
+        with self._lock:
+            if self._file_signature(self.__wal_path) != self.__checked_signature:
+                # written by someone else since, a torn entry has to be cut off first
+                self.recover()
+            with open(self.__wal_path, "ab") as file:
+                file.write(ENTRY.pack(len(payload), zlib.crc32(payload)) + payload)
+                file.flush()
+                if self.__fsync:
+                    os.fsync(file.fileno())
+            self.__checked_signature = self._file_signature(self.__wal_path)
+            self.__logged_records += len(records)
+            if self.__checkpoint_every and self.__logged_records >= self.__checkpoint_every:
+                self.checkpoint()
+
+    def checkpoint(self):
+        """Folds the log into the base file and starts a new log"""
+        with self._lock:
+            records = self.load()
+            # the new log is started only after the base file has every record
+            replace_file(self._store_path, json.dumps(records, indent=4))
+            self.__start_log(len(records))
+
+    def compact(self):
+        """Folds the log into the base file"""
+        self.checkpoint()
@@ -0,0 +1,82 @@
+"""class for testing the asyncio order manager"""
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from uc3m_logistics import AsyncOrderManager, OrderManager, OrderManagementException, JsonStore, FixedClock
+from uc3m_logistics.order_id_not_found_exception import OrderidNotFoundException
+
+
+class CountingStore(JsonStore):
+    """json store that counts its writes"""
+    writes = 0
+
+    def extend(self, records):
+        CountingStore.writes += 1
+        super().extend(records)
+
+
+class AsyncOrderManagerTests(unittest.TestCase):
+    """class for testing the AsyncOrderManager class"""
+
+    def setUp(self):
+        """creates the manager with its stores in a temporary directory"""
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__clock = FixedClock("2023-03-09")
+        CountingStore.writes = 0
+        self.__order_manager = AsyncOrderManager(OrderManager(CountingStore, self.__clock,
+                                                              store_path=self.__directory.name))
+
+    def tearDown(self):
+        """removes the temporary directory"""
+        self.__directory.cleanup()
+
+    def write_input_file(self, data):
+        """writes the input file of send_product"""
+        input_file_path = os.path.join(self.__directory.name, "input.json")
+        with open(input_file_path, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        return input_file_path
+
+    def test_concurrent_orders_share_one_write(self):
+        """orders awaited at the same time are stored with one write"""
+        async def register_all():
+            return await asyncio.gather(*[
+                self.__order_manager.register_order("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN",
+                                                    "+34123456789", "28005")
+                for _ in range(20)])
+
+        order_ids = asyncio.run(register_all())
+        self.assertEqual(len(order_ids), 20)
+        self.assertEqual(CountingStore.writes, 1)
+        self.assertEqual(len(self.__order_manager.order_manager.repository.order_requests.records()), 20)
+
+    def test_register_send_and_deliver(self):
+        """the async methods behave as the order manager ones"""
+        async def register_send_and_deliver():
+            order_id = await self.__order_manager.register_order("8421691423220", "Premium",
+                                                                 "C/LISBOA,4, MADRID, SPAIN",
+                                                                 "+34123456789", "28005")
+            tracking_code = await self.__order_manager.send_product(self.write_input_file({"OrderID": order_id}))
+            self.__clock.move_to("2023-03-10")
+            return await self.__order_manager.deliver_product(tracking_code)
+
+        self.assertTrue(asyncio.run(register_send_and_deliver()))
+
+    def test_exceptions(self):
+        """the exceptions of the order manager are kept"""
+        with self.assertRaises(OrderManagementException) as exception:
+            asyncio.run(self.__order_manager.register_order("8421691423222", "Regular", "C/LISBOA,4, MADRID, SPAIN",
+                                                            "+34123456789", "28005"))
+        self.assertEqual(exception.exception.message, "Invalid ean13 code: check digit is incorrect")
+        with self.assertRaises(OrderidNotFoundException):
+            asyncio.run(self.__order_manager.send_product(self.write_input_file({"notOrder": ""})))
+        with self.assertRaises(OrderManagementException) as exception:
+            asyncio.run(self.__order_manager.deliver_product("abcdef"))
+        self.assertEqual(exception.exception.message, "Deliver Product: Invalid tracking code")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""class for testing the columnar export of the stores"""
+import json
+import os
+import struct
+import tempfile
+import unittest
+
+from uc3m_logistics import (OrderRequest, OrderShipping, FixedClock, OrderManagementException, WalStore,
+                            ShardedStore, SqliteStore)
+from uc3m_logistics import columnar_export
+from uc3m_logistics.columnar_export import export_columns, load_columns, npy_header
+
+
+class ColumnarExportTests(unittest.TestCase):
+    """class for testing the export_columns function"""
+
+    def setUp(self):
+        """writes the stores in a temporary directory"""
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__stores = os.path.join(self.__directory.name, "stores")
+        self.__output = os.path.join(self.__directory.name, "columns")
+        os.makedirs(self.__stores)
+        self.__requests = [OrderRequest("8421691423220", "PREMIUM" if number % 2 else "REGULAR",
+                                        f"C/LISBOA,{number} MADRID, SPAIN", "+34123456789", "28005",
+                                        FixedClock(1678320000.0 + number)).to_json() for number in range(25)]
+        self.__shippings = [OrderShipping("8421691423220", request["order_id"], "+34123456789",
+                                          request["order_type"], FixedClock(1678320000.5)).to_json()
+                            for request in self.__requests]
+        self.__deliveries = [{"tracking_code": shipping["tracking_code"], "time_stamp": 1678406400.0}
+                             for shipping in self.__shippings[::4]]
+        self.write_store("order_request.json", self.__requests[:20])
+        with open(os.path.join(self.__stores, "order_request.jsonl"), "w", encoding="utf-8") as journal:
+            journal.writelines(json.dumps(request) + "\n" for request in self.__requests[20:])
+        self.write_store("order_shipping.json", self.__shippings)
+        self.write_store("order_manager.json", self.__deliveries)
+
+    def tearDown(self):
+        """removes the temporary directory"""
+        self.__directory.cleanup()
+
+    def write_store(self, store_name, records):
+        """writes the json file of a store"""
+        with open(os.path.join(self.__stores, store_name), "w", encoding="utf-8") as file:
+            json.dump(records, file, indent=4)
+
+    def test_rows(self):
+        """every record of the stores and of the journal is exported"""
+        rows = export_columns(self.__output, self.__stores, chunk_size=7)
+        self.assertEqual(rows, {"order_requests": 25, "order_shippings": 25, "deliveries": 7})
+        self.assertEqual(sorted(os.listdir(os.path.join(self.__output, "deliveries"))),
+                         ["time_stamp.npy", "tracking_code.npy"])
+
+    def test_other_stores(self):
+        """the records of the stores written by WalStore, ShardedStore and SqliteStore are exported"""
+        for store_class in (WalStore, ShardedStore, SqliteStore):
+            with self.subTest(store_class=store_class.__name__):
+                directory = os.path.join(self.__directory.name, store_class.__name__)
+                store = store_class(os.path.join(directory, "order_request.json"))
+                os.makedirs(directory)
+                store.create()
+                store.extend(self.__requests)
+                for store_name in ("order_shipping.json", "order_manager.json"):
+                    os.link(os.path.join(self.__stores, store_name), os.path.join(directory, store_name))
+                rows = export_columns(self.__output, directory)
+                self.assertEqual(rows["order_requests"], 25)
+                with open(os.path.join(self.__output, "order_requests", "time_stamp.npy"), "rb") as file:
+                    self.assertEqual(struct.unpack_from("<25d", file.read(), 128),
+                                     tuple(request["time_stamp"] for request in self.__requests))
+
+    def test_missing_store(self):
+        """a store that does not exist is not exported as an empty table"""
+        os.remove(os.path.join(self.__stores, "order_manager.json"))
+        with self.assertRaises(OrderManagementException) as exception:
+            export_columns(self.__output, self.__stores)
+        self.assertEqual(exception.exception.message, "order_manager.json not found")
+
+    def test_npy_header(self):
+        """the header is the one of a .npy file and the data follows it"""
+        export_columns(self.__output, self.__stores, chunk_size=7)
+        with open(os.path.join(self.__output, "order_requests", "time_stamp.npy"), "rb") as file:
+            data = file.read()
+        self.assertEqual(data[:128], npy_header("<f8", 25))
+        self.assertEqual(len(data[:128]) % 64, 0)
+        self.assertEqual(struct.unpack_from("<25d", data, 128),
+                         tuple(request["time_stamp"] for request in self.__requests))
+
+    def test_invalid_value(self):
+        """a value that does not fit its column throws an exception"""
+        self.write_store("order_manager.json", [{"tracking_code": "x" * 65, "time_stamp": 1.0}])
+        with self.assertRaises(OrderManagementException):
+            export_columns(self.__output, self.__stores)
+
+    @unittest.skipIf(columnar_export.numpy is None, "numpy is not installed")
+    def test_load_columns(self):
+        """the columns are read back by numpy"""
+        export_columns(self.__output, self.__stores, chunk_size=7)
+        requests = load_columns(self.__output, "order_requests")
+        self.assertEqual([value.decode() for value in requests["order_id"]],
+                         [request["order_id"] for request in self.__requests])
+        self.assertEqual(list(requests["delivery_address"]), [request["delivery_address"] for request in self.__requests])
+        shippings = load_columns(self.__output, "order_shippings")
+        self.assertEqual(list(shippings["delivery_day"]), [shipping["delivery_day"] for shipping in self.__shippings])
+        self.assertEqual(shippings["type"][0], "DS")
+        deliveries = load_columns(self.__output, "deliveries")
+        self.assertEqual(deliveries["tracking_code"][1].decode(), self.__shippings[4]["tracking_code"])
+
+    @unittest.skipIf(columnar_export.pyarrow is None, "pyarrow is not installed")
+    def test_parquet(self):
+        """every table is also written as parquet"""
+        export_columns(self.__output, self.__stores, chunk_size=7, parquet=True)
+        table = columnar_export.pyarrow.parquet.read_table(os.path.join(self.__output, "order_shippings.parquet"))
+        self.assertEqual(table.num_rows, 25)
+        self.assertEqual(table.column("tracking_code").to_pylist(),
+                         [shipping["tracking_code"] for shipping in self.__shippings])
+
+    @unittest.skipIf(columnar_export.pyarrow is not None, "pyarrow is installed")
+    def test_parquet_missing(self):
+        """asking for parquet without pyarrow throws an exception"""
+        with self.assertRaises(OrderManagementException) as exception:
+            export_columns(self.__output, self.__stores, parquet=True)
+        self.assertEqual(exception.exception.message, "pyarrow is not installed")
+
+
+if __name__ == '__main__':
+    unittest.main()
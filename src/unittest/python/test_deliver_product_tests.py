@@ -5,7 +5,7 @@ import json
 import os
 import unittest
 
-from uc3m_logistics import OrderManager, OrderRequest, OrderManagementException, OrderShipping
+from uc3m_logistics import OrderManager, OrderRequest, OrderManagementException, OrderShipping, FixedClock
 from uc3m_logistics.order_id_not_found_exception import OrderidNotFoundException
 
 class DeliverProductTests(unittest.TestCase):
@@ -18,14 +18,14 @@ class DeliverProductTests(unittest.TestCase):
         current_path = os.path.dirname(__file__)
         cls.__order_shipping_json_store = os.path.join(current_path, store_path, "order_shipping.json")
         cls.__order_manager_json_store = os.path.join(current_path, store_path, "order_manager.json")
-        cls.__order_manager = OrderManager()
+        cls.__order_manager = OrderManager(clock=FixedClock("2023-03-10"))
 
         product_id = "8421691423220"
         order_id = "7628fa19bcb8e965bb73f8a180718f99"
         phone_number = "+34123456789"
         order_type = "Premium"
 
-        order_shipping = OrderShipping(product_id, order_id, phone_number, order_type)
+        order_shipping = OrderShipping(product_id, order_id, phone_number, order_type, FixedClock("2023-03-09"))
         with open(cls.__order_shipping_json_store, "w+", encoding="utf-8") as file:
             order_shipping_json = order_shipping.to_json()
             json.dump(order_shipping_json, file, indent=4)
@@ -70,7 +70,7 @@ class DeliverProductTests(unittest.TestCase):
         phone_number = "+34123456789"
         order_type = "Regular"
 
-        order_shipping = OrderShipping(product_id, order_id, phone_number, order_type)
+        order_shipping = OrderShipping(product_id, order_id, phone_number, order_type, FixedClock("2023-03-09"))
         with open(self.__order_shipping_json_store, "w+", encoding="utf-8") as file:
             order_shipping_json = order_shipping.to_json()
             json.dump(order_shipping_json, file, indent=4)
@@ -91,7 +91,7 @@ class DeliverProductTests(unittest.TestCase):
         phone_number = "+34123456789"
         order_type = "Premium"
 
-        order_shipping = OrderShipping(product_id, order_id, phone_number, order_type)
+        order_shipping = OrderShipping(product_id, order_id, phone_number, order_type, FixedClock("2023-03-09"))
         with open(self.__order_shipping_json_store, "w+", encoding="utf-8") as file:
             order_shipping_json = order_shipping.to_json()
             json.dump(order_shipping_json, file, indent=4)
@@ -0,0 +1,89 @@
+"""Test Deliver Products Method"""
+import json
+import os
+import unittest
+
+from uc3m_logistics import OrderManager, OrderManagementException, OrderShipping, FixedClock
+
+
+class DeliverProductsTests(unittest.TestCase):
+    """class for testing the deliver_products method"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        store_path = "../../main/python/stores/"
+        current_path = os.path.dirname(__file__)
+        cls.__order_shipping_json_store = os.path.join(current_path, store_path, "order_shipping.json")
+        cls.__order_manager_json_store = os.path.join(current_path, store_path, "order_manager.json")
+        cls.__order_manager = OrderManager(clock=FixedClock("2023-03-10"))
+
+    def setUp(self):
+        premium = OrderShipping("8421691423220", "7628fa19bcb8e965bb73f8a180718f99", "+34123456789",
+                                "Premium", FixedClock("2023-03-09"))
+        regular = OrderShipping("8421691423220", "7628fa19bcb8e965bb73f8a180718f99", "+34123456789",
+                                "Regular", FixedClock("2023-03-09"))
+        with open(self.__order_shipping_json_store, "w", encoding="utf-8") as file:
+            json.dump([premium.to_json(), regular.to_json()], file, indent=4)
+        with open(self.__order_manager_json_store, "w", encoding="utf-8") as file:
+            file.write("[]")
+
+    def tearDown(self):
+        with open(self.__order_shipping_json_store, "w", encoding="utf-8") as file:
+            file.write("[]")
+        with open(self.__order_manager_json_store, "w", encoding="utf-8") as file:
+            file.write("[]")
+
+    def test_deliver_products(self):
+        """every tracking code gets True or its exception"""
+        with open(self.__order_shipping_json_store, "r", encoding="utf-8") as file:
+            premium_code, regular_code = [item["tracking_code"] for item in json.load(file)]
+        results = self.__order_manager.deliver_products([premium_code, regular_code, "tracking_code", "abcdef"])
+        self.assertTrue(results[0])
+        self.assertEqual(results[1].message, "Deliver Product: Invalid delivery day")
+        self.assertEqual(results[2].message, "Given string is not hexadecimal")
+        self.assertEqual(results[3].message, "Deliver Product: Invalid tracking code")
+        for result in results[1:]:
+            self.assertIsInstance(result, OrderManagementException)
+        with open(self.__order_manager_json_store, "r", encoding="utf-8") as file:
+            deliveries = json.load(file)
+        self.assertEqual(deliveries, [{"tracking_code": premium_code,
+                                       "time_stamp": FixedClock("2023-03-10").timestamp()}])
+
+    def test_delivery_later_in_the_day(self):
+        """the delivery day is compared by calendar day, not by timestamp"""
+        with open(self.__order_shipping_json_store, "r", encoding="utf-8") as file:
+            premium_code, regular_code = [item["tracking_code"] for item in json.load(file)]
+        order_manager = OrderManager(clock=FixedClock("2023-03-10T18:45:12.5"))
+        self.assertTrue(order_manager.deliver_product(premium_code))
+        order_manager.clock.move_to("2023-03-11T00:00:01")
+        with self.assertRaises(OrderManagementException) as exception:
+            order_manager.deliver_product(premium_code)
+        self.assertEqual(exception.exception.message, "Deliver Product: Invalid delivery day")
+        with self.assertRaises(OrderManagementException) as exception:
+            order_manager.deliver_product(regular_code)
+        self.assertEqual(exception.exception.message, "Deliver Product: Invalid delivery day")
+
+    def test_delivery_day_tolerance(self):
+        """a tolerance allows delivering some days before or after"""
+        with open(self.__order_shipping_json_store, "r", encoding="utf-8") as file:
+            premium_code, regular_code = [item["tracking_code"] for item in json.load(file)]
+        order_manager = OrderManager(clock=FixedClock("2023-03-12T09:00"), delivery_day_tolerance=2)
+        results = order_manager.deliver_products([premium_code, regular_code])
+        self.assertTrue(results[0])
+        self.assertEqual(results[1].message, "Deliver Product: Invalid delivery day")
+        order_manager.clock.move_to("2023-03-14T09:00")
+        self.assertTrue(order_manager.deliver_product(regular_code))
+        order_manager.clock.move_to("2023-03-13T09:00")
+        self.assertIsInstance(order_manager.deliver_products([premium_code])[0], OrderManagementException)
+
+    def test_only_matching_tracking_code_is_delivered(self):
+        """an unknown tracking code does not deliver the first shipping"""
+        with self.assertRaises(OrderManagementException) as exception:
+            self.__order_manager.deliver_product("0" * 64)
+        self.assertEqual(exception.exception.message, "Deliver Product: Invalid tracking code")
+        with open(self.__order_manager_json_store, "r", encoding="utf-8") as file:
+            self.assertEqual(json.load(file), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
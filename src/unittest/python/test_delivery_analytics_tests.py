@@ -0,0 +1,148 @@
+"""class for testing the delivery SLA analytics"""
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from uc3m_logistics import DeliveryAnalytics, OrderRequest, OrderShipping, FixedClock, IndexedJsonStore
+from uc3m_logistics import delivery_analytics
+
+DAY = 24 * 60 * 60
+
+
+class DeliveryAnalyticsTests(unittest.TestCase):
+    """class for testing the DeliveryAnalytics class"""
+
+    def setUp(self):
+        """writes the stores in a temporary directory: a premium order
+        delivered a day late, two regular ones delivered on time and two
+        days early and one premium order not delivered yet"""
+        self.__directory = tempfile.TemporaryDirectory()
+        issued_at = datetime.fromisoformat("2023-03-09T12:00").timestamp()
+        orders = (("PREMIUM", "28005"), ("REGULAR", "28005"), ("REGULAR", "28010"), ("PREMIUM", "28010"))
+        self.__requests = [OrderRequest("8421691423220", order_type, f"C/LISBOA,{number} MADRID, SPAIN",
+                                        "+34123456789", zip_code, FixedClock(issued_at + number)).to_json()
+                           for number, (order_type, zip_code) in enumerate(orders)]
+        self.__shippings = [OrderShipping("8421691423220", request["order_id"], "+34123456789",
+                                          request["order_type"].title(), FixedClock(issued_at)).to_json()
+                            for request in self.__requests]
+        self.__deliveries = [self.delivery(0, DAY), self.delivery(1, 0), self.delivery(2, -2 * DAY),
+                             self.delivery(0, 2 * DAY), {"tracking_code": "0" * 64, "time_stamp": issued_at}]
+        self.write_store("order_request.json", self.__requests)
+        self.write_store("order_shipping.json", self.__shippings)
+        self.write_store("order_manager.json", self.__deliveries)
+
+    def tearDown(self):
+        """removes the temporary directory"""
+        self.__directory.cleanup()
+
+    def delivery(self, number, days_late):
+        """returns the delivery of a shipping some time after its delivery day"""
+        shipping = self.__shippings[number]
+        return {"tracking_code": shipping["tracking_code"], "time_stamp": shipping["delivery_day"] + days_late}
+
+    def write_store(self, store_name, records):
+        """writes the json file of a store"""
+        with open(os.path.join(self.__directory.name, store_name), "w", encoding="utf-8") as file:
+            json.dump(records, file, indent=4)
+
+    def append_journal(self, store_name, records):
+        """appends records to the journal of a store"""
+        with open(os.path.join(self.__directory.name, store_name + "l"), "a", encoding="utf-8") as file:
+            file.writelines(json.dumps(record) + "\n" for record in records)
+
+    def test_aggregates(self):
+        """the deliveries are counted by order type and zip code"""
+        analytics = DeliveryAnalytics(self.__directory.name)
+        by_order_type = analytics.by_order_type()
+        self.assertEqual(by_order_type["PREMIUM"], {"deliveries": 1, "early": 0, "on_time": 0, "late": 1,
+                                                    "on_time_rate": 0.0, "mean_lead_days": 2.0})
+        self.assertEqual(by_order_type["REGULAR"]["deliveries"], 2)
+        self.assertEqual(by_order_type["REGULAR"]["early"], 1)
+        self.assertEqual(by_order_type["REGULAR"]["on_time_rate"], 0.5)
+        self.assertEqual(by_order_type["REGULAR"]["mean_lead_days"], 6.0)
+        self.assertEqual(set(analytics.by_zip_code()), {"28005", "28010"})
+        self.assertEqual(analytics.by_zip_code()["28005"]["deliveries"], 2)
+        self.assertEqual(analytics.by_order_type_and_zip_code()[("REGULAR", "28010")]["early"], 1)
+        self.assertEqual(analytics.total()["deliveries"], 3)
+        self.assertEqual(analytics.unmatched, 1)
+
+    def test_tolerance(self):
+        """deliveries within the tolerance are on time"""
+        analytics = DeliveryAnalytics(self.__directory.name, delivery_day_tolerance=2)
+        self.assertEqual(analytics.total()["on_time"], 3)
+
+    def test_incremental(self):
+        """refresh only adds the records written since the last one"""
+        analytics = DeliveryAnalytics(self.__directory.name)
+        self.assertEqual(analytics.refresh(), 0)
+        self.append_journal("order_manager.json", [self.delivery(3, 0), self.delivery(1, DAY)])
+        self.assertEqual(analytics.refresh(), 1)
+        self.assertEqual(analytics.by_order_type()["PREMIUM"]["on_time"], 1)
+        self.assertEqual(analytics.total()["deliveries"], 4)
+        self.assertEqual(analytics.total(), DeliveryAnalytics(self.__directory.name).total())
+
+    def test_new_shippings(self):
+        """deliveries of shippings written after the first refresh are joined"""
+        self.write_store("order_request.json", self.__requests[:3])
+        self.write_store("order_shipping.json", self.__shippings[:3])
+        analytics = DeliveryAnalytics(self.__directory.name)
+        self.append_journal("order_request.json", self.__requests[3:])
+        self.append_journal("order_shipping.json", self.__shippings[3:])
+        self.append_journal("order_manager.json", [self.delivery(3, -DAY)])
+        self.assertEqual(analytics.refresh(), 1)
+        self.assertEqual(analytics.by_zip_code()["28010"]["early"], 2)
+
+    def test_delivery_before_its_shipping(self):
+        """a delivery read before its shipping is joined once the shipping is written"""
+        self.write_store("order_shipping.json", self.__shippings[:3])
+        analytics = DeliveryAnalytics(self.__directory.name)
+        self.append_journal("order_manager.json", [self.delivery(3, 0)])
+        self.assertEqual(analytics.refresh(), 0)
+        self.assertEqual(analytics.unmatched, 2)
+        self.append_journal("order_shipping.json", self.__shippings[3:])
+        self.assertEqual(analytics.refresh(), 1)
+        self.assertEqual(analytics.unmatched, 1)
+        self.assertEqual(analytics.by_order_type()["PREMIUM"]["on_time"], 1)
+
+    def test_only_new_bytes_are_read(self):
+        """records written in place after the last refresh are read without
+        reading the records before them again"""
+        store = IndexedJsonStore(os.path.join(self.__directory.name, "order_manager.json"))
+        analytics = DeliveryAnalytics(self.__directory.name)
+        with open(store.store_path, "r+b") as file:
+            # the records already read are not parsed again
+            file.seek(10)
+            file.write(b"@")
+        store.append(self.delivery(3, 0))
+        self.assertEqual(analytics.refresh(), 1)
+        self.assertEqual(analytics.total()["deliveries"], 4)
+
+    def test_compacted_journal(self):
+        """a journal folded into a new base file is not counted twice"""
+        analytics = DeliveryAnalytics(self.__directory.name)
+        self.append_journal("order_manager.json", [self.delivery(3, 0)])
+        self.assertEqual(analytics.refresh(), 1)
+        self.write_store("order_manager.json", self.__deliveries + [self.delivery(3, 0), self.delivery(0, 0)])
+        with open(os.path.join(self.__directory.name, "order_manager.jsonl"), "w", encoding="utf-8"):
+            pass
+        self.assertEqual(analytics.refresh(), 0)
+        self.assertEqual(analytics.total(), DeliveryAnalytics(self.__directory.name).total())
+
+    def test_without_numpy(self):
+        """the aggregates do not depend on numpy"""
+        expected = DeliveryAnalytics(self.__directory.name).by_order_type_and_zip_code()
+        with mock.patch.object(delivery_analytics, "numpy", None):
+            self.assertEqual(DeliveryAnalytics(self.__directory.name).by_order_type_and_zip_code(), expected)
+
+    def test_missing_stores(self):
+        """a directory without stores has no deliveries"""
+        analytics = DeliveryAnalytics(os.path.join(self.__directory.name, "missing"))
+        self.assertIsNone(analytics.total())
+        self.assertEqual(analytics.by_order_type(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+"""class for testing the validation of batches of ean13 codes"""
+import unittest
+
+from uc3m_logistics import OrderManager, OrderManagementException
+from uc3m_logistics import ean13_validator
+
+CODES = ["8421691423220", "8421691423222", "842169142322A", "842169142322", "84216914232222", 8421691423220,
+         "4006381333931", "0000000000000", "١٢٣٤٥٦٧٨٩٠١٢٨", "842169142322²"]
+
+
+class Ean13ValidatorTests(unittest.TestCase):
+    """class for testing validate_ean13_many"""
+
+    @staticmethod
+    def expected_reason(code):
+        """returns the message validate_ean13 gives for the code"""
+        try:
+            OrderManager.validate_ean13(code)
+        except OrderManagementException as exception:
+            return exception.message
+        except (TypeError, ValueError):
+            return ean13_validator.NOT_13_DIGITS
+        return None
+
+    def check(self, use_numpy):
+        """both paths agree with validate_ean13"""
+        mask, reasons = ean13_validator.validate_ean13_many(CODES, use_numpy=use_numpy)
+        expected = [self.expected_reason(code) for code in CODES]
+        self.assertEqual(reasons, expected)
+        self.assertEqual([bool(valid) for valid in mask], [reason is None for reason in expected])
+
+    def test_pure_python(self):
+        """the pure python path"""
+        self.check(False)
+
+    @unittest.skipIf(ean13_validator.numpy is None, "numpy is not installed")
+    def test_numpy(self):
+        """the numpy path"""
+        self.check(True)
+
+    def test_order_manager(self):
+        """the order manager gives the same result"""
+        mask, reasons = OrderManager.validate_ean13_many(["8421691423220", "8421691423222"])
+        self.assertEqual(list(mask), [True, False])
+        self.assertEqual(reasons, [None, "Invalid ean13 code: check digit is incorrect"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+"""class for testing the json store with a persistent index"""
+import json
+import os
+import tempfile
+import unittest
+
+from uc3m_logistics import OrderManager, IndexedJsonStore, FixedClock, OrderManagementException
+
+
+class IndexedJsonStoreTests(unittest.TestCase):
+    """class for testing the IndexedJsonStore class"""
+
+    def setUp(self):
+        """creates a temporary directory for the stores"""
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__store_path = os.path.join(self.__directory.name, "order_request.json")
+
+    def tearDown(self):
+        """removes the temporary directory"""
+        self.__directory.cleanup()
+
+    @staticmethod
+    def records(first, last):
+        """returns the records with the order ids first to last"""
+        return [{"order_id": f"{number:032x}", "zip_code": "28005"} for number in range(first, last)]
+
+    def test_same_file_as_json_store(self):
+        """the json list is written as json.dumps with indent 4"""
+        store = IndexedJsonStore(self.__store_path)
+        store.create()
+        store.extend(self.records(0, 3))
+        store.append({"order_id": "é", "items": [1, {"a": None}]})
+        with open(self.__store_path, "r", encoding="utf-8") as file:
+            text = file.read()
+        self.assertEqual(text, json.dumps(self.records(0, 3) + [{"order_id": "é", "items": [1, {"a": None}]}],
+                                          indent=4))
+
+    def test_written_in_place(self):
+        """new records are written over the end of the file, not by replacing it"""
+        store = IndexedJsonStore(self.__store_path)
+        store.create()
+        store.extend(self.records(0, 50))
+        inode = os.stat(self.__store_path).st_ino
+        with open(self.__store_path, "rb") as file:
+            head = file.read()[:-2]
+        store.extend(self.records(50, 52))
+        with open(self.__store_path, "rb") as file:
+            data = file.read()
+        self.assertEqual(os.stat(self.__store_path).st_ino, inode)
+        self.assertTrue(data.startswith(head))
+        self.assertEqual(json.loads(data), self.records(0, 52))
+        self.assertEqual(store.find("order_id", f"{51:032x}"), self.records(51, 52)[0])
+
+    def test_torn_tail(self):
+        """a write interrupted in the middle is cut back to the last complete record"""
+        store = IndexedJsonStore(self.__store_path)
+        store.create()
+        store.extend(self.records(0, 10))
+        store.find("order_id", f"{3:032x}")
+        for cut in (30, 1):
+            with open(self.__store_path, "r+b") as file:
+                file.truncate(os.path.getsize(self.__store_path) - cut)
+            store = IndexedJsonStore(self.__store_path)
+            self.assertEqual(store.find("order_id", f"{3:032x}"), self.records(3, 4)[0])
+        self.assertEqual(store.load(), self.records(0, 9))
+        store.extend(self.records(20, 21))
+        with open(self.__store_path, "r", encoding="utf-8") as file:
+            self.assertEqual(file.read(), json.dumps(self.records(0, 9) + self.records(20, 21), indent=4))
+
+    def test_torn_tail_order_manager(self):
+        """the order manager goes on after a write of the default store was interrupted"""
+        order_manager = OrderManager(clock=FixedClock("2023-03-09"), store_path=self.__directory.name)
+        order_ids = [order_manager.register_order("8421691423220", "Regular", f"C/LISBOA,{number}, MADRID, SPAIN",
+                                                  "+34123456789", "28005") for number in range(3)]
+        with open(self.__store_path, "r+b") as file:
+            file.truncate(os.path.getsize(self.__store_path) - 40)
+        order_manager = OrderManager(clock=FixedClock("2023-03-09"), store_path=self.__directory.name)
+        self.assertEqual(order_manager.validate_orderid(order_ids[0]).order_id, order_ids[0])
+        order_id = order_manager.register_order("8421691423220", "Premium", "C/LISBOA,9, MADRID, SPAIN",
+                                                "+34123456789", "28005")
+        self.assertEqual(OrderManager(store_path=self.__directory.name).validate_orderid(order_id).order_id,
+                         order_id)
+
+    def test_find(self):
+        """records are found by every key, the first one wins"""
+        store = IndexedJsonStore(self.__store_path)
+        store.create()
+        for first in range(0, 500, 50):
+            store.extend(self.records(first, first + 50))
+        store.append({"order_id": f"{7:032x}", "tracking_code": "abc"})
+        self.assertEqual(store.find("order_id", f"{7:032x}"), self.records(7, 8)[0])
+        self.assertEqual(store.find("order_id", f"{499:032x}"), self.records(499, 500)[0])
+        self.assertEqual(store.find("tracking_code", "abc")["order_id"], f"{7:032x}")
+        self.assertIsNone(store.find("order_id", f"{500:032x}"))
+        self.assertIsNone(store.find("order_id", None))
+        with self.assertRaises(OrderManagementException):
+            store.find("zip_code", "28005")
+        self.assertTrue(os.path.exists(store.index_path("order_id")))
+
+    def test_index_is_persistent(self):
+        """another store of the same file uses the index file"""
+        store = IndexedJsonStore(self.__store_path)
+        store.create()
+        store.extend(self.records(0, 100))
+        store.find("order_id", f"{0:032x}")
+        index_time = os.stat(store.index_path("order_id")).st_mtime_ns
+        other = IndexedJsonStore(self.__store_path)
+        self.assertEqual(other.find("order_id", f"{42:032x}"), self.records(42, 43)[0])
+        other.extend(self.records(100, 101))
+        self.assertEqual(store.find("order_id", f"{100:032x}"), self.records(100, 101)[0])
+        self.assertNotEqual(os.stat(store.index_path("order_id")).st_mtime_ns, index_time)
+
+    def test_file_written_by_others(self):
+        """the index is built again when the json file is written by others"""
+        store = IndexedJsonStore(self.__store_path)
+        store.create()
+        store.extend(self.records(0, 10))
+        self.assertIsNotNone(store.find("order_id", f"{5:032x}"))
+        with open(self.__store_path, "w", encoding="utf-8") as file:
+            json.dump(self.records(20, 30), file, indent=2)
+        self.assertIsNone(store.find("order_id", f"{5:032x}"))
+        self.assertEqual(store.find("order_id", f"{25:032x}"), self.records(25, 26)[0])
+        with open(self.__store_path, "w", encoding="utf-8") as file:
+            json.dump(self.records(40, 41)[0], file)
+        self.assertEqual(store.find("order_id", f"{40:032x}"), self.records(40, 41)[0])
+        store.extend(self.records(41, 42))
+        self.assertEqual(store.load(), self.records(40, 42))
+        self.assertEqual(store.find("order_id", f"{41:032x}"), self.records(41, 42)[0])
+
+    def test_validate_orderid_many_orders(self):
+        """every order of a store with many orders is found"""
+        order_manager = OrderManager(clock=FixedClock("2023-03-09"), store_path=self.__directory.name)
+        order_ids = [order_manager.register_order("8421691423220", "Regular", f"C/LISBOA,{number}, MADRID, SPAIN",
+                                                  "+34123456789", "28005") for number in range(20)]
+        for order_id in order_ids:
+            self.assertEqual(order_manager.validate_orderid(order_id).order_id, order_id)
+        with self.assertRaises(OrderManagementException) as exception:
+            order_manager.validate_orderid("0" * 32)
+        self.assertEqual(exception.exception.message, "Invalid OrderID: Order id is not in order request json")
+
+
+if __name__ == '__main__':
+    unittest.main()
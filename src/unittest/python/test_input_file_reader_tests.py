@@ -0,0 +1,131 @@
+"""Test InputFileReader and send_products_from_file"""
+import json
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+from uc3m_logistics import InputFileReader, OrderManager, OrderRequest, FixedClock, JsonStore
+from uc3m_logistics.order_id_not_found_exception import OrderidNotFoundException
+
+ORDER_ID = "0123456789abcdef0123456789abcdef"
+
+
+class InputFileReaderTests(unittest.TestCase):
+    """class for testing the streaming reader of the input files"""
+
+    def setUp(self):
+        self.__directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.__directory.cleanup()
+
+    def __write(self, text):
+        """Writes an input file and returns its path"""
+        input_file_path = os.path.join(self.__directory.name, "input.json")
+        with open(input_file_path, "w", encoding="utf-8") as file:
+            file.write(text)
+        return input_file_path
+
+    def __read(self, text, chunk_size=7):
+        """Returns the records of the text read with small chunks"""
+        return list(InputFileReader(self.__write(text), chunk_size=chunk_size))
+
+    def test_array(self):
+        """the records of an array, with their lines"""
+        text = "[\n" + ",\n".join(json.dumps({"OrderID": str(i)}) for i in range(50)) + "\n]\n"
+        records = self.__read(text)
+        self.assertEqual(records, [(i + 2, str(i)) for i in range(50)])
+
+    def test_json_lines(self):
+        """one record per line"""
+        text = "".join(json.dumps({"OrderID": str(i), "ContactEmail": "a@b.com"}) + "\n"
+                       for i in range(100))
+        self.assertEqual(self.__read(text, chunk_size=3), [(i + 1, str(i)) for i in range(100)])
+
+    def test_single_object(self):
+        """the file of send_product is one record"""
+        text = '\n\n{\n  "OrderID": "' + ORDER_ID + '",\n  "ContactEmail": "a@b.com"\n}\n'
+        self.assertEqual(self.__read(text), [(3, ORDER_ID)])
+
+    def test_malformed_record_in_json_lines(self):
+        """the reader goes on with the next line after a malformed record"""
+        text = '{"OrderID": "1"}\n{"OrderID": "2",,}\n{"OrderID": "3"}\n'
+        records = self.__read(text)
+        self.assertEqual([line for line, _ in records], [1, 2, 3])
+        self.assertIsInstance(records[1][1], json.JSONDecodeError)
+        self.assertEqual(records[1][1].lineno, 2)
+        self.assertEqual(records[1][1].colno, 17)
+        self.assertEqual([records[0][1], records[2][1]], ["1", "3"])
+
+    def test_error_past_the_next_record(self):
+        """an error found after the line the reader goes on with does not move the lines back"""
+        text = '{"OrderID": [\n{"OrderID": "1"}\n{"OrderID": "2"}\n{"OrderID": "3"}\n'
+        for chunk_size in (4, 7, 1024):
+            records = self.__read(text, chunk_size)
+            self.assertEqual([line for line, _ in records], [1, 2, 3, 4])
+            self.assertEqual(records[0][1].lineno, 3)
+            self.assertEqual([result for _, result in records[1:]], ["1", "2", "3"])
+
+    def test_malformed_record_in_array(self):
+        """the reader goes on with the next element after a malformed one"""
+        text = '[{"OrderID": "1"},\n {"OrderID": : "2"},\n {"OrderID": "3"}]'
+        records = self.__read(text)
+        self.assertEqual([line for line, _ in records], [1, 2, 3])
+        self.assertIsInstance(records[1][1], json.JSONDecodeError)
+        self.assertEqual([records[0][1], records[2][1]], ["1", "3"])
+
+    def test_long_malformed_record(self):
+        """a malformed record much longer than the records is skipped without keeping it in memory"""
+        bad_record = '{"OrderID": "' + "\\\"" * 256 * 1024 + '", : 2}'
+        for text in ('{"OrderID": "1"}\n' + bad_record + '\n{"OrderID": "3"}\n',
+                     '[{"OrderID": "1"},\n' + bad_record + ',\n{"OrderID": "3"}]'):
+            reader = InputFileReader(self.__write(text), chunk_size=4096, max_record_size=64 * 1024)
+            tracemalloc.start()
+            try:
+                records = list(reader)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            self.assertEqual([result for _, result in records][::2], ["1", "3"])
+            self.assertEqual([line for line, _ in records], [1, 2, 3])
+            self.assertLess(peak, 256 * 1024)
+
+    def test_missing_order_id(self):
+        """a record without OrderID reports its line"""
+        text = '{"OrderID": "1"}\n\n{"Order": "2"}\n'
+        records = self.__read(text)
+        self.assertEqual(records[0], (1, "1"))
+        self.assertEqual(records[1][0], 3)
+        self.assertIsInstance(records[1][1], OrderidNotFoundException)
+        self.assertEqual(records[1][1].message, "Send product: record at line 3 does not have order id")
+
+    def test_unterminated_array(self):
+        """a truncated array ends with one error"""
+        records = self.__read('[{"OrderID": "1"},\n{"OrderID": "2"')
+        self.assertEqual(records[0], (1, "1"))
+        self.assertEqual(len(records), 2)
+        self.assertIsInstance(records[1][1], json.JSONDecodeError)
+
+    def test_send_products_from_file(self):
+        """the shippings of the valid records are stored in batches"""
+        directory = self.__directory.name
+        order_manager = OrderManager(JsonStore, FixedClock("2023-03-09"), store_path=directory)
+        order_request = OrderRequest("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN",
+                                     "+34123456789", "28005", FixedClock("2023-03-09"))
+        order_manager.repository.add_order_requests([order_request.to_json()])
+        line = json.dumps({"OrderID": order_request.order_id, "ContactEmail": "a@b.com"})
+        text = "\n".join([line, '{"OrderID": "' + ORDER_ID + '", "ContactEmail": "a@b.com"}', line,
+                          "{broken", line]) + "\n"
+        results = list(order_manager.send_products_from_file(self.__write(text), batch_size=2))
+        self.assertEqual([line for line, _ in results], [1, 2, 3, 4, 5])
+        self.assertIsInstance(results[1][1], Exception)
+        self.assertIsInstance(results[3][1], json.JSONDecodeError)
+        tracking_codes = [results[0][1], results[2][1], results[4][1]]
+        self.assertTrue(all(isinstance(tracking_code, str) for tracking_code in tracking_codes))
+        self.assertEqual([item["tracking_code"] for item in order_manager.repository.order_shippings.records()],
+                         tracking_codes)
+
+
+if __name__ == '__main__':
+    unittest.main()
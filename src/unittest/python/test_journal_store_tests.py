@@ -0,0 +1,95 @@
+"""class for testing the journal store"""
+import json
+import os
+import tempfile
+import unittest
+
+from uc3m_logistics import JournalStore
+
+
+class Crash(Exception):
+    """stops a compaction as a crash would"""
+
+
+class CrashingJournalStore(JournalStore):
+    """journal store that stops its compaction before or after replacing the base file"""
+
+    def __init__(self, store_path, after_replace):
+        super().__init__(store_path)
+        self.__after_replace = after_replace
+
+    def _replace_base(self, records):
+        if self.__after_replace:
+            super()._replace_base(records)
+        raise Crash()
+
+
+class JournalStoreTests(unittest.TestCase):
+    """class for testing the JournalStore class"""
+
+    def setUp(self):
+        """creates an empty store in a temporary directory"""
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__store_path = os.path.join(self.__directory.name, "order_request.json")
+        self.__store = JournalStore(self.__store_path)
+        self.__store.create()
+
+    def tearDown(self):
+        """removes the temporary directory"""
+        self.__directory.cleanup()
+
+    def test_append_writes_one_line(self):
+        """appending a record only adds a line to the journal"""
+        self.__store.append({"order_id": "1"})
+        self.__store.append({"order_id": "2"})
+        with open(self.__store_path, "r", encoding="utf-8") as file:
+            self.assertEqual(json.load(file), [])
+        with open(self.__store.journal_path, "r", encoding="utf-8") as file:
+            self.assertEqual(len(file.readlines()), 2)
+        self.assertEqual(self.__store.load(), [{"order_id": "1"}, {"order_id": "2"}])
+
+    def test_compact(self):
+        """compacting folds the journal into the base file"""
+        self.__store.extend([{"order_id": "1"}, {"order_id": "2"}])
+        self.__store.compact()
+        with open(self.__store_path, "r", encoding="utf-8") as file:
+            self.assertEqual(json.load(file), [{"order_id": "1"}, {"order_id": "2"}])
+        self.assertEqual(os.path.getsize(self.__store.journal_path), 0)
+        self.assertEqual(self.__store.load(), [{"order_id": "1"}, {"order_id": "2"}])
+
+    def test_compact_every(self):
+        """the store compacts itself after compact_every records"""
+        store = JournalStore(self.__store_path, fsync_every=1, compact_every=2)
+        store.append({"order_id": "1"})
+        self.assertGreater(os.path.getsize(store.journal_path), 0)
+        store.append({"order_id": "2"})
+        self.assertEqual(os.path.getsize(store.journal_path), 0)
+        self.assertEqual(store.load(), [{"order_id": "1"}, {"order_id": "2"}])
+
+    def test_interrupted_compaction(self):
+        """the records of a compaction interrupted before or after replacing
+        the base file are read once"""
+        self.__store.extend([{"order_id": "1"}, {"order_id": "2"}])
+        for after_replace in (False, True):
+            with self.assertRaises(Crash):
+                CrashingJournalStore(self.__store_path, after_replace).compact()
+            store = JournalStore(self.__store_path)
+            self.assertEqual(store.load(), [{"order_id": "1"}, {"order_id": "2"}])
+        store.append({"order_id": "3"})
+        self.assertEqual(store.load(), [{"order_id": "1"}, {"order_id": "2"}, {"order_id": "3"}])
+        store.compact()
+        self.assertEqual(JournalStore(self.__store_path).load(), store.load())
+        self.assertFalse(os.path.exists(store.journal_path + ".fold"))
+
+    def test_torn_line(self):
+        """a line left by an interrupted write is ignored"""
+        self.__store.append({"order_id": "1"})
+        with open(self.__store.journal_path, "a", encoding="utf-8") as file:
+            file.write('{"order_id": ')
+        self.assertEqual(self.__store.load(), [{"order_id": "1"}])
+        self.__store.append({"order_id": "2"})
+        self.assertEqual(self.__store.load(), [{"order_id": "1"}, {"order_id": "2"}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""class for testing the order manager service"""
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from uc3m_logistics import OrderManager, OrderManagerService, OrderManagementException, JsonStore, FixedClock
+
+
+class CountingStore(JsonStore):
+    """json store that counts its writes"""
+    writes = 0
+
+    def extend(self, records):
+        CountingStore.writes += 1
+        super().extend(records)
+
+
+class OrderManagerServiceTests(unittest.TestCase):
+    """class for testing the OrderManagerService class"""
+
+    def setUp(self):
+        """creates a service with its stores in a temporary directory"""
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__stores = {}
+        self.__clock = FixedClock("2023-03-09")
+        CountingStore.writes = 0
+        order_manager = OrderManager(self.store_class, self.__clock)
+        self.__service = OrderManagerService(order_manager, max_workers=8)
+
+    def tearDown(self):
+        """closes the service and removes the temporary directory"""
+        self.__service.close()
+        self.__directory.cleanup()
+
+    def store_class(self, store_path):
+        """creates the stores in the temporary directory"""
+        store = CountingStore(os.path.join(self.__directory.name, os.path.basename(store_path)))
+        self.__stores[os.path.basename(store_path)] = store
+        return store
+
+    def test_concurrent_orders_are_grouped(self):
+        """orders waiting for the writer are stored with one write"""
+        store = self.__stores["order_request.json"]
+        order = ("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN", "+34123456789", "28005")
+        with store.lock:
+            futures = [self.__service.submit_register_order(*order) for _ in range(20)]
+            # the writer is blocked on the lock while the other orders arrive
+            time.sleep(0.2)
+        order_ids = {future.result() for future in futures}
+        self.assertEqual(len(order_ids), 1)
+        self.assertEqual(len(store.load()), 20)
+        self.assertLess(CountingStore.writes, 20)
+
+    def test_register_send_and_deliver(self):
+        """the service behaves as the order manager"""
+        order_id = self.__service.register_order("8421691423220", "Premium", "C/LISBOA,4, MADRID, SPAIN",
+                                                 "+34123456789", "28005")
+        input_file_path = os.path.join(self.__directory.name, "input.json")
+        with open(input_file_path, "w", encoding="utf-8") as file:
+            json.dump({"OrderID": order_id, "ContactEmail": "testingEmail47@testing.com"}, file)
+        tracking_code = self.__service.send_product(input_file_path)
+        self.__clock.move_to("2023-03-10")
+        self.assertTrue(self.__service.submit_deliver_product(tracking_code).result())
+        with self.assertRaises(OrderManagementException) as exception:
+            self.__service.deliver_product("tracking_code")
+        self.assertEqual(exception.exception.message, "Given string is not hexadecimal")
+
+    def test_threads(self):
+        """many threads can use the service at the same time"""
+        errors = []
+
+        def register():
+            try:
+                self.__service.register_order("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN",
+                                              "+34123456789", "28005")
+            except Exception as exception:  # pylint: disable=broad-except
+                errors.append(exception)
+
+        threads = [threading.Thread(target=register) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.__stores["order_request.json"].load()), 10)
+
+    def test_closed(self):
+        """a closed service does not accept orders"""
+        self.__service.close()
+        with self.assertRaises(OrderManagementException):
+            self.__service.register_order("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN",
+                                          "+34123456789", "28005")
+
+
+if __name__ == '__main__':
+    unittest.main()
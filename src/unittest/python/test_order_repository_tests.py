@@ -0,0 +1,70 @@
+"""class for testing the order repository"""
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from uc3m_logistics import JsonStore, JournalStore, OrderRepository
+from uc3m_logistics.file_lock import replace_file
+
+
+class OrderRepositoryTests(unittest.TestCase):
+    """class for testing the OrderRepository class"""
+
+    def setUp(self):
+        """creates the three stores in a temporary directory"""
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__stores = [JsonStore(os.path.join(self.__directory.name, name))
+                         for name in ("order_request.json", "order_shipping.json", "order_manager.json")]
+        for store in self.__stores:
+            store.create()
+        self.__repository = OrderRepository(*self.__stores)
+
+    def tearDown(self):
+        """removes the temporary directory"""
+        self.__directory.cleanup()
+
+    def test_find_order_request(self):
+        """order requests are found by order_id in a list with many orders"""
+        self.__repository.add_order_requests([{"order_id": "a" * 32}, {"order_id": "b" * 32}])
+        self.assertEqual(self.__repository.find_order_request("b" * 32), {"order_id": "b" * 32})
+        self.assertIsNone(self.__repository.find_order_request("c" * 32))
+
+    def test_find_order_shipping_and_delivery(self):
+        """shippings and deliveries are found by tracking_code"""
+        self.__repository.add_order_shippings([{"tracking_code": "ab", "delivery_day": 1.0}])
+        self.__repository.add_deliveries([{"tracking_code": "ab", "time_stamp": 1.0}])
+        self.assertEqual(self.__repository.find_order_shipping("ab")["delivery_day"], 1.0)
+        self.assertEqual(self.__repository.find_delivery("ab")["time_stamp"], 1.0)
+        self.assertIsNone(self.__repository.find_delivery("cd"))
+
+    def test_store_changed_on_disk(self):
+        """changes written to the store by someone else are seen, the
+        stores replace their files so a write changes the inode"""
+        self.assertIsNone(self.__repository.find_order_request("a" * 32))
+        replace_file(self.__stores[0].store_path, json.dumps({"order_id": "a" * 32}, indent=4))
+        self.assertEqual(self.__repository.find_order_request("a" * 32), {"order_id": "a" * 32})
+        replace_file(self.__stores[0].store_path, json.dumps({"order_id": "b" * 32}, indent=4))
+        self.assertIsNone(self.__repository.find_order_request("a" * 32))
+
+    def test_writes_do_not_load(self):
+        """records written through the repository are found without loading the store again"""
+        for store_class in (JsonStore, JournalStore):
+            store = store_class(os.path.join(self.__directory.name, store_class.__name__ + ".json"))
+            store.create()
+            repository = OrderRepository(store, *self.__stores[1:])
+            self.assertIsNone(repository.find_order_request("f" * 32))
+            for number in range(20):
+                repository.add_order_requests([{"order_id": f"{number:032x}"}])
+                with mock.patch.object(store_class, "load", autospec=True, side_effect=store_class.load) as load:
+                    self.assertEqual(repository.find_order_request(f"{number:032x}"),
+                                     {"order_id": f"{number:032x}"})
+                self.assertEqual(load.call_count, 0)
+            store.append({"order_id": "f" * 32})
+            with mock.patch.object(store_class, "load", autospec=True, side_effect=store_class.load) as load:
+                self.assertEqual(repository.find_order_request("f" * 32), {"order_id": "f" * 32})
+            self.assertEqual(load.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
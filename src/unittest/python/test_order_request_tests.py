@@ -0,0 +1,50 @@
+"""class for testing the OrderRequest class"""
+import hashlib
+import json
+import unittest
+
+from uc3m_logistics import OrderRequest, FixedClock
+
+
+class OrderRequestTests(unittest.TestCase):
+    """class for testing the OrderRequest class"""
+
+    def setUp(self):
+        """creates the order request"""
+        self.__order_request = OrderRequest("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN",
+                                            "+34123456789", "28005", FixedClock("2023-03-09"))
+
+    def test_order_id(self):
+        """the order_id is the md5 of the attributes of the request"""
+        order_id_check = hashlib.md5(json.dumps({
+            '_OrderRequest__product_id': "8421691423220",
+            '_OrderRequest__delivery_address': "C/LISBOA,4, MADRID, SPAIN",
+            '_OrderRequest__order_type': "Regular",
+            '_OrderRequest__phone_number': "+34123456789",
+            '_OrderRequest__zip_code': "28005",
+            '_OrderRequest__time_stamp': FixedClock("2023-03-09").timestamp(),
+        }).encode(encoding="utf-8")).hexdigest()
+        self.assertEqual(self.__order_request.order_id, order_id_check)
+        self.assertEqual(self.__order_request.order_id, "7628fa19bcb8e965bb73f8a180718f99")
+
+    def test_setter_changes_order_id(self):
+        """changing the request computes its order_id again"""
+        order_id = self.__order_request.order_id
+        self.__order_request.order_type = "Premium"
+        self.assertNotEqual(self.__order_request.order_id, order_id)
+        self.__order_request.order_type = "Regular"
+        self.assertEqual(self.__order_request.order_id, order_id)
+
+    def test_from_json(self):
+        """a stored request is rebuilt with its time stamp and order_id"""
+        order_request = OrderRequest.from_json(self.__order_request.to_json())
+        self.assertEqual(order_request.to_json(), self.__order_request.to_json())
+        self.assertEqual(str(order_request), str(self.__order_request))
+
+    def test_slots(self):
+        """the request has no instance dictionary"""
+        self.assertFalse(hasattr(self.__order_request, "__dict__"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+"""class for testing the OrderShipping class"""
+import hashlib
+import unittest
+
+from uc3m_logistics import OrderShipping, FixedClock
+
+
+class OrderShippingTests(unittest.TestCase):
+    """class for testing the OrderShipping class"""
+
+    def setUp(self):
+        """creates the order shipping"""
+        self.__order_shipping = OrderShipping("8421691423220", "7628fa19bcb8e965bb73f8a180718f99",
+                                              "+34123456789", "Premium", FixedClock("2023-03-09"))
+
+    def test_tracking_code(self):
+        """the tracking code is the sha256 of the signature string"""
+        issued_at = FixedClock("2023-03-09").timestamp()
+        signature_string = "{alg:SHA-256,typ:DS,order_id:7628fa19bcb8e965bb73f8a180718f99,issuedate:" + \
+                           str(issued_at) + ",deliveryday:" + str(issued_at + 24 * 60 * 60) + "}"
+        self.assertEqual(self.__order_shipping.tracking_code,
+                         hashlib.sha256(signature_string.encode()).hexdigest())
+
+    def test_tracking_code_is_reproducible(self):
+        """the same shipping always gets the same tracking code"""
+        order_shipping = OrderShipping("8421691423220", "7628fa19bcb8e965bb73f8a180718f99",
+                                       "+34123456789", "Premium", FixedClock("2023-03-09"))
+        self.assertEqual(order_shipping.tracking_code, self.__order_shipping.tracking_code)
+
+    def test_setter_changes_tracking_code(self):
+        """changing the delivery day signs the shipping again"""
+        tracking_code = self.__order_shipping.tracking_code
+        self.__order_shipping.delivery_day = self.__order_shipping.delivery_day + 1
+        self.assertNotEqual(self.__order_shipping.tracking_code, tracking_code)
+
+    def test_from_json(self):
+        """a stored shipping is rebuilt with its tracking code"""
+        order_shipping = OrderShipping.from_json(self.__order_shipping.to_json())
+        self.assertEqual(order_shipping.to_json(), self.__order_shipping.to_json())
+        self.assertFalse(hasattr(order_shipping, "__dict__"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""class for testing the compiled validation of the orders"""
+import unittest
+
+from uc3m_logistics import OrderManager, OrderManagementException, OrderValidator
+
+VALID = ("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN", "+34123456789", "28005")
+RECORDS = [
+    VALID,
+    ("842169142322A", "Regular", "C/LISBOA,4, MADRID, SPAIN", "+34123456789", "28005"),
+    ("8421691423222", "Regular", "C/LISBOA,4, MADRID, SPAIN", "+34123456789", "28005"),
+    ("8421691423220", "PRE", "C/LISBOA,4, MADRID, SPAIN", "+34123456789", "28005"),
+    ("8421691423220", 333, "C/LISBOA,4, MADRID, SPAIN", "+34123456789", "28005"),
+    ("8421691423220", "Premium", "C/ ALLE, SPAIN", "+34123456789", "28005"),
+    ("8421691423220", "Regular", "C/LISBOA,4,MADRID,SPAIN", "+34123456789", "28005"),
+    ("8421691423220", "Regular", "C" * 101 + " ", "+34123456789", "28005"),
+    ("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN", "+44123456789", "28005"),
+    ("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN", 34123456789, "28005"),
+    ("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN", "+341234567899", "28005"),
+    ("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN", "+34123456789", "01000"),
+    ("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN", "+34123456789", "52007"),
+    ("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN", "+34123456789", "28A05"),
+    ("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN", "+34123456789", 28005),
+    ("842169142322²", "Regular", "C/LISBOA,4, MADRID, SPAIN", "+34123456789", "28005"),
+    ("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN", "+34123456789", "2800²"),
+]
+
+
+class OrderValidatorTests(unittest.TestCase):
+    """class for testing the OrderValidator class"""
+
+    @staticmethod
+    def chain_error(record):
+        """returns the first error of the chain of validators of OrderManager"""
+        validators = (OrderManager.validate_ean13, OrderManager.validate_order_type, OrderManager.validate_address,
+                      OrderManager.validate_phone_number, OrderManager.validate_zip_code)
+        try:
+            for validator, value in zip(validators, record):
+                validator(value)
+        except OrderManagementException as exception:
+            return exception.message
+        return None
+
+    def test_same_errors_as_the_chain(self):
+        """fail fast gives the error the chain of validators gives"""
+        validator = OrderValidator()
+        self.assertEqual(validator.validate_many(RECORDS), [self.chain_error(record) for record in RECORDS])
+
+    def test_validate(self):
+        """validate throws the first error"""
+        validator = OrderValidator()
+        validator.validate(*VALID)
+        with self.assertRaises(OrderManagementException) as exception:
+            validator.validate(*RECORDS[2])
+        self.assertEqual(exception.exception.message, "Invalid ean13 code: check digit is incorrect")
+
+    def test_collect_all(self):
+        """collect all gives the first error of every field"""
+        validator = OrderValidator()
+        errors = validator.all_errors("8421691423222", "PRE", "C/LISBOA,4, MADRID, SPAIN", "+4412345678", 28005)
+        self.assertEqual(errors, ["Invalid ean13 code: check digit is incorrect",
+                                  "Invalid order type: string is invalid",
+                                  "Invalid phone number: phone number is too short",
+                                  "Invalid zip code: zip code not a string"])
+        self.assertEqual(validator.validate_many([VALID], collect_all=True), [[]])
+
+    def test_validate_field(self):
+        """a single value is checked with the rules of its field"""
+        validator = OrderValidator()
+        self.assertEqual(validator.validate_field("zip_code", "28005"), "28005")
+        with self.assertRaises(OrderManagementException) as exception:
+            validator.validate_field("zip_code", "2800²")
+        self.assertEqual(exception.exception.message, "Invalid zip code: characters are not digits")
+        self.assertEqual(OrderManager.validate_order_type("PREMIUM"), "premium")
+
+    def test_dict_records(self):
+        """records can be given as dicts"""
+        validator = OrderValidator()
+        record = dict(zip(validator.fields, RECORDS[3]))
+        self.assertEqual(validator.validate_many([record]), ["Invalid order type: string is invalid"])
+
+
+if __name__ == '__main__':
+    unittest.main()
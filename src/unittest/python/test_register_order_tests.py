@@ -6,7 +6,7 @@ import unittest
 from datetime import datetime
 from freezegun import freeze_time
 
-from uc3m_logistics import OrderManager, OrderRequest, OrderManagementException
+from uc3m_logistics import OrderManager, OrderRequest, OrderManagementException, FixedClock
 
 class RegisterOrderTests(unittest.TestCase):
     """class for testing the register_order method"""
@@ -18,7 +18,7 @@ class RegisterOrderTests(unittest.TestCase):
         store_path = "../../main/python/stores/"
         current_path = os.path.dirname(__file__)
         cls.__order_request_json_store = os.path.join(current_path, store_path, "order_request.json")
-        cls.__order_manager = OrderManager()
+        cls.__order_manager = OrderManager(clock=FixedClock("2023-03-09"))
 
 
     def setUp(self):
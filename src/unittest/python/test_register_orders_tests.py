@@ -0,0 +1,64 @@
+"""class for testing the register_orders method"""
+import json
+import os
+import unittest
+
+from uc3m_logistics import OrderManager, OrderManagementException, FixedClock
+
+
+class RegisterOrdersTests(unittest.TestCase):
+    """class for testing the register_orders method"""
+    __order_request_json_store: str = None
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """method sets up RegisterOrdersTests class"""
+        store_path = "../../main/python/stores/"
+        current_path = os.path.dirname(__file__)
+        cls.__order_request_json_store = os.path.join(current_path, store_path, "order_request.json")
+        cls.__order_manager = OrderManager(clock=FixedClock("2023-03-09"))
+
+    def setUp(self):
+        """method sets up order_request json"""
+        with open(self.__order_request_json_store, "w", encoding="utf-8") as file:
+            file.write("[]")
+
+    def tearDown(self) -> None:
+        """method tears down order_request json"""
+        with open(self.__order_request_json_store, "w", encoding="utf-8") as file:
+            file.write("[]")
+
+    def test_register_orders_valid(self):
+        """a batch of valid orders is stored as register_order would"""
+        order_id = self.__order_manager.register_order("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN",
+                                                       "+34123456789", "28005")
+        results = self.__order_manager.register_orders([
+            ("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN", "+34123456789", "28005"),
+            {"product_id": "8421691423220", "order_type": "Regular", "address": "C/LISBOA,4, MADRID, SPAIN",
+             "phone_number": "+34123456789", "zip_code": "28005"},
+        ])
+        self.assertEqual(results, [order_id, order_id])
+        with open(self.__order_request_json_store, "r", encoding="utf-8") as file:
+            self.assertEqual(len(json.load(file)), 3)
+
+    def test_register_orders_invalid(self):
+        """invalid orders get their exception and do not stop the batch"""
+        results = self.__order_manager.register_orders([
+            ("8421691423222", "Regular", "C/LISBOA,4, MADRID, SPAIN", "+34123456789", "28005"),
+            ("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN", "+34123456789", "28005"),
+            ("8421691423220", "Regular"),
+        ])
+        self.assertIsInstance(results[0], OrderManagementException)
+        self.assertEqual(results[0].message, "Invalid ean13 code: check digit is incorrect")
+        self.assertIsInstance(results[1], str)
+        self.assertIsInstance(results[2], OrderManagementException)
+        with open(self.__order_request_json_store, "r", encoding="utf-8") as file:
+            self.assertEqual(len(json.load(file)), 1)
+
+    def test_register_orders_empty(self):
+        """an empty batch does not write the store"""
+        self.assertEqual(self.__order_manager.register_orders([]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,7 +4,7 @@ import json
 import os
 import unittest
 
-from uc3m_logistics import OrderManager, OrderRequest, OrderManagementException
+from uc3m_logistics import OrderManager, OrderRequest, OrderManagementException, FixedClock
 from uc3m_logistics.order_id_not_found_exception import OrderidNotFoundException
 
 
@@ -20,7 +20,7 @@ class SendProductTests(unittest.TestCase):
                                                        "order_shipping.json")
         cls.__order_request_json_store = os.path.join(current_path, store_path,
                                                       "order_request.json")
-        cls.__order_manager = OrderManager()
+        cls.__order_manager = OrderManager(clock=FixedClock("2023-03-09"))
 
         product_id = "8421691423220"
         delivery_address = "C/LISBOA,4, MADRID, SPAIN"
@@ -29,7 +29,7 @@ class SendProductTests(unittest.TestCase):
         zip_code = "28005"
 
         order_request = OrderRequest(product_id, order_type, delivery_address,
-                                     phone_number, zip_code)
+                                     phone_number, zip_code, FixedClock("2023-03-09"))
 
         with open(cls.__order_request_json_store, "w+", encoding="utf-8") as file:
             order_request_json = order_request.to_json()
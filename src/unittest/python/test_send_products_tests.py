@@ -0,0 +1,66 @@
+"""Test Send Products Method"""
+import json
+import os
+import unittest
+
+from uc3m_logistics import OrderManager, OrderRequest, OrderManagementException, FixedClock
+from uc3m_logistics.order_id_not_found_exception import OrderidNotFoundException
+
+
+class SendProductsTests(unittest.TestCase):
+    """class for testing the send_products and send_products_from_dir methods"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        store_path = "../../main/python/stores/"
+        current_path = os.path.dirname(__file__)
+        cls.__input_path = os.path.join(current_path, "send_product_tests")
+        cls.__order_shipping_json_store = os.path.join(current_path, store_path, "order_shipping.json")
+        cls.__order_request_json_store = os.path.join(current_path, store_path, "order_request.json")
+        cls.__order_manager = OrderManager(clock=FixedClock("2023-03-09"))
+
+    def setUp(self):
+        order_request = OrderRequest("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN",
+                                     "+34123456789", "28005", FixedClock("2023-03-09"))
+        with open(self.__order_request_json_store, "w", encoding="utf-8") as file:
+            json.dump([order_request.to_json()], file, indent=4)
+        with open(self.__order_shipping_json_store, "w", encoding="utf-8") as file:
+            file.write("[]")
+
+    def tearDown(self):
+        with open(self.__order_shipping_json_store, "w", encoding="utf-8") as file:
+            file.write("[]")
+        with open(self.__order_request_json_store, "w", encoding="utf-8") as file:
+            file.write("[]")
+
+    def test_send_products(self):
+        """every file gets its tracking code or its exception"""
+        results = self.__order_manager.send_products([
+            os.path.join(self.__input_path, "no_error", "basic_test.json"),
+            os.path.join(self.__input_path, "json_decode_error", "node1_del.json"),
+            os.path.join(self.__input_path, "order_id_not_found_error", "node3_del.json"),
+            os.path.join(self.__input_path, "order_management_error", "node35_mut.json"),
+            os.path.join(self.__input_path, "missing.json"),
+            os.path.join(self.__input_path, "no_error", "node47_mut.json"),
+        ])
+        self.assertIsInstance(results[0], str)
+        self.assertIsInstance(results[1], json.decoder.JSONDecodeError)
+        self.assertIsInstance(results[2], OrderidNotFoundException)
+        self.assertIsInstance(results[3], OrderManagementException)
+        self.assertIsInstance(results[4], FileNotFoundError)
+        self.assertIsInstance(results[5], str)
+        with open(self.__order_shipping_json_store, "r", encoding="utf-8") as file:
+            order_shippings = json.load(file)
+        self.assertEqual([item["tracking_code"] for item in order_shippings], [results[0], results[5]])
+
+    def test_send_products_from_dir(self):
+        """all the files of the directory are sent"""
+        directory = os.path.join(self.__input_path, "order_management_error")
+        results = self.__order_manager.send_products_from_dir(directory)
+        self.assertEqual(len(results), len(os.listdir(directory)))
+        for result in results.values():
+            self.assertIsInstance(result, OrderManagementException)
+
+
+if __name__ == '__main__':
+    unittest.main()
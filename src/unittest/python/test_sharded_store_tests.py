@@ -0,0 +1,152 @@
+"""class for testing the sharded store"""
+import functools
+import json
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+
+from uc3m_logistics import OrderManager, OrderManagementException, ShardedStore, FixedClock
+from uc3m_logistics.file_lock import FileLock
+from uc3m_logistics.sharded_store import by_day, by_zip_code
+
+
+class ShardedStoreTests(unittest.TestCase):
+    """class for testing the ShardedStore class"""
+
+    def setUp(self):
+        """creates a temporary directory for the stores"""
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__store_path = os.path.join(self.__directory.name, "order_request.json")
+
+    def tearDown(self):
+        """removes the temporary directory"""
+        self.__directory.cleanup()
+
+    @staticmethod
+    def records(first, last, day="2023-03-09"):
+        """returns the records with the order ids first to last issued on the day"""
+        time_stamp = datetime.fromisoformat(day + "T12:00+00:00").timestamp()
+        return [{"order_id": f"{number:032x}", "zip_code": f"{28000 + number % 3 * 10000}",
+                 "time_stamp": time_stamp} for number in range(first, last)]
+
+    def test_partitions(self):
+        """records go to the shard of their day or zip code prefix"""
+        record = self.records(0, 1)[0]
+        self.assertEqual(by_day(record), "2023-03-09")
+        self.assertEqual(by_day({"issued_at": record["time_stamp"]}), "2023-03-09")
+        self.assertEqual(by_day({}), "undated")
+        self.assertEqual(by_zip_code()(record), "zip_28")
+        self.assertEqual(by_zip_code(3)({"zip_code": "52006"}), "zip_520")
+        self.assertEqual(by_zip_code()({"time_stamp": record["time_stamp"]}), "2023-03-09")
+
+    def test_find_routes_to_the_shard(self):
+        """records are written to their shards and found through the routing index"""
+        store = ShardedStore(self.__store_path)
+        store.create()
+        store.extend(self.records(0, 100))
+        store.extend(self.records(100, 200, "2023-03-10"))
+        store.append(dict(self.records(5, 6, "2023-03-11")[0], tracking_code="abc"))
+        self.assertEqual(store.shard_names(), ["2023-03-09", "2023-03-10", "2023-03-11"])
+        self.assertEqual(len(store.shard("2023-03-10").load()), 100)
+        self.assertEqual(store.find("order_id", f"{150:032x}"), self.records(150, 151, "2023-03-10")[0])
+        self.assertEqual(store.find("order_id", f"{5:032x}"), self.records(5, 6)[0])
+        self.assertEqual(store.find("tracking_code", "abc")["order_id"], f"{5:032x}")
+        self.assertIsNone(store.find("order_id", f"{200:032x}"))
+        self.assertEqual(len(store.load()), 201)
+        other = ShardedStore(self.__store_path)
+        self.assertEqual(other.find("order_id", f"{99:032x}"), self.records(99, 100)[0])
+
+    def test_shards_are_written_in_parallel(self):
+        """a shard being written does not stop the writes and lookups of the others"""
+        store = ShardedStore(self.__store_path)
+        store.create()
+        store.extend(self.records(0, 10) + self.records(10, 20, "2023-03-10"))
+        # a write of the first shard that waits for its lock
+        with FileLock(store.shard("2023-03-09").store_path):
+            slow_writer = threading.Thread(target=store.extend, args=(self.records(30, 31),))
+            slow_writer.start()
+            writer = threading.Thread(target=store.extend, args=(self.records(20, 30, "2023-03-10"),))
+            writer.start()
+            writer.join(10)
+            self.assertFalse(writer.is_alive())
+            self.assertTrue(slow_writer.is_alive())
+            self.assertEqual(store.find("order_id", f"{25:032x}"), self.records(25, 26, "2023-03-10")[0])
+        slow_writer.join(10)
+        self.assertEqual(store.find("order_id", f"{30:032x}"), self.records(30, 31)[0])
+
+    def test_order_managers_write_in_parallel(self):
+        """an order manager writing a shard does not stop the one writing another"""
+        order_manager = OrderManager(ShardedStore, FixedClock("2023-03-09T12:00+00:00"),
+                                     store_path=self.__directory.name)
+        order_manager.register_order("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN", "+34123456789", "28005")
+        other = OrderManager(ShardedStore, FixedClock("2023-03-10T12:00+00:00"), store_path=self.__directory.name)
+        order_ids = []
+        shard = ShardedStore(self.__store_path).shard("2023-03-09")
+        with FileLock(shard.store_path):
+            # a write of the first shard that waits for its lock
+            slow_writer = threading.Thread(target=order_manager.register_order, args=(
+                "8421691423220", "Regular", "C/LISBOA,6, MADRID, SPAIN", "+34123456789", "28005"))
+            slow_writer.start()
+            writer = threading.Thread(target=lambda: order_ids.append(other.register_order(
+                "8421691423220", "Premium", "C/LISBOA,5, MADRID, SPAIN", "+34123456789", "28005")))
+            writer.start()
+            writer.join(10)
+            self.assertFalse(writer.is_alive())
+            self.assertTrue(slow_writer.is_alive())
+        slow_writer.join(10)
+        self.assertEqual(order_manager.validate_orderid(order_ids[0]).order_id, order_ids[0])
+
+    def test_interrupted_write(self):
+        """a routing index behind the manifest is built again from the shards"""
+        store = ShardedStore(self.__store_path)
+        store.create()
+        store.extend(self.records(0, 10))
+        # a write that stored its records but died before updating the routing
+        store.shard("2023-03-12").create()
+        store.shard("2023-03-12").extend(self.records(10, 11, "2023-03-12"))
+        manifest_path = os.path.join(store.shards_path, "manifest.json")
+        with open(manifest_path, "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+        manifest["generation"] += 1
+        manifest["shards"].append("2023-03-12")
+        with open(manifest_path, "w", encoding="utf-8") as file:
+            json.dump(manifest, file)
+        self.assertEqual(ShardedStore(self.__store_path).find("order_id", f"{10:032x}"),
+                         self.records(10, 11, "2023-03-12")[0])
+
+    def test_archive(self):
+        """an archived shard is moved out of the store"""
+        store = ShardedStore(self.__store_path)
+        store.create()
+        store.extend(self.records(0, 10) + self.records(10, 20, "2023-03-10"))
+        store.find("order_id", f"{0:032x}")
+        archive_path = os.path.join(self.__directory.name, "archive")
+        store.archive("2023-03-09", archive_path)
+        self.assertEqual(store.shard_names(), ["2023-03-10"])
+        self.assertIsNone(store.find("order_id", f"{0:032x}"))
+        self.assertEqual(store.find("order_id", f"{15:032x}"), self.records(15, 16, "2023-03-10")[0])
+        self.assertIn("2023-03-09.json", os.listdir(archive_path))
+        with self.assertRaises(OrderManagementException):
+            store.archive("2023-03-09", archive_path)
+
+    def test_order_manager(self):
+        """the order manager works the same with sharded stores"""
+        order_manager = OrderManager(functools.partial(ShardedStore, partition=by_zip_code()),
+                                     FixedClock("2023-03-09"), store_path=self.__directory.name)
+        order_ids = [order_manager.register_order("8421691423220", "Premium", "C/LISBOA,4, MADRID, SPAIN",
+                                                  "+34123456789", zip_code) for zip_code in ("28005", "08001")]
+        input_file_path = os.path.join(self.__directory.name, "input.json")
+        with open(input_file_path, "w", encoding="utf-8") as file:
+            json.dump({"OrderID": order_ids[1]}, file)
+        tracking_code = order_manager.send_product(input_file_path)
+        order_manager.clock.move_to("2023-03-10")
+        self.assertTrue(order_manager.deliver_product(tracking_code))
+        store = order_manager.repository.order_requests.store
+        self.assertEqual(store.shard_names(), ["zip_28", "zip_08"])
+        self.assertEqual(len(order_manager.repository.order_shippings.store.shard_names()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
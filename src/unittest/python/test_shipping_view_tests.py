@@ -0,0 +1,104 @@
+"""class for testing the read only view of the shippings"""
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from uc3m_logistics import ShippingView, OrderShipping, FixedClock, OrderManagementException, SnapshotStore, JsonStore
+from uc3m_logistics import shipping_view
+
+
+class ShippingViewTests(unittest.TestCase):
+    """class for testing the ShippingView class"""
+
+    def setUp(self):
+        """writes the stores of the view in a temporary directory"""
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__shippings = [OrderShipping("8421691423220", f"{number:032x}", "+34123456789",
+                                          "Premium" if number % 2 else "Regular",
+                                          FixedClock(1678320000.25 + number)).to_json() for number in range(30)]
+        self.__deliveries = [{"tracking_code": shipping["tracking_code"], "time_stamp": 1678406400.5}
+                             for shipping in self.__shippings[::3]]
+        self.write_store("order_shipping.json", self.__shippings)
+        self.write_store("order_manager.json", self.__deliveries)
+        self.write_store("order_request.json", [])
+
+    def tearDown(self):
+        """removes the temporary directory"""
+        self.__directory.cleanup()
+
+    def write_store(self, store_name, records):
+        """writes the json file of a store"""
+        with open(os.path.join(self.__directory.name, store_name), "w", encoding="utf-8") as file:
+            json.dump(records, file, indent=4)
+
+    def test_iteration(self):
+        """every shipping is read in order"""
+        view = ShippingView(self.__directory.name)
+        self.assertEqual(len(view), 30)
+        self.assertEqual([row.to_json() for row in view], self.__shippings)
+        self.assertEqual({row["alg"] for row in view}, {"SHA-256"})
+        self.assertEqual(sum(1 for row in view if row.delivered_at is not None), 10)
+
+    def test_lookups(self):
+        """shippings are found by tracking code and order id"""
+        view = ShippingView(self.__directory.name)
+        shipping = self.__shippings[7]
+        row = view.find_by_tracking_code(shipping["tracking_code"])
+        self.assertEqual((row.order_id, row.issued_at, row.delivery_day),
+                         (shipping["order_id"], shipping["issued_at"], shipping["delivery_day"]))
+        self.assertIsNone(row.delivered_at)
+        self.assertEqual(view.find_by_order_id(f"{9:032x}").tracking_code, self.__shippings[9]["tracking_code"])
+        self.assertEqual(view.delivered_at(self.__shippings[9]["tracking_code"]), 1678406400.5)
+        self.assertIsNone(view.find_by_tracking_code("0" * 64))
+        self.assertIsNone(view.find_by_order_id("not an order id"))
+        self.assertEqual(len(list(view.deliveries())), 10)
+
+    def test_read_only(self):
+        """the view writes nothing to the stores directory"""
+        files = sorted(os.listdir(self.__directory.name))
+        view = ShippingView(self.__directory.name)
+        self.assertEqual(view.find_by_order_id(f"{4:032x}").to_json(), self.__shippings[4])
+        self.assertEqual(sorted(os.listdir(self.__directory.name)), files)
+
+    def test_snapshot_of_the_store(self):
+        """the snapshots kept by SnapshotStore are mapped without reading the json files"""
+        for store_name in ("order_shipping.json", "order_manager.json"):
+            store = SnapshotStore(os.path.join(self.__directory.name, store_name))
+            store.create()
+            store.compact()
+        with mock.patch.object(JsonStore, "load") as load:
+            view = ShippingView(self.__directory.name)
+            self.assertEqual([row.to_json() for row in view], self.__shippings)
+            self.assertEqual(view.delivered_at(self.__shippings[3]["tracking_code"]), 1678406400.5)
+        load.assert_not_called()
+
+    def test_refresh(self):
+        """the view shows the stores when it was opened until it is refreshed"""
+        view = ShippingView(self.__directory.name)
+        self.write_store("order_shipping.json", self.__shippings[:5])
+        self.assertEqual(len(view), 30)
+        view.refresh()
+        self.assertEqual(len(view), 5)
+        self.assertEqual(len(ShippingView(self.__directory.name)), 5)
+
+    def test_missing_store(self):
+        """a view of a directory without stores throws an exception"""
+        with self.assertRaises(OrderManagementException) as exception:
+            ShippingView(os.path.join(self.__directory.name, "missing"))
+        self.assertEqual(exception.exception.message, "Could not find order_shipping.json")
+
+    @unittest.skipIf(shipping_view.numpy is None, "numpy is not installed")
+    def test_arrays(self):
+        """the records are seen as numpy arrays over the mapped file"""
+        view = ShippingView(self.__directory.name)
+        shippings = view.shipping_array()
+        self.assertEqual(list(shippings["issued_at"]), [shipping["issued_at"] for shipping in self.__shippings])
+        self.assertEqual(bytes(shippings["tracking_code"][3]).hex(), self.__shippings[3]["tracking_code"])
+        self.assertFalse(shippings.flags.owndata)
+        self.assertEqual(len(view.delivery_array()), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+"""class for testing the store with a binary snapshot"""
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from uc3m_logistics import (OrderManager, OrderRequest, OrderShipping, SnapshotStore, JsonStore, FixedClock,
+                            OrderManagementException)
+from uc3m_logistics import snapshot as snapshot_format
+from uc3m_logistics.snapshot import Snapshot, write_snapshot, ORDER_REQUEST_FIELDS
+
+
+class SnapshotStoreTests(unittest.TestCase):
+    """class for testing the SnapshotStore class and the snapshot format"""
+
+    def setUp(self):
+        """creates a temporary directory for the stores"""
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__store_path = os.path.join(self.__directory.name, "order_request.json")
+
+    def tearDown(self):
+        """removes the temporary directory"""
+        self.__directory.cleanup()
+
+    @staticmethod
+    def order_requests(first, last):
+        """returns the records of the order requests first to last"""
+        return [OrderRequest("8421691423220", "Premium" if number % 2 else "Regular",
+                             f"C/LISBOA,{number}, MADRID, SPAIN", "+34123456789", "28005",
+                             FixedClock(1678320000.5 + number)).to_json() for number in range(first, last)]
+
+    def test_snapshot_format(self):
+        """every record is read back as it was written, also the ones that
+        do not fit the fixed fields"""
+        records = self.order_requests(0, 50)
+        records += [{"order_id": "not hexadecimal"}, dict(records[7], time_stamp=1678320000),
+                    dict(records[3], delivery_address="C/ÑANDÚ 4, MADRID, SPAIN")]
+        snapshot_path = os.path.join(self.__directory.name, "order_request.json.snap")
+        write_snapshot(snapshot_path, records, ORDER_REQUEST_FIELDS, (1, 2, 3))
+        snapshot = Snapshot(snapshot_path)
+        self.assertTrue(snapshot.open())
+        self.assertEqual(snapshot.signature, (1, 2, 3))
+        self.assertEqual(snapshot.records(), records)
+        self.assertEqual(snapshot.position("order_id", records[7]["order_id"]), 7)
+        self.assertEqual(snapshot.position("order_id", "not hexadecimal"), 50)
+        self.assertIsNone(snapshot.find("order_id", "0" * 32))
+        self.assertIsNone(snapshot.find("zip_code", "28005"))
+
+    def test_many_interned_strings(self):
+        """an interned field with more strings than its numbers is kept in the heap"""
+        records = [{"tracking_code": f"{number:064x}", "time_stamp": 1678320000.5 + number,
+                    "order_type": f"TYPE {number}"} for number in range(70000)]
+        fields = (("tracking_code", "hex32"), ("time_stamp", "f64"), ("order_type", "intern"))
+        snapshot_path = os.path.join(self.__directory.name, "order_manager.json.snap")
+        write_snapshot(snapshot_path, records, fields, (1, 2, 3))
+        snapshot = Snapshot(snapshot_path)
+        self.assertTrue(snapshot.open())
+        self.assertEqual(dict(snapshot.fields)["order_type"], "heap")
+        self.assertEqual(snapshot.value(69999, "order_type"), "TYPE 69999")
+        self.assertEqual(snapshot.find("tracking_code", f"{65536:064x}"), records[65536])
+
+    def test_wide_snapshot(self):
+        """a heap larger than 32 bit offsets widens the references"""
+        records = self.order_requests(0, 20) + [{"order_id": "not hexadecimal"}]
+        snapshot_path = os.path.join(self.__directory.name, "order_request.json.snap")
+        with mock.patch.object(snapshot_format, "HEAP_LIMIT", 100):
+            write_snapshot(snapshot_path, records, ORDER_REQUEST_FIELDS, (1, 2, 3))
+        snapshot = Snapshot(snapshot_path)
+        self.assertTrue(snapshot.open())
+        self.assertTrue(snapshot.wide)
+        self.assertEqual(dict(snapshot.fields)["delivery_address"], "heap64")
+        self.assertEqual(snapshot.records(), records)
+        self.assertEqual(snapshot.position("order_id", records[12]["order_id"]), 12)
+        self.assertEqual(snapshot.position("order_id", "not hexadecimal"), 20)
+
+    def test_compaction_takes_a_snapshot(self):
+        """the records are found in the snapshot and in the journal tail"""
+        store = SnapshotStore(self.__store_path, compact_every=30)
+        store.create()
+        records = self.order_requests(0, 40)
+        for record in records:
+            store.append(record)
+        self.assertTrue(os.path.exists(store.snapshot_path))
+        self.assertEqual(os.path.getsize(store.journal_path) > 0, True)
+        self.assertEqual(store.load(), records)
+        self.assertEqual(store.find("order_id", records[3]["order_id"]), records[3])
+        self.assertEqual(store.find("order_id", records[35]["order_id"]), records[35])
+        self.assertIsNone(store.find("order_id", "0" * 32))
+        with self.assertRaises(OrderManagementException):
+            store.find("zip_code", "28005")
+
+    def test_cold_start_does_not_parse_the_base_file(self):
+        """a new store finds the records through the snapshot"""
+        store = SnapshotStore(self.__store_path, compact_every=0)
+        store.create()
+        records = self.order_requests(0, 20)
+        store.extend(records)
+        store.compact()
+        store.append(self.order_requests(20, 21)[0])
+        with mock.patch.object(JsonStore, "load", side_effect=AssertionError("base file parsed")):
+            cold = SnapshotStore(self.__store_path)
+            self.assertEqual(cold.find("order_id", records[12]["order_id"]), records[12])
+            self.assertEqual(cold.find("order_id", self.order_requests(20, 21)[0]["order_id"]),
+                             self.order_requests(20, 21)[0])
+
+    def test_base_file_written_by_others(self):
+        """a snapshot that does not match the base file is taken again"""
+        store = SnapshotStore(self.__store_path, compact_every=0)
+        store.create()
+        store.extend(self.order_requests(0, 5))
+        store.compact()
+        with open(self.__store_path, "w", encoding="utf-8") as file:
+            json.dump(self.order_requests(10, 12), file, indent=4)
+        self.assertIsNone(store.find("order_id", self.order_requests(0, 1)[0]["order_id"]))
+        self.assertEqual(store.find("order_id", self.order_requests(11, 12)[0]["order_id"]),
+                         self.order_requests(11, 12)[0])
+
+    def test_order_manager(self):
+        """the order manager works the same with snapshot stores"""
+        clock = FixedClock("2023-03-09")
+        order_manager = OrderManager(SnapshotStore, clock, store_path=self.__directory.name)
+        order_id = order_manager.register_order("8421691423220", "Premium", "C/LISBOA,4, MADRID, SPAIN",
+                                                "+34123456789", "28005")
+        input_file_path = os.path.join(self.__directory.name, "input.json")
+        with open(input_file_path, "w", encoding="utf-8") as file:
+            json.dump({"OrderID": order_id}, file)
+        tracking_code = order_manager.send_product(input_file_path)
+        for store in (order_manager.repository.order_requests.store, order_manager.repository.order_shippings.store):
+            store.compact()
+        restarted = OrderManager(SnapshotStore, FixedClock("2023-03-10"), store_path=self.__directory.name)
+        self.assertTrue(restarted.deliver_product(tracking_code))
+        shipping = restarted.repository.find_order_shipping(tracking_code)
+        self.assertEqual(OrderShipping.from_json(shipping).tracking_code, tracking_code)
+        self.assertEqual(shipping["order_id"], order_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""class for testing the sqlite store"""
+import json
+import os
+import tempfile
+import unittest
+
+from uc3m_logistics import OrderManager, OrderManagementException, SqliteStore, FixedClock
+from uc3m_logistics.sqlite_store import migrate_json_stores
+
+
+class SqliteStoreTests(unittest.TestCase):
+    """class for testing the SqliteStore class"""
+
+    def setUp(self):
+        """creates a temporary directory for the stores"""
+        self.__directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """removes the temporary directory"""
+        self.__directory.cleanup()
+
+    def store_class(self, store_path):
+        """creates the stores in the temporary directory"""
+        return SqliteStore(os.path.join(self.__directory.name, os.path.basename(store_path)))
+
+    def test_store(self):
+        """records are kept in order and found by their keys"""
+        store = self.store_class("order_shipping.json")
+        store.create()
+        store.extend([{"order_id": "a", "tracking_code": "1"}, {"order_id": "b", "tracking_code": "2"}])
+        store.append({"order_id": "a", "tracking_code": "3"})
+        self.assertEqual([record["tracking_code"] for record in store.load()], ["1", "2", "3"])
+        self.assertEqual(store.find("order_id", "a")["tracking_code"], "1")
+        self.assertEqual(store.find("tracking_code", "2")["order_id"], "b")
+        self.assertIsNone(store.find("tracking_code", "4"))
+        self.assertEqual(store.count(), 3)
+
+    def test_order_manager(self):
+        """the order manager works the same with sqlite stores"""
+        clock = FixedClock("2023-03-09")
+        order_manager = OrderManager(self.store_class, clock)
+        order_id = order_manager.register_order("8421691423220", "Premium", "C/LISBOA,4, MADRID, SPAIN",
+                                                "+34123456789", "28005")
+        input_file_path = os.path.join(self.__directory.name, "input.json")
+        with open(input_file_path, "w", encoding="utf-8") as file:
+            json.dump({"OrderID": order_id}, file)
+        tracking_code = order_manager.send_product(input_file_path)
+        clock.move_to("2023-03-10")
+        self.assertTrue(order_manager.deliver_product(tracking_code))
+        with self.assertRaises(OrderManagementException) as exception:
+            order_manager.deliver_product("abcdef")
+        self.assertEqual(exception.exception.message, "Deliver Product: Invalid tracking code")
+
+    def test_migrate_json_stores(self):
+        """the json stores are imported once"""
+        records = {
+            "order_request.json": [{"order_id": "a"}, {"order_id": "b"}],
+            "order_shipping.json": {"order_id": "a", "tracking_code": "1"},
+            "order_manager.json": [],
+        }
+        for store_name, data in records.items():
+            with open(os.path.join(self.__directory.name, store_name), "w", encoding="utf-8") as file:
+                json.dump(data, file, indent=4)
+        imported = migrate_json_stores(self.__directory.name)
+        self.assertEqual(imported, {"order_request.json": 2, "order_shipping.json": 1, "order_manager.json": 0})
+        self.assertEqual(self.store_class("order_request.json").load(), records["order_request.json"])
+        with self.assertRaises(OrderManagementException):
+            migrate_json_stores(self.__directory.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""class for testing concurrent access to the stores"""
+import json
+import multiprocessing
+import os
+import stat
+import tempfile
+import unittest
+
+from uc3m_logistics import JsonStore, JournalStore
+from uc3m_logistics.file_lock import replace_file
+
+PROCESSES = 4
+RECORDS_PER_PROCESS = 40
+
+
+def append_records(store_class, store_path, worker):
+    """appends the records of one worker one by one"""
+    store = store_class(store_path)
+    for number in range(RECORDS_PER_PROCESS):
+        store.append({"order_id": f"{worker}-{number}"})
+
+
+def compacting_journal_store(store_path):
+    """journal store that compacts itself while the others append"""
+    return JournalStore(store_path, compact_every=7)
+
+
+class StoreLockingTests(unittest.TestCase):
+    """class for testing several processes writing the same store"""
+
+    def setUp(self):
+        """creates a temporary directory for the store"""
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__store_path = os.path.join(self.__directory.name, "order_request.json")
+
+    def tearDown(self):
+        """removes the temporary directory"""
+        self.__directory.cleanup()
+
+    def run_workers(self, store_class):
+        """runs the workers in parallel and returns the stored records"""
+        store = store_class(self.__store_path)
+        store.create()
+        workers = [multiprocessing.Process(target=append_records, args=(store_class, self.__store_path, worker))
+                   for worker in range(PROCESSES)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            self.assertEqual(worker.exitcode, 0)
+        return store.load()
+
+    def check_records(self, records):
+        """every record was stored exactly once"""
+        expected = {f"{worker}-{number}" for worker in range(PROCESSES) for number in range(RECORDS_PER_PROCESS)}
+        self.assertEqual(len(records), len(expected))
+        self.assertEqual({record["order_id"] for record in records}, expected)
+
+    def test_json_store_no_lost_updates(self):
+        """no record is lost when several processes rewrite the json list"""
+        self.check_records(self.run_workers(JsonStore))
+        with open(self.__store_path, "r", encoding="utf-8") as file:
+            self.assertEqual(len(json.load(file)), PROCESSES * RECORDS_PER_PROCESS)
+
+    def test_journal_store_no_lost_updates(self):
+        """no record is lost when several processes append and compact"""
+        self.check_records(self.run_workers(compacting_journal_store))
+
+    def test_replace_leaves_valid_json(self):
+        """the store is replaced by a complete json list and no temporary file"""
+        store = JsonStore(self.__store_path)
+        with open(self.__store_path, "w", encoding="utf-8") as file:
+            json.dump({"order_id": "a" * 100, "padding": "b" * 1000}, file, indent=4)
+        store.append({"order_id": "c"})
+        self.assertEqual(len(store.load()), 2)
+        self.assertEqual([name for name in os.listdir(self.__directory.name) if name.endswith(".tmp")], [])
+
+    def test_replace_keeps_the_mode(self):
+        """a replaced file keeps its mode and a new one gets the mode of the umask"""
+        umask = os.umask(0o022)
+        try:
+            replace_file(self.__store_path, "[]")
+            self.assertEqual(stat.S_IMODE(os.stat(self.__store_path).st_mode), 0o644)
+            os.chmod(self.__store_path, 0o664)
+            JsonStore(self.__store_path).append({"order_id": "c"})
+            self.assertEqual(stat.S_IMODE(os.stat(self.__store_path).st_mode), 0o664)
+        finally:
+            os.umask(umask)
+
+
+if __name__ == '__main__':
+    unittest.main()
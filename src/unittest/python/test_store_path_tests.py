@@ -0,0 +1,57 @@
+"""class for testing the configurable directory of the stores"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from uc3m_logistics import OrderManager, OrderManagementException, FixedClock
+from uc3m_logistics.order_store import STORE_PATH_VARIABLE, DEFAULT_STORE_PATH, store_directory
+
+
+class StorePathTests(unittest.TestCase):
+    """class for testing the store_path argument of OrderManager"""
+
+    def setUp(self):
+        """creates a temporary directory for the stores"""
+        self.__directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """removes the temporary directory"""
+        self.__directory.cleanup()
+
+    def test_store_path_argument(self):
+        """the stores are created in the given directory, which is created too"""
+        store_path = os.path.join(self.__directory.name, "tenant", "stores")
+        order_manager = OrderManager(clock=FixedClock("2023-03-09"), store_path=store_path)
+        order_id = order_manager.register_order("8421691423220", "Regular", "C/LISBOA,4, MADRID, SPAIN",
+                                                "+34123456789", "28005")
+        self.assertEqual(order_manager.store_path, store_path)
+        self.assertEqual(sorted(name for name in os.listdir(store_path) if name.endswith(".json")),
+                         ["order_manager.json", "order_request.json", "order_shipping.json"])
+        self.assertEqual(order_manager.validate_orderid(order_id).order_id, order_id)
+
+    def test_environment_variable(self):
+        """the environment variable is used when there is no argument"""
+        with mock.patch.dict(os.environ, {STORE_PATH_VARIABLE: self.__directory.name}):
+            self.assertEqual(OrderManager().store_path, self.__directory.name)
+            self.assertEqual(store_directory("other"), "other")
+        self.assertTrue(os.path.exists(os.path.join(self.__directory.name, "order_request.json")))
+
+    def test_default_directory(self):
+        """without argument nor environment variable the package stores are used"""
+        with mock.patch.dict(os.environ):
+            os.environ.pop(STORE_PATH_VARIABLE, None)
+            self.assertEqual(store_directory(), DEFAULT_STORE_PATH)
+
+    def test_store_path_not_a_directory(self):
+        """a store path that can not be created throws an exception"""
+        file_path = os.path.join(self.__directory.name, "file")
+        with open(file_path, "w", encoding="utf-8") as file:
+            file.write("")
+        with self.assertRaises(OrderManagementException) as exception:
+            OrderManager(store_path=os.path.join(file_path, "stores"))
+        self.assertTrue(exception.exception.message.startswith("Could not create store directory"))
+
+
+if __name__ == '__main__':
+    unittest.main()
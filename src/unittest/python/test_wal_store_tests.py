@@ -0,0 +1,133 @@
+"""class for testing the store with a write-ahead log"""
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+import unittest
+
+from uc3m_logistics import OrderManager, OrderManagementException, WalStore, FixedClock
+
+KILLS = 15
+
+
+def write_until_killed(store_path, started):
+    """appends numbered records in batches of 1 to 3 until it is killed"""
+    store = WalStore(store_path, checkpoint_every=5)
+    store.create()
+    number = len(store.load())
+    while True:
+        size = number % 3 + 1
+        store.extend([{"order_id": f"{position:08d}"} for position in range(number, number + size)])
+        number += size
+        started.set()
+
+
+class WalStoreTests(unittest.TestCase):
+    """class for testing the WalStore class"""
+
+    def setUp(self):
+        """creates a temporary directory for the store"""
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__store_path = os.path.join(self.__directory.name, "order_request.json")
+
+    def tearDown(self):
+        """removes the temporary directory"""
+        self.__directory.cleanup()
+
+    @staticmethod
+    def records(first, last):
+        """returns the records first to last"""
+        return [{"order_id": f"{position:08d}"} for position in range(first, last)]
+
+    def test_log_and_checkpoint(self):
+        """records are logged and folded into the base file every checkpoint"""
+        store = WalStore(self.__store_path, checkpoint_every=10)
+        store.create()
+        store.extend(self.records(0, 4))
+        store.extend(self.records(4, 8))
+        with open(self.__store_path, "r", encoding="utf-8") as file:
+            self.assertEqual(json.load(file), [])
+        self.assertEqual(store.load(), self.records(0, 8))
+        store.extend(self.records(8, 12))
+        with open(self.__store_path, "r", encoding="utf-8") as file:
+            self.assertEqual(json.load(file), self.records(0, 12))
+        self.assertEqual(os.path.getsize(store.wal_path), 16)
+        store.append(self.records(12, 13)[0])
+        self.assertEqual(WalStore(self.__store_path).load(), self.records(0, 13))
+
+    def test_torn_entry_is_cut_off(self):
+        """an entry torn by a crash or with a wrong checksum is not replayed"""
+        store = WalStore(self.__store_path)
+        store.create()
+        store.extend(self.records(0, 3))
+        store.extend(self.records(3, 5))
+        size = os.path.getsize(store.wal_path)
+        with open(store.wal_path, "r+b") as file:
+            file.truncate(size - 3)
+        recovered = WalStore(self.__store_path)
+        recovered.create()
+        self.assertEqual(recovered.load(), self.records(0, 3))
+        recovered.extend(self.records(3, 4))
+        with open(store.wal_path, "r+b") as file:
+            file.seek(-2, os.SEEK_END)
+            file.write(b"xx")
+        self.assertEqual(WalStore(self.__store_path).load(), self.records(0, 3))
+
+    def test_replay_after_interrupted_checkpoint(self):
+        """records already in the base file are not replayed twice"""
+        store = WalStore(self.__store_path, checkpoint_every=0)
+        store.create()
+        store.extend(self.records(0, 2))
+        store.extend(self.records(2, 5))
+        # the base file was replaced but the crash came before the new log
+        with open(self.__store_path, "w", encoding="utf-8") as file:
+            json.dump(self.records(0, 5), file, indent=4)
+        recovered = WalStore(self.__store_path)
+        recovered.create()
+        self.assertEqual(recovered.load(), self.records(0, 5))
+        recovered.extend(self.records(5, 6))
+        self.assertEqual(recovered.load(), self.records(0, 6))
+
+    def test_corrupt_base_file(self):
+        """a base file that is not json can not be recovered"""
+        with open(self.__store_path, "w", encoding="utf-8") as file:
+            file.write('[{"order_id": ')
+        with self.assertRaises(OrderManagementException) as exception:
+            WalStore(self.__store_path).create()
+        self.assertEqual(exception.exception.message, "Could not recover order_request.json: base file is corrupt")
+
+    def test_writers_killed_at_random_points(self):
+        """after every kill the store has every record written, in order and once"""
+        chooser = random.Random(21)
+        recovered_records = 0
+        for _ in range(KILLS):
+            started = multiprocessing.Event()
+            writer = multiprocessing.Process(target=write_until_killed, args=(self.__store_path, started))
+            writer.start()
+            self.assertTrue(started.wait(10))
+            time.sleep(chooser.uniform(0, 0.02))
+            writer.kill()
+            writer.join()
+            store = WalStore(self.__store_path, checkpoint_every=5)
+            store.create()
+            records = store.load()
+            self.assertEqual(records, self.records(0, len(records)))
+            self.assertGreaterEqual(len(records), recovered_records)
+            recovered_records = len(records)
+
+    def test_order_manager(self):
+        """the order manager recovers its stores when it starts"""
+        order_manager = OrderManager(WalStore, FixedClock("2023-03-09"), store_path=self.__directory.name)
+        order_id = order_manager.register_order("8421691423220", "Premium", "C/LISBOA,4, MADRID, SPAIN",
+                                                "+34123456789", "28005")
+        with open(self.__store_path + ".wal", "ab") as file:
+            file.write(b"\x10\x00")
+        restarted = OrderManager(WalStore, FixedClock("2023-03-09"), store_path=self.__directory.name)
+        self.assertEqual(restarted.validate_orderid(order_id).order_id, order_id)
+        self.assertEqual(len(restarted.repository.order_requests.records()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()